@@ -6,6 +6,7 @@ from agents.budgeteer import Budgeteer
 from agents.reconcile import Reconcile
 from models.ledger_entry import LedgerEntry
 from models.budget_model import BudgetModel
+from models.money import Money
 from lib.csv_utils import read_ledger_csv, write_ledger_csv
 
 __all__ = [
@@ -13,6 +14,7 @@ __all__ = [
     'Reconcile',
     'LedgerEntry',
     'BudgetModel',
+    'Money',
     'read_ledger_csv',
     'write_ledger_csv',
 ]
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import threading
+import time
 from decimal import Decimal
 from datetime import datetime
-from typing import Protocol
+from typing import Callable, Iterable, Protocol
+
+from models.money import Money
 
 
 class BudgetService(Protocol):
@@ -17,15 +21,72 @@ class BudgetService(Protocol):
         ...
 
 
-class Budgeteer:
-    """Agent for budget management and tracking."""
+class BudgetSnapshotCache:
+    """TTL-bounded cache of ``BudgetService.get_budget`` snapshots."""
+    
+    def __init__(self, ttl_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: dict[str, tuple[float, dict]] = {}
+        # Bumped by ``invalidate``; a load that overlaps one is not cached.
+        self._versions: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, budget_id: str, loader: Callable[[str], dict]) -> dict:
+        """Return a fresh snapshot for ``budget_id``, loading it on miss or expiry."""
+        now = self.clock()
+        with self._lock:
+            cached = self._entries.get(budget_id)
+            if cached is not None and now - cached[0] < self.ttl_seconds:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            version = (self._epoch, self._versions.get(budget_id, 0))
+        budget = loader(budget_id)
+        with self._lock:
+            if (self._epoch, self._versions.get(budget_id, 0)) == version:
+                self._entries[budget_id] = (now, budget)
+        return budget
+    
+    def invalidate(self, budget_id: str | None = None) -> None:
+        """Drop one snapshot, or every snapshot when ``budget_id`` is None.
+
+        A load already in flight for it still returns, but is not cached.
+        """
+        with self._lock:
+            if budget_id is None:
+                self._entries.clear()
+                self._epoch += 1
+            else:
+                self._entries.pop(budget_id, None)
+                self._versions[budget_id] = self._versions.get(budget_id, 0) + 1
+
+
+def utilization_pct(spent: Money, allocated: Money) -> Decimal:
+    """Spent as a percentage of allocated, computed from exact minor units."""
+    if allocated.minor <= 0:
+        return Decimal(0)
+    return Decimal(spent.minor) / Decimal(allocated.minor) * 100
+
+
+class ServiceBudgeteer:
+    """Agent for budget management and tracking against a ``BudgetService``."""
     
-    def __init__(self, budget_service: BudgetService):
+    def __init__(self, budget_service: BudgetService, cache: BudgetSnapshotCache | None = None):
         self.budget_service = budget_service
+        self.cache = cache
         self.agent_id = "agent.budgeteer"
         self.display_name = "Budgeteer"
         self.pack_id = "pack.finance"
     
+    def _get_budget(self, budget_id: str) -> dict:
+        if self.cache is None:
+            return self.budget_service.get_budget(budget_id)
+        return self.cache.get(budget_id, self.budget_service.get_budget)
+    
     def check_budget(self, budget_id: str, proposed_amount: Decimal) -> dict:
         """
         Check if a proposed expense fits within budget.
@@ -37,22 +98,83 @@ class Budgeteer:
         Returns:
             Dictionary with approval status and details
         """
-        budget = self.budget_service.get_budget(budget_id)
-        allocated = Decimal(budget['allocated'])
-        spent = Decimal(budget['spent'])
+        budget = self._get_budget(budget_id)
+        currency = budget.get('currency', 'USD')
+        allocated = Money.of(budget['allocated'], currency)
+        spent = Money.of(budget['spent'], currency)
         remaining = allocated - spent
         
-        approved = proposed_amount <= remaining
+        approved = Money.of(proposed_amount, currency) <= remaining
         
         return {
             'approved': approved,
             'budget_id': budget_id,
             'proposed_amount': str(proposed_amount),
             'remaining': str(remaining),
-            'utilization': str((spent / allocated * 100) if allocated > 0 else 0),
+            'utilization': str(utilization_pct(spent, allocated)),
             'timestamp': datetime.now().isoformat(),
         }
     
+    def check_budgets(self, proposals: Iterable[tuple[str, Decimal]],
+                      commit: bool = False) -> list[dict]:
+        """
+        Check many proposed expenses in one pass.
+        
+        Each referenced budget is fetched once. Proposals are applied in
+        order against a running remaining balance, so an approval consumes
+        budget that later proposals can no longer use; rejections consume
+        nothing.
+        
+        Args:
+            proposals: (budget_id, proposed_amount) pairs, in priority order
+            commit: Record each budget's approved total through
+                ``update_spent`` (one call per budget) and invalidate its
+                cached snapshot
+        
+        Returns:
+            One decision per proposal, in input order, shaped like
+            ``check_budget`` results with ``remaining`` after the decision
+        """
+        timestamp = datetime.now().isoformat()
+        states: dict[str, list] = {}
+        decisions = []
+        for budget_id, proposed_amount in proposals:
+            state = states.get(budget_id)
+            if state is None:
+                budget = self._get_budget(budget_id)
+                currency = budget.get('currency', 'USD')
+                allocated = Money.of(budget['allocated'], currency)
+                spent = Money.of(budget['spent'], currency)
+                # [allocated, spent, approved total] in minor units.
+                state = states[budget_id] = [allocated, spent.minor, 0]
+            allocated = state[0]
+            proposed = Money.of(proposed_amount, allocated.currency)
+            remaining = allocated.minor - state[1]
+            approved = proposed.minor <= remaining
+            if approved:
+                state[1] += proposed.minor
+                state[2] += proposed.minor
+                remaining -= proposed.minor
+            decisions.append({
+                'approved': approved,
+                'budget_id': budget_id,
+                'proposed_amount': str(proposed_amount),
+                'remaining': str(Money(remaining, allocated.currency)),
+                'utilization': str(utilization_pct(Money(state[1], allocated.currency), allocated)),
+                'timestamp': timestamp,
+            })
+        if commit:
+            for budget_id, (allocated, _, approved_total) in states.items():
+                if approved_total:
+                    self.record_spend(budget_id, Money(approved_total, allocated.currency).to_decimal())
+        return decisions
+    
+    def record_spend(self, budget_id: str, amount: Decimal) -> None:
+        """Add ``amount`` to a budget's spent total and drop its cached snapshot."""
+        self.budget_service.update_spent(budget_id, amount)
+        if self.cache is not None:
+            self.cache.invalidate(budget_id)
+    
     def allocate_budget(self, name: str, amount: Decimal, period: str) -> dict:
         """
         Allocate a new budget.
@@ -74,9 +196,10 @@ class Budgeteer:
     
     def generate_report(self, budget_id: str) -> dict:
         """Generate budget utilization report."""
-        budget = self.budget_service.get_budget(budget_id)
-        allocated = Decimal(budget['allocated'])
-        spent = Decimal(budget['spent'])
+        budget = self._get_budget(budget_id)
+        currency = budget.get('currency', 'USD')
+        allocated = Money.of(budget['allocated'], currency)
+        spent = Money.of(budget['spent'], currency)
         
         return {
             'budget_id': budget_id,
@@ -84,7 +207,7 @@ class Budgeteer:
             'allocated': str(allocated),
             'spent': str(spent),
             'remaining': str(allocated - spent),
-            'utilization_pct': str((spent / allocated * 100) if allocated > 0 else 0),
+            'utilization_pct': str(utilization_pct(spent, allocated)),
             'period': budget['period'],
             'report_generated': datetime.now().isoformat(),
         }
@@ -109,7 +232,7 @@ if __name__ == "__main__":
         def update_spent(self, budget_id: str, amount: Decimal) -> None:
             pass
     
-    budgeteer = Budgeteer(MockBudgetService())
+    budgeteer = ServiceBudgeteer(MockBudgetService())
     
     if len(sys.argv) > 1 and sys.argv[1] == 'check':
         result = budgeteer.check_budget('budget-001', Decimal('5000.00'))
@@ -119,11 +242,21 @@ if __name__ == "__main__":
         print(f"Budget report: {report}")
     else:
         print("Usage: python budgeteer.py [check|report]")
+
 """Finance pack Growth Catalyst agent for budgeting and burn tracking."""
-from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Protocol, Dict, Any
+from typing import TYPE_CHECKING, Protocol, Dict, Any, Iterable, Sequence
+
+from lib.defaults import DEFAULT_PATHS
+
+# The Cost Explorer, runway and config modules pull in pandas and yaml; they
+# are imported by the methods that use them so ``check`` and ``report`` stay light.
+if TYPE_CHECKING:
+    from lib.budget_monitor import BudgetMonitor
+    from lib.config import RateLimits
+    from lib.cost_explorer import CostExplorerFetcher, CostQuery, CostResult
+    from lib.runway import RunwaySimulation
 
 
 class CostExplorerClient(Protocol):
@@ -153,9 +286,32 @@ class BudgetForecast:
 class Budgeteer:
     """Forecasts burn rate and prepares weekly spending reports."""
 
-    def __init__(self, budget_limit: float, slack_channel: str = "#finops") -> None:
+    def __init__(
+        self,
+        budget_limit: float,
+        slack_channel: str = "#finops",
+        concurrency: int = 8,
+        rate_limits: RateLimits | None = None,
+    ) -> None:
         self.budget_limit = budget_limit
         self.slack_channel = slack_channel
+        self.concurrency = concurrency
+        self.rate_limits = rate_limits
+
+    def fetcher(self, client: CostExplorerClient) -> CostExplorerFetcher:
+        """Fetch engine for ``client`` using the pack ``rate_limits`` unless overridden."""
+        from lib.config import rate_limits as pack_rate_limits
+        from lib.cost_explorer import CostExplorerFetcher
+
+        limits = self.rate_limits or pack_rate_limits()
+        return CostExplorerFetcher(client, concurrency=self.concurrency, rate_limits=limits)
+
+    def _run(self, client: CostExplorerClient, queries: list[CostQuery]) -> list[CostResult]:
+        results = self.fetcher(client).run(queries)
+        for result in results:
+            if result.error is not None:
+                raise result.error
+        return results
 
     def get_month_to_date_spend(
         self,
@@ -163,20 +319,35 @@ class Budgeteer:
         days_elapsed: int,
         time_range: Dict[str, str] | None = None,
     ) -> float:
-        """Fetch month-to-date spend from a Cost Explorer compatible client."""
+        """Fetch month-to-date spend from a Cost Explorer compatible client.
+
+        Every ``ResultsByTime`` period on every page is summed.
+        """
+        from lib.cost_explorer import CostQuery
 
         window = time_range or _default_time_range(days_elapsed)
-        response = client.get_cost_and_usage(
-            TimePeriod=window,
-            Granularity="MONTHLY",
-            Metrics=["UnblendedCost"],
-        )
-        total = response.get("ResultsByTime", [{}])[0].get("Total", {})
-        amount = total.get("UnblendedCost", {}).get("Amount", "0")
-        try:
-            return float(amount)
-        except (TypeError, ValueError):
-            return 0.0
+        (result,) = self._run(client, [CostQuery(window, granularity="MONTHLY")])
+        return result.total()
+
+    def get_spend_by_account(
+        self,
+        client: CostExplorerClient,
+        accounts: Iterable[str],
+        days_elapsed: int,
+        time_range: Dict[str, str] | None = None,
+        services: Iterable[str] | None = None,
+        granularity: str = "DAILY",
+    ) -> Dict[str, float]:
+        """Spend per linked account, fetched concurrently (one query per account and service)."""
+        from lib.cost_explorer import fan_out
+
+        window = time_range or _default_time_range(days_elapsed)
+        queries = fan_out(window, accounts, services or (None,), granularity=granularity)
+        totals: Dict[str, float] = {}
+        for result in self._run(client, queries):
+            account = result.query.account
+            totals[account] = totals.get(account, 0.0) + result.total()
+        return totals
 
     def forecast(self, current_spend: float, days_elapsed: int, days_in_month: int) -> BudgetForecast:
         if days_elapsed <= 0 or days_in_month <= 0:
@@ -192,6 +363,35 @@ class Budgeteer:
             percent_of_budget=percent_of_budget,
         )
 
+    def simulate(
+        self,
+        daily_history_cents: Sequence[int],
+        current_spend: float,
+        days_elapsed: int,
+        days_in_month: int,
+        paths: int = DEFAULT_PATHS,
+        seed: int = 0,
+        workers: int = 1,
+    ) -> RunwaySimulation:
+        """Monte Carlo counterpart of ``forecast``: month-end spend percentiles and breach odds.
+
+        The remaining days are bootstrapped from ``daily_history_cents``
+        (e.g. ``lib.runway.daily_flows`` over the ledger store).
+        """
+        from lib.runway import simulate_month_end
+
+        if days_elapsed <= 0 or days_in_month <= 0:
+            raise ValueError("days_elapsed and days_in_month must be positive")
+        return simulate_month_end(
+            daily_history_cents,
+            current_spend,
+            max(days_in_month - days_elapsed, 0),
+            budget_limit=self.budget_limit or None,
+            paths=paths,
+            seed=seed,
+            workers=workers,
+        )
+
     def build_weekly_report(
         self,
         client: CostExplorerClient,
@@ -212,5 +412,64 @@ class Budgeteer:
             reporter.post(self.slack_channel, report)
         return report
 
+    def monitor(
+        self,
+        reporter: Reporter,
+        thresholds: Iterable[float] | None = None,
+        debounce_seconds: float | None = None,
+        as_of: date | None = None,
+        current_spend: float = 0.0,
+    ) -> BudgetMonitor:
+        """Real-time counterpart of ``build_weekly_report``.
+
+        The returned monitor holds ``budget_limit`` as one monthly budget
+        charged by every cost record (``observe_cost``) or ledger entry
+        (``observe``), starting from ``current_spend``, and posts to
+        ``slack_channel`` as soon as the projected month-end crosses a
+        threshold.
+        """
+        from lib.budget_monitor import BudgetMonitor
+        from lib.defaults import DEFAULT_ALERT_THRESHOLDS, DEFAULT_DEBOUNCE_SECONDS
+
+        monitor = BudgetMonitor(
+            reporter,
+            channel=self.slack_channel,
+            thresholds=DEFAULT_ALERT_THRESHOLDS if thresholds is None else thresholds,
+            debounce_seconds=DEFAULT_DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds,
+        )
+        monitor.watch("month", self.budget_limit, name="Monthly budget", as_of=as_of, spent=current_spend)
+        return monitor
+
+    def build_account_reports(
+        self,
+        client: CostExplorerClient,
+        accounts: Iterable[str],
+        days_elapsed: int,
+        days_in_month: int,
+        reporter: Reporter | None = None,
+    ) -> Dict[str, str]:
+        """Weekly report per linked account from one concurrent fetch."""
+        spend = self.get_spend_by_account(client, accounts, days_elapsed)
+        reports = {}
+        for account, current_spend in spend.items():
+            forecast = self.forecast(current_spend, days_elapsed, days_in_month)
+            reports[account] = (
+                f"[finance-budgeteer] {account} — MTD spend: ${forecast.current_spend:,.2f}\n"
+                f"Daily burn: ${forecast.burn_rate:,.2f}\n"
+                f"Projected month-end: ${forecast.forecast_monthly:,.2f} "
+                f"({forecast.percent_of_budget:,.1f}% of budget)"
+            )
+            if reporter:
+                reporter.post(self.slack_channel, reports[account])
+        return reports
+
 
-__all__ = ["Budgeteer", "BudgetForecast", "CostExplorerClient", "Reporter"]
+__all__ = [
+    "Budgeteer",
+    "BudgetForecast",
+    "BudgetService",
+    "BudgetSnapshotCache",
+    "CostExplorerClient",
+    "Reporter",
+    "ServiceBudgeteer",
+]
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import datetime
-from typing import Protocol
+from typing import Iterable, Protocol
+
+import numpy as np
+import pandas as pd
+
+from lib.config import AgentSettings, agent_settings
+from lib.fx import FxRateTable
+from lib.matching import DEFAULT_MIN_SIMILARITY, DEFAULT_WINDOW_DAYS, MatchResult, match_transactions
+from models.money import Money, from_minor_array, to_minor_array
 
 
 class TransactionService(Protocol):
@@ -16,14 +28,16 @@ class TransactionService(Protocol):
 class Reconcile:
     """Agent for transaction reconciliation."""
     
-    def __init__(self, transaction_service: TransactionService):
+    def __init__(self, transaction_service: TransactionService, fx: FxRateTable | None = None):
         self.transaction_service = transaction_service
+        self.fx = fx
         self.agent_id = "agent.reconcile"
         self.display_name = "Reconcile"
         self.pack_id = "pack.finance"
     
     def reconcile_account(self, account: str, expected_balance: Decimal, 
-                         start_date: datetime, end_date: datetime) -> dict:
+                         start_date: datetime, end_date: datetime,
+                         currency: str = 'USD') -> dict:
         """
         Reconcile account transactions against expected balance.
         
@@ -32,56 +46,281 @@ class Reconcile:
             expected_balance: Expected ending balance
             start_date: Start of reconciliation period
             end_date: End of reconciliation period
+            currency: Currency of the account; transactions carrying another
+                ``currency`` are converted as of their ``date`` (or
+                ``end_date``) through the agent's FX rate table
         
         Returns:
             Reconciliation report
         """
         transactions = self.transaction_service.get_transactions(account, start_date, end_date)
+        return summarize_transactions(
+            account, transactions, expected_balance, start_date, end_date, currency, self.fx
+        )
+
+    def reconcile_accounts(self, jobs: Iterable[ReconcileJob],
+                           fetch_concurrency: int = 16, workers: int = 1,
+                           settings: AgentSettings | None = None) -> ReconcileRun:
+        """
+        Reconcile many accounts and periods in one run.
+        
+        Transactions are fetched concurrently through the transaction service
+        on ``fetch_concurrency`` threads and summarized on ``workers``
+        processes. Each account gets the ``reconcile`` agent's timeout and
+        retry budget from ``configs/finance-pack.yml`` unless ``settings`` is
+        given. A failing or timed-out account is reported and does not stop
+        the others. Failures are keyed by ``ReconcileJob.label``, so two jobs
+        with the same label raise ``ValueError``.
         
-        calculated_balance = Decimal('0')
-        for txn in transactions:
-            amount = Decimal(txn['amount'])
-            if txn['entry_type'] == 'credit':
-                calculated_balance += amount
-            else:
-                calculated_balance -= amount
+        A fetch that times out cannot be interrupted: its thread keeps
+        running until ``get_transactions`` returns. The fetch pool has room
+        for one such abandoned fetch per concurrency slot; beyond that, new
+        attempts wait for a thread and time out in turn.
         
-        variance = expected_balance - calculated_balance
-        is_balanced = abs(variance) < Decimal('0.01')
+        Args:
+            jobs: Accounts, periods and expected balances to reconcile
+            fetch_concurrency: Concurrent ``get_transactions`` calls
+            workers: Processes used to summarize fetched transactions
+            settings: Timeout (seconds per attempt) and retry count
+        
+        Returns:
+            Consolidated run report
+        """
+        settings = settings or agent_settings("reconcile")
+        jobs = list(jobs)
+        labels = [job.label for job in jobs]
+        if len(set(labels)) != len(labels):
+            repeated = sorted({label for label in labels if labels.count(label) > 1})
+            raise ValueError(f"Duplicate reconcile jobs: {', '.join(repeated)}")
+        return asyncio.run(_run_jobs(self, list(jobs), fetch_concurrency, workers, settings))
+
+    def match_statement(self, account: str, statement_lines: list[dict],
+                        start_date: datetime, end_date: datetime,
+                        currency: str = 'USD',
+                        window_days: int = DEFAULT_WINDOW_DAYS,
+                        min_similarity: float = DEFAULT_MIN_SIMILARITY) -> MatchResult:
+        """
+        Pair the account's transactions with bank statement lines.
         
+        Args:
+            account: Account identifier
+            statement_lines: Dicts with ``date`` and signed ``amount`` (credits
+                positive), optionally ``id``, ``reference`` and ``description``
+            start_date: Start of reconciliation period
+            end_date: End of reconciliation period
+            currency: Currency of the account and the statement
+            window_days: Largest date difference for amount-only matches
+            min_similarity: Minimum description similarity for those matches
+        
+        Returns:
+            Matched pairs, unmatched rows on each side and suspected duplicates
+        """
+        transactions = self.transaction_service.get_transactions(account, start_date, end_date)
+        ledger = pd.DataFrame(transactions, columns=sorted({key for txn in transactions for key in txn}))
+        if not ledger.empty:
+            credits = (ledger['entry_type'] == 'credit').to_numpy()
+            amounts = to_minor_array(ledger['amount'], currency)
+            ledger['amount'] = from_minor_array(np.where(credits, amounts, -amounts), currency)
+        else:
+            ledger = pd.DataFrame(columns=['date', 'amount'])
+        statement = pd.DataFrame(statement_lines) if statement_lines else pd.DataFrame(columns=['date', 'amount'])
+        return match_transactions(ledger, statement, window_days, min_similarity, currency)
+
+
+def summarize_transactions(account: str, transactions: list[dict], expected_balance: Decimal,
+                           start_date: datetime, end_date: datetime, currency: str = 'USD',
+                           fx: FxRateTable | None = None) -> dict:
+    """Reconciliation report for already-fetched transactions (see ``reconcile_account``)."""
+    # Sum exact integer minor units in one vectorized pass instead of a
+    # Decimal per transaction.
+    txn_currencies = np.array([txn.get('currency', currency) for txn in transactions], dtype=object)
+    if (txn_currencies != currency).any():
+        if fx is None:
+            raise ValueError(f"{account}: transactions in other currencies need an FX rate table")
+        dates = np.array([_date_key(txn.get('date', end_date)) for txn in transactions], dtype=np.int64)
+        amounts = fx.convert([txn['amount'] for txn in transactions], txn_currencies, dates, currency)
+    else:
+        amounts = to_minor_array([txn['amount'] for txn in transactions], currency)
+    credits = np.fromiter(
+        (txn['entry_type'] == 'credit' for txn in transactions), dtype=bool, count=len(transactions)
+    )
+    calculated_balance = Money(int(np.where(credits, amounts, -amounts).sum()), currency)
+    
+    variance = Money.of(expected_balance, currency) - calculated_balance
+    is_balanced = variance.minor == 0
+    
+    return {
+        'account': account,
+        'period_start': start_date.isoformat(),
+        'period_end': end_date.isoformat(),
+        'expected_balance': str(expected_balance),
+        'calculated_balance': str(calculated_balance),
+        'variance': str(variance),
+        'is_balanced': is_balanced,
+        'transaction_count': len(transactions),
+        'reconciled_at': datetime.now().isoformat(),
+    }
+
+
+@dataclass(frozen=True)
+class ReconcileJob:
+    """One account and period to reconcile."""
+    
+    account: str
+    expected_balance: Decimal
+    start_date: datetime
+    end_date: datetime
+    currency: str = 'USD'
+    
+    @property
+    def label(self) -> str:
+        return f"{self.account} {self.start_date:%Y-%m-%d}..{self.end_date:%Y-%m-%d}"
+
+
+@dataclass
+class ReconcileRun:
+    """Consolidated result of ``Reconcile.reconcile_accounts``."""
+    
+    results: list[dict] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    attempts: int = 0
+    elapsed: float = 0.0
+    
+    def summary(self) -> dict:
+        variance: dict[str, Money] = {}
+        for result in self.results:
+            currency = result.get('currency', 'USD')
+            amount = Money.of(result['variance'], currency)
+            variance[currency] = variance.get(currency, Money.zero(currency)) + abs(amount)
         return {
-            'account': account,
-            'period_start': start_date.isoformat(),
-            'period_end': end_date.isoformat(),
-            'expected_balance': str(expected_balance),
-            'calculated_balance': str(calculated_balance),
-            'variance': str(variance),
-            'is_balanced': is_balanced,
-            'transaction_count': len(transactions),
-            'reconciled_at': datetime.now().isoformat(),
+            'accounts': len(self.results) + len(self.failed),
+            'balanced': sum(1 for result in self.results if result['is_balanced']),
+            'unbalanced': sum(1 for result in self.results if not result['is_balanced']),
+            'failed': len(self.failed),
+            'absolute_variance': {currency: str(total) for currency, total in sorted(variance.items())},
+            'attempts': self.attempts,
+            'elapsed_seconds': round(self.elapsed, 3),
         }
 
 
+async def _run_jobs(agent: Reconcile, jobs: list[ReconcileJob], fetch_concurrency: int,
+                    workers: int, settings: AgentSettings) -> ReconcileRun:
+    run = ReconcileRun()
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    # Twice the slots: a timed-out fetch holds its thread until it returns.
+    fetch_pool = ThreadPoolExecutor(max_workers=2 * max(1, fetch_concurrency))
+    compute_pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    slots = asyncio.Semaphore(max(1, fetch_concurrency))
+
+    async def reconcile_one(job: ReconcileJob) -> dict:
+        transactions = await loop.run_in_executor(
+            fetch_pool, agent.transaction_service.get_transactions, job.account, job.start_date, job.end_date
+        )
+        args = (job.account, transactions, job.expected_balance, job.start_date, job.end_date,
+                job.currency, agent.fx)
+        if compute_pool is None:
+            return summarize_transactions(*args)
+        return await loop.run_in_executor(compute_pool, summarize_transactions, *args)
+
+    finished: list[tuple[int, dict]] = []
+
+    async def attempt_all(position: int, job: ReconcileJob) -> None:
+        for attempt in range(settings.retry + 1):
+            # Hold a slot only while attempting, not through the backoff.
+            async with slots:
+                run.attempts += 1
+                try:
+                    result = await asyncio.wait_for(reconcile_one(job), settings.timeout)
+                except asyncio.TimeoutError:
+                    error = f"timed out after {settings.timeout:g}s"
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                else:
+                    result['currency'] = job.currency
+                    finished.append((position, result))
+                    return
+            if attempt < settings.retry:
+                await asyncio.sleep(min(2.0, 0.1 * 2 ** attempt))
+        run.failed[job.label] = error
+
+    try:
+        await asyncio.gather(*(attempt_all(position, job) for position, job in enumerate(jobs)))
+    finally:
+        # Abandoned (timed-out) fetches may still be running; don't wait for them.
+        fetch_pool.shutdown(wait=False, cancel_futures=True)
+        if compute_pool is not None:
+            compute_pool.shutdown(wait=False, cancel_futures=True)
+    run.results = [result for _, result in sorted(finished, key=lambda item: item[0])]
+    run.elapsed = time.perf_counter() - started
+    return run
+
+
+def _date_key(value: datetime | str) -> int:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.year * 10000 + value.month * 100 + value.day
+
+
 # CLI interface
 if __name__ == "__main__":
     print("Reconcile agent initialized")
     # TODO(reconcile): Add CLI commands for reconciliation operations
 from pathlib import Path
 
-from lib.csv_utils import load_ledgers
+from lib.csv_utils import DEFAULT_CHUNK_SIZE, parallel_map, read_ledger_frame, stream_ledger_summary
+from lib.fx import convert_ledger_frame
+from models.ledger_entry import LedgerFile
 
 
-def reconcile_file(path: Path) -> dict[str, float]:
-    ledger = load_ledgers(path.parent)
-    target = next((l for l in ledger if l.name == path.name), None)
-    if target is None:
+def reconcile_file(
+    path: Path,
+    streaming: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fx: FxRateTable | None = None,
+    currency: str | None = None,
+) -> dict[str, float]:
+    """Summarize one ledger, restated in ``currency`` when an ``fx`` table is given."""
+    if not path.is_file():
         raise FileNotFoundError(path)
-    return target.summary()
+    if streaming:
+        return stream_ledger_summary(path, chunk_size, fx, currency)
+    ledger = read_ledger_frame(path)
+    if fx is not None and currency is not None:
+        ledger = LedgerFile(name=ledger.name, columns=convert_ledger_frame(ledger.columns, fx, currency))
+    return ledger.summary()
+
+
+def reconcile_paths(
+    paths: list[Path],
+    streaming: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    fx: FxRateTable | None = None,
+    currency: str | None = None,
+) -> list[tuple[dict[str, float] | None, BaseException | None]]:
+    """Reconcile files on ``workers`` processes; (summary, error) pairs in input order."""
+    return parallel_map(
+        reconcile_file, [(path, streaming, chunk_size, fx, currency) for path in paths], workers
+    )
 
 
-def reconcile_directory(path: Path) -> list[dict[str, float]]:
-    ledgers = load_ledgers(path)
-    return [ledger.summary() for ledger in ledgers]
+def reconcile_directory(
+    path: Path,
+    streaming: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    fx: FxRateTable | None = None,
+    currency: str | None = None,
+) -> list[dict[str, float]]:
+    summaries = []
+    for summary, error in reconcile_paths(
+        sorted(path.glob("*.csv")), streaming, chunk_size, workers, fx, currency
+    ):
+        if error is not None:
+            raise error
+        summaries.append(summary)
+    return summaries
 
 
 if __name__ == "__main__":
@@ -0,0 +1,162 @@
+"""Registry of the pack's agents and the ``br_fin.py run`` dispatcher.
+
+Each entry names the agent and, for agents with a Python runtime, the
+handler that runs it as ``"module:function"``. Handlers are imported only
+when their agent runs, so listing agents (or any other lightweight command)
+never loads pandas, NumPy or pydantic.
+
+A handler takes the positional arguments after the agent name and the
+services to run against (``StoreServices`` for the ledger store, or the
+daemon's warm equivalents), and returns a JSON-serializable result.
+"""
+from __future__ import annotations
+
+import importlib
+from decimal import Decimal, InvalidOperation
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+
+class AgentUsageError(ValueError):
+    """An agent was run with missing or malformed arguments."""
+
+
+# A NamedTuple rather than a dataclass: dataclasses pulls in ``inspect``,
+# which would be most of the registry's import time.
+class AgentSpec(NamedTuple):
+    name: str
+    agent_id: str
+    role: str
+    usage: str
+    handler: str | None = None
+    # Where agents without a Python handler are implemented instead.
+    source: str | None = None
+
+    def load(self) -> Callable[[list[str], StoreServices], Any]:
+        if self.handler is None:
+            raise AgentUsageError(f"{self.agent_id} is implemented in {self.source} and cannot run from br_fin")
+        module, _, function = self.handler.partition(":")
+        return getattr(importlib.import_module(module), function)
+
+
+AGENTS: dict[str, AgentSpec] = {
+    spec.name: spec
+    for spec in (
+        AgentSpec(
+            "budgeteer",
+            "agent.budgeteer",
+            "Budget management and allocation tracking",
+            "check BUDGET_ID AMOUNT | report BUDGET_ID | spend BUDGET_ID AMOUNT"
+            " | allocate BUDGET_ID NAME AMOUNT PERIOD [CURRENCY [ACCOUNT]]",
+            handler="agents.registry:run_budgeteer",
+        ),
+        AgentSpec(
+            "reconcile",
+            "agent.reconcile",
+            "Transaction reconciliation and variance detection",
+            "ACCOUNT START END [EXPECTED_BALANCE [CURRENCY]]",
+            handler="agents.registry:run_reconcile",
+        ),
+        AgentSpec(
+            "forecast",
+            "agent.forecast",
+            "Financial forecasting and trend analysis",
+            "see agents/forecast.ts",
+            source="agents/forecast.ts",
+        ),
+        AgentSpec(
+            "audit",
+            "agent.audit",
+            "Financial compliance and verification",
+            "see agents/audit.ts",
+            source="agents/audit.ts",
+        ),
+    )
+}
+
+
+class StoreServices:
+    """Budget and transaction services over the ledger store at ``db_path``."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+
+    def budgets(self):
+        from lib.ledger_store import StoreBudgetService
+
+        return StoreBudgetService(self.db_path)
+
+    def transactions(self):
+        from lib.ledger_store import StoreTransactionService
+
+        return StoreTransactionService(self.db_path)
+
+
+def get_agent(name: str) -> AgentSpec:
+    if name not in AGENTS:
+        raise AgentUsageError(f"Unknown agent: {name}. Available agents: {', '.join(AGENTS)}")
+    return AGENTS[name]
+
+
+def dispatch(name: str, args: list[str], services: StoreServices) -> Any:
+    """Run agent ``name`` with command-line ``args`` against ``services``."""
+    return get_agent(name).load()(list(args), services)
+
+
+def _amount(value: str) -> Decimal:
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise AgentUsageError(f"Not an amount: {value}") from None
+
+
+def _date(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise AgentUsageError(f"Not a date (YYYY-MM-DD): {value}") from None
+
+
+def _usage(name: str) -> AgentUsageError:
+    return AgentUsageError(f"Usage: br_fin run {name} {AGENTS[name].usage}")
+
+
+def run_budgeteer(args: list[str], services: StoreServices) -> dict:
+    from agents.budgeteer import ServiceBudgeteer
+
+    service = services.budgets()
+    agent = ServiceBudgeteer(service)
+    action, rest = (args[0], args[1:]) if args else (None, [])
+    try:
+        if action == "check" and len(rest) == 2:
+            return agent.check_budget(rest[0], _amount(rest[1]))
+        if action == "report" and len(rest) == 1:
+            return agent.generate_report(rest[0])
+        if action == "spend" and len(rest) == 2:
+            agent.record_spend(rest[0], _amount(rest[1]))
+            return agent.generate_report(rest[0])
+        if action == "allocate" and len(rest) in (4, 5, 6):
+            budget_id, name, amount, period = rest[:4]
+            currency = rest[4].upper() if len(rest) >= 5 else "USD"
+            account = rest[5] if len(rest) == 6 else None
+            try:
+                service.put_budget(budget_id, name, _amount(amount), period, currency, account)
+            except ValueError as error:
+                raise AgentUsageError(str(error)) from None
+            return agent.generate_report(budget_id)
+    except KeyError as error:
+        raise AgentUsageError(error.args[0]) from None
+    raise _usage("budgeteer")
+
+
+def run_reconcile(args: list[str], services: StoreServices) -> dict:
+    if len(args) not in (3, 4, 5):
+        raise _usage("reconcile")
+    from agents.reconcile import Reconcile
+
+    account, start, end = args[0], _date(args[1]), _date(args[2])
+    expected = _amount(args[3]) if len(args) > 3 else Decimal(0)
+    currency = args[4].upper() if len(args) > 4 else "USD"
+    agent = Reconcile(services.transactions())
+    return agent.reconcile_account(account, expected, start, end, currency)
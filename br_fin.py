@@ -1,14 +1,27 @@
-from __future__ import annotations
-
 """
 BlackRoad Finance Pack CLI
 Main entry point for finance pack operations.
+
+``info``, ``list`` and ``help`` are answered before click is imported.
+pandas, NumPy, pydantic and the engines are imported inside the commands
+that use them, so no command pays for a dependency it does not touch.
 """
+from __future__ import annotations
 
 import sys
-from decimal import Decimal
-from datetime import datetime
-from typing import Literal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from agents.registry import AGENTS, StoreServices, dispatch
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from lib import forecast_engine, ledger_store
+    from lib.fx import FxRateTable
+
+PACK_COMMANDS = ("info", "list", "help")
+DB_PATH = Path(".tmp-ledgers.db")
 
 
 class FinancePack:
@@ -17,7 +30,7 @@ class FinancePack:
     def __init__(self):
         self.pack_id = "pack.finance"
         self.version = "0.1.0"
-        self.agents = ["budgeteer", "reconcile", "forecast", "audit"]
+        self.agents = list(AGENTS)
     
     def info(self) -> dict:
         """Display pack information."""
@@ -32,20 +45,29 @@ class FinancePack:
         """List available agents."""
         return self.agents
     
-    def run_agent(self, agent_name: str, *args) -> None:
-        """Run a specific agent."""
-        if agent_name not in self.agents:
-            print(f"Unknown agent: {agent_name}")
-            print(f"Available agents: {', '.join(self.agents)}")
-            return
-        
-        print(f"Running agent: {agent_name}")
-        # Agent execution would be implemented here
-        # TODO(cli): Implement agent execution logic
+    def render(self, command: str) -> str:
+        """Output of one of the ``PACK_COMMANDS``."""
+        if command == "info":
+            info = self.info()
+            return "\n".join([
+                f"Pack: {info['pack_id']}",
+                f"Version: {info['version']}",
+                f"Status: {info['status']}",
+                f"Agents: {', '.join(info['agents'])}",
+            ])
+        if command == "list":
+            return "\n".join(
+                ["Available agents:"] + [f"  - {name:<10} {AGENTS[name].role}" for name in self.list_agents()]
+            )
+        return self.help()
     
-    def help(self) -> None:
-        """Display help information."""
-        print(f"""
+    def run_agent(self, agent_name: str, *args: str) -> Any:
+        """Run a specific agent against the ledger store and return its result."""
+        return dispatch(agent_name, list(args), StoreServices(DB_PATH))
+    
+    def help(self) -> str:
+        """Help text for the agent commands."""
+        return f"""
 BlackRoad Finance Pack v{self.version}
 
 Usage:
@@ -53,97 +75,64 @@ Usage:
   br_fin list              - List available agents
   br_fin run <agent> ...   - Run a specific agent
   br_fin help              - Show this help message
+  br_fin --help            - List every command (import, reconcile, forecast, ...)
 
 Available agents:
-  {chr(10).join(f'  - {agent}' for agent in self.agents)}
+{chr(10).join(f'  - {agent}: {AGENTS[agent].usage}' for agent in self.agents)}
 
 Examples:
+  br_fin run budgeteer allocate budget-001 "Q1 Operations" 100000.00 quarterly
   br_fin run budgeteer check budget-001 5000.00
   br_fin run reconcile account-001 2024-01-01 2024-01-31
-  br_fin run forecast revenue monthly
-  br_fin run audit ledger.csv
-        """.strip())
+        """.strip()
 
 
-def main():
-    """Main CLI entry point."""
-    pack = FinancePack()
-    
-    if len(sys.argv) < 2:
-        pack.help()
-        return
-    
-    command = sys.argv[1]
-    
-    if command == "info":
-        info = pack.info()
-        print(f"Pack: {info['pack_id']}")
-        print(f"Version: {info['version']}")
-        print(f"Status: {info['status']}")
-        print(f"Agents: {', '.join(info['agents'])}")
-    
-    elif command == "list":
-        print("Available agents:")
-        for agent in pack.list_agents():
-            print(f"  - {agent}")
-    
-    elif command == "run":
-        if len(sys.argv) < 3:
-            print("Error: Agent name required")
-            print("Usage: br_fin run <agent> [args...]")
-            return
-        
-        agent_name = sys.argv[2]
-        pack.run_agent(agent_name, *sys.argv[3:])
-    
-    elif command == "help":
-        pack.help()
-    
-    else:
-        print(f"Unknown command: {command}")
-        pack.help()
+# Describing the pack needs nothing below, so when run as a script these
+# commands print and exit here; everything else falls through to click.
+if __name__ == "__main__" and len(sys.argv) == 2 and sys.argv[1] in PACK_COMMANDS:
+    print(FinancePack().render(sys.argv[1]))
+    sys.exit(0)
 
+from decimal import Decimal  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
 
-if __name__ == "__main__":
-    main()
-import sqlite3
-from pathlib import Path
+import click  # noqa: E402
 
-import click
-import pandas as pd
+from agents.registry import AgentUsageError  # noqa: E402
+from lib import defaults  # noqa: E402
 
-from lib import csv_utils
-from models.budget_model import BudgetModel, BudgetLine
 
-DB_PATH = Path(".tmp-ledgers.db")
+def import_ledgers(directory: Path, workers: int = 1, snapshot: bool = True) -> ledger_store.ImportReport:
+    """Import ``directory`` into the store, then bring its binary snapshot up to date."""
+    from lib import ledger_store
 
+    conn = ledger_store.connect(DB_PATH)
+    try:
+        report = ledger_store.import_directory(conn, directory, workers=workers)
+        if snapshot:
+            refresh_snapshot(conn)
+        return report
+    finally:
+        conn.close()
 
-def init_db(conn: sqlite3.Connection) -> None:
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS ledger (
-            date TEXT,
-            account TEXT,
-            debit REAL,
-            credit REAL,
-            description TEXT
-        )
-        """
-    )
-    conn.commit()
 
+def refresh_snapshot(conn: sqlite3.Connection, force: bool = False) -> bool:
+    """Rewrite the store snapshot unless it is already current; True if it was written."""
+    from lib import snapshot
 
-def import_ledgers(directory: Path) -> None:
-    ledgers = csv_utils.load_ledgers(directory)
-    conn = sqlite3.connect(DB_PATH)
-    init_db(conn)
-    for ledger in ledgers:
-        df = csv_utils.to_dataframe(ledger)
-        df.to_sql("ledger", conn, if_exists="append", index=False)
-    conn.close()
+    path = snapshot.snapshot_path(DB_PATH)
+    if not force and path.exists():
+        try:
+            with snapshot.open_snapshot(path) as current:
+                if current.is_current(conn):
+                    return False
+        except ValueError:
+            pass  # unreadable or an older format: rewrite it
+    snapshot.write_snapshot(conn, path)
+    return True
 
 
-def ascii_chart(series: list[float]) -> str:
+def ascii_chart(series: list[float], prefix: str = "M") -> str:
     if not series:
         return "(no data)"
     max_value = max(series)
@@ -151,61 +140,833 @@ def ascii_chart(series: list[float]) -> str:
     lines = []
     for idx, value in enumerate(series, start=1):
         bar = "#" * int(value * scale)
-        lines.append(f"M{idx}: {bar} {value:.2f}")
+        lines.append(f"{prefix}{idx}: {bar} {value:.2f}")
     return "\n".join(lines)
 
 
-def forecast_cash_flow(months: int) -> list[float]:
+def forecast_accounts(
+    horizon: int,
+    model: str = "rolling",
+    freq: str = "month",
+    accounts: list[str] | None = None,
+    use_cache: bool = True,
+) -> forecast_engine.Forecast:
+    import pandas as pd
+
+    from lib import forecast_cache, forecast_engine, ledger_store
+
     if not DB_PATH.exists():
-        return [0.0 for _ in range(months)]
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT debit, credit FROM ledger", conn)
-    conn.close()
-    df["net"] = df["debit"] - df["credit"]
-    rolling = df["net"].rolling(window=2, min_periods=1).mean()
-    baseline = rolling.mean() if not rolling.empty else 0
-    return [round(baseline * (1 + i * 0.01), 2) for i in range(months)]
+        return forecast_engine.forecast(forecast_engine.net_series(pd.DataFrame(), freq), model, horizon)
+    conn = ledger_store.connect(DB_PATH)
+    try:
+
+        def compute() -> forecast_engine.Forecast:
+            series = forecast_engine.load_net_series(conn, freq, accounts)
+            return forecast_engine.forecast(series, model, horizon)
+
+        if not use_cache:
+            return compute()
+        cache = forecast_cache.ForecastCache(conn)
+        result = cache.get_or_compute(compute, model=model, params={}, horizon=horizon, freq=freq, accounts=accounts)
+        cache.flush()
+        return result
+    finally:
+        conn.close()
 
 
-def reconcile_file(path: Path) -> dict[str, float]:
-    ledger = csv_utils.read_ledger_csv(path)
-    return ledger.summary()
+def forecast_cash_flow(
+    months: int, model: str = "rolling", freq: str = "month", use_cache: bool = True
+) -> list[float]:
+    result = forecast_accounts(months, model, freq, use_cache=use_cache)
+    return [round(float(value), 2) for value in result.total()]
+
+
+def reconcile_file(
+    path: Path,
+    streaming: bool = False,
+    chunk_size: int = defaults.DEFAULT_CHUNK_SIZE,
+    fx: FxRateTable | None = None,
+    currency: str | None = None,
+) -> dict[str, float]:
+    from agents import reconcile as reconcile_agent
+
+    return reconcile_agent.reconcile_file(path, streaming, chunk_size, fx, currency)
+
+
+class EchoReporter:
+    """``Reporter`` that prints each message, prefixed with its channel."""
+
+    def post(self, channel: str, message: str) -> None:
+        click.echo(f"{channel} {message}")
+
+
+def load_fx(currency: str | None, fx_rates: str | None) -> FxRateTable | None:
+    if currency is None:
+        return None
+    if fx_rates is None:
+        raise click.UsageError("--currency needs --fx-rates")
+    from lib.fx import FxRateTable
+
+    return FxRateTable.from_csv(Path(fx_rates))
 
 
 @click.group()
-def cli() -> None:
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    envvar="BR_FIN_NO_DAEMON",
+    help="Run locally even if a daemon is serving the ledger store",
+)
+@click.pass_context
+def cli(ctx: click.Context, no_daemon: bool) -> None:
     """FinancePack CLI for imports, reconciliation, and forecasting."""
+    ctx.obj = {"no_daemon": no_daemon}
+
+
+def daemon_client():
+    """Client for a running ``br_fin daemon`` on ``DB_PATH``, or None to run locally."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and (ctx.find_root().obj or {}).get("no_daemon"):
+        return None
+    from lib.daemon_client import find_daemon
+
+    return find_daemon(DB_PATH)
+
+
+def forward(client, method: str, **params: Any) -> Any:
+    from lib.daemon_client import DaemonError
+
+    try:
+        return client.call(method, **params)
+    except DaemonError as error:
+        if error.kind == "usage":
+            raise click.UsageError(str(error)) from None
+        raise click.ClickException(f"daemon: {error}") from None
+
+
+@cli.command()
+def info() -> None:
+    """Show pack information."""
+    click.echo(FinancePack().render("info"))
+
+
+@cli.command(name="list")
+def list_() -> None:
+    """List available agents."""
+    click.echo(FinancePack().render("list"))
+
+
+@cli.command(context_settings={"ignore_unknown_options": True})
+@click.argument("agent")
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+def run(agent: str, args: tuple[str, ...]) -> None:
+    """Run an agent against the ledger store and print its result as JSON."""
+    client = daemon_client()
+    try:
+        if client is not None:
+            result = forward(client, "run", agent=agent, args=list(args))
+        else:
+            result = FinancePack().run_agent(agent, *args)
+    except AgentUsageError as error:
+        raise click.UsageError(str(error)) from None
+    import json
+
+    click.echo(json.dumps(result, indent=2, default=str))
+
+
+@cli.command(name="help")
+def help_() -> None:
+    """Show agent usage and examples."""
+    click.echo(FinancePack().render("help"))
+
+
+workers_option = click.option(
+    "--workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Processes used to parse ledger files in parallel",
+)
 
 
 @cli.command(name="import")
 @click.argument("directory", type=click.Path(exists=True))
-def import_(directory: str) -> None:
-    """Import ledger CSVs into a temporary SQLite store."""
+@workers_option
+@click.option("--no-snapshot", is_flag=True, help="Leave the binary snapshot as it is")
+def import_(directory: str, workers: int, no_snapshot: bool) -> None:
+    """Import ledger CSVs into a temporary SQLite store and refresh its snapshot."""
     dir_path = Path(directory)
-    import_ledgers(dir_path)
-    click.echo(f"Imported ledgers from {dir_path}")
+    report = import_ledgers(dir_path, workers=workers, snapshot=not no_snapshot)
+    click.echo(f"Imported ledgers from {dir_path}: {report.summary()}")
+    for path, error in report.failed.items():
+        click.echo(f"  failed {path}: {error}", err=True)
+    if report.failed:
+        raise click.ClickException(f"{len(report.failed)} ledger file(s) failed to import")
 
 
 @cli.command()
-@click.argument("ledger_file", type=click.Path(exists=True))
-def reconcile(ledger_file: str) -> None:
-    """Reconcile a specific ledger file and print imbalance."""
-    summary = reconcile_file(Path(ledger_file))
-    click.echo(summary)
+@click.option("--write", "rewrite", is_flag=True, help="Rewrite the snapshot even if it is current")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day (inclusive) to summarize")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day (inclusive) to summarize")
+def snapshot(rewrite: bool, start: datetime | None, end: datetime | None) -> None:
+    """Describe the memory-mapped ledger snapshot and summarize it without loading the store."""
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    import time
+
+    from lib import ledger_store
+    from lib import snapshot as snapshots
+
+    conn = ledger_store.connect(DB_PATH)
+    try:
+        if rewrite or not snapshots.snapshot_path(DB_PATH).exists():
+            refresh_snapshot(conn, force=True)
+        opened = time.perf_counter()
+        with snapshots.open_snapshot(snapshots.snapshot_path(DB_PATH)) as mapped:
+            elapsed = (time.perf_counter() - opened) * 1000
+            state = "current" if mapped.is_current(conn) else "stale; run snapshot --write"
+            click.echo(
+                f"{snapshots.snapshot_path(DB_PATH)}: {len(mapped):,} rows, {len(mapped.accounts):,} accounts, "
+                f"{state}, mapped in {elapsed:.2f}ms"
+            )
+            click.echo(mapped.between(date_key(start), date_key(end)).summary())
+    finally:
+        conn.close()
+
+
+@cli.command()
+@click.option("--close", multiple=True, type=click.DateTime(formats=["%Y-%m"]), help="Make a month (YYYY-MM) read-only")
+@click.option("--reopen", multiple=True, type=click.DateTime(formats=["%Y-%m"]), help="Make a closed month writable")
+@click.option(
+    "--compact", multiple=True, type=click.DateTime(formats=["%Y-%m"]), help="Rewrite a closed month in account order"
+)
+@click.option("--vacuum", is_flag=True, help="Return pages freed by compaction to the file system")
+def partitions(
+    close: tuple[datetime, ...], reopen: tuple[datetime, ...], compact: tuple[datetime, ...], vacuum: bool
+) -> None:
+    """List the monthly ledger partitions, closing, reopening or compacting months first."""
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    from lib import ledger_store
+
+    conn = ledger_store.connect(DB_PATH)
+    try:
+        for month in reopen:
+            ledger_store.reopen_month(conn, month_key(month))
+        for month in close:
+            ledger_store.close_month(conn, month_key(month))
+        for month in compact:
+            try:
+                ledger_store.compact_month(conn, month_key(month))
+            except (KeyError, ValueError) as error:
+                raise click.ClickException(error.args[0]) from None
+        if vacuum:
+            conn.execute("VACUUM")
+        click.echo(f"{'month':<8} {'rows':>10} {'size':>10}  state")
+        for partition in ledger_store.partitions(conn, sizes=True):
+            size = "-" if partition.size_bytes is None else f"{partition.size_bytes / 1024:,.0f}K"
+            state = "closed" if partition.closed else "open"
+            if partition.compacted_at:
+                state += ", compacted"
+            label = f"{partition.month // 100:04d}-{partition.month % 100:02d}"
+            click.echo(f"{label:<8} {partition.rows:>10,} {size:>10}  {state}")
+    finally:
+        conn.close()
+
+
+@cli.command()
+@click.argument("source", type=click.File("r", encoding="utf-8"), default="-")
+@click.option(
+    "--batch-size",
+    default=defaults.DEFAULT_BATCH_SIZE,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Entries per commit",
+)
+@click.option(
+    "--max-delay",
+    default=defaults.DEFAULT_MAX_DELAY,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds an entry may wait for its batch to fill before it is committed",
+)
+@click.option("--alert-channel", help="Watch store budgets as entries arrive and print alerts for this channel")
+@click.option(
+    "--alert-at",
+    multiple=True,
+    type=float,
+    default=defaults.DEFAULT_ALERT_THRESHOLDS,
+    show_default=True,
+    help="Projected utilization percent that raises an alert (repeatable)",
+)
+@click.option(
+    "--debounce",
+    default=defaults.DEFAULT_DEBOUNCE_SECONDS,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="Seconds between alerts for one budget",
+)
+@click.option("--as-of", type=click.DateTime(formats=["%Y-%m-%d"]), help="Day budget periods start from [default: today]")
+def ingest(
+    source,
+    batch_size: int,
+    max_delay: float,
+    alert_channel: str | None,
+    alert_at: tuple[float, ...],
+    debounce: float,
+    as_of: datetime | None,
+) -> None:
+    """Append live entries (JSON lines, "-" for stdin) to the ledger store.
+
+    Each line is a TransactionEntry (id, timestamp, account, amount,
+    entry_type) or a ledger row (date, account, debit, credit); entries whose
+    id is already stored are skipped. A daemon with real_time_sync enabled
+    takes the entries itself. With --alert-channel every budget with an
+    account is charged as entries arrive, and an alert is printed as soon
+    as its projected period spend crosses an --alert-at threshold.
+    """
+    import json
+
+    entries = (json.loads(line) for line in source if line.strip())
+    monitor = None
+    if alert_channel:
+        from lib import ledger_store
+        from lib.budget_monitor import BudgetMonitor
+
+        conn = ledger_store.connect(DB_PATH)
+        try:
+            monitor = BudgetMonitor.from_store(
+                conn,
+                EchoReporter(),
+                as_of=as_of,
+                channel=alert_channel,
+                thresholds=alert_at,
+                debounce_seconds=debounce,
+            )
+        finally:
+            conn.close()
+
+    # Only entries the store reports as new are charged, so redeliveries are not.
+    def charge(entry: dict) -> None:
+        if monitor is not None:
+            monitor.observe(entry)
+            monitor.flush()
+
+    def charge_row(position: int, row: tuple) -> None:
+        monitor.observe_row(row)
+        monitor.flush()
+
+    client = daemon_client()
+    if client is not None and forward(client, "status")["real_time_sync"]:
+
+        def append(batch: list[dict]) -> int:
+            result = forward(client, "append", entries=batch)
+            for position in result["stored"]:
+                charge(batch[position])
+            return result["accepted"]
+
+        accepted = 0
+        batch: list[dict] = []
+        try:
+            for entry in entries:
+                batch.append(entry)
+                if len(batch) == batch_size:
+                    accepted += append(batch)
+                    batch = []
+        except (KeyError, ValueError) as error:
+            raise click.ClickException(f"Bad entry: {error}") from None
+        if batch:
+            accepted += append(batch)
+        click.echo(f"Appended {accepted} entries through the daemon")
+    else:
+        from lib.ingest import LedgerWriter
+
+        try:
+            with LedgerWriter(DB_PATH, batch_size, max_delay) as writer:
+                for entry in entries:
+                    writer.append(entry, None if monitor is None else charge_row)
+        except (KeyError, ValueError) as error:
+            raise click.ClickException(f"Bad entry: {error}") from None
+        click.echo(f"Appended entries: {writer.stats.summary()}")
+    if monitor is not None:
+        monitor.flush(force=True)
+        click.echo(f"Budget alerts: {monitor.summary()}")
+
+
+@cli.command()
+@click.argument("ledger_path", type=click.Path(exists=True))
+@click.option("--stream", is_flag=True, help="Read the file in chunks with constant memory")
+@click.option(
+    "--chunk-size",
+    default=defaults.DEFAULT_CHUNK_SIZE,
+    show_default=True,
+    help="Rows per chunk when streaming",
+)
+@workers_option
+@click.option("--currency", help="Restate every ledger in this reporting currency (e.g. EUR)")
+@click.option(
+    "--fx-rates",
+    type=click.Path(exists=True, dir_okay=False),
+    help="CSV of date,currency,rate (value of one unit in USD) used with --currency",
+)
+def reconcile(
+    ledger_path: str,
+    stream: bool,
+    chunk_size: int,
+    workers: int,
+    currency: str | None,
+    fx_rates: str | None,
+) -> None:
+    """Reconcile a ledger file, or every ledger in a directory, and print imbalance."""
+    path = Path(ledger_path)
+    currency = currency.upper() if currency else None
+    fx = load_fx(currency, fx_rates)
+    if path.is_file():
+        click.echo(reconcile_file(path, streaming=stream, chunk_size=chunk_size, fx=fx, currency=currency))
+        return
+    from agents import reconcile as reconcile_agent
+
+    paths = sorted(path.glob("*.csv"))
+    failures = 0
+    results = reconcile_agent.reconcile_paths(paths, stream, chunk_size, workers, fx, currency)
+    for ledger, (summary, error) in zip(paths, results):
+        if error is not None:
+            failures += 1
+            click.echo(f"{ledger.name}: failed: {error}", err=True)
+        else:
+            click.echo(f"{ledger.name}: {summary}")
+    if failures:
+        raise click.ClickException(f"{failures} ledger file(s) failed to reconcile")
+
+
+@cli.command()
+@click.argument("ledger_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("statement_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--window", default=defaults.DEFAULT_WINDOW_DAYS, show_default=True, help="Max days between matched dates")
+@click.option(
+    "--min-similarity",
+    default=defaults.DEFAULT_MIN_SIMILARITY,
+    show_default=True,
+    help="Min description similarity (0-1) for matches without a shared reference",
+)
+@click.option("--output", type=click.Path(file_okay=False), help="Write matched/unmatched/duplicate CSVs here")
+def match(ledger_path: str, statement_path: str, window: int, min_similarity: float, output: str | None) -> None:
+    """Match ledger entries against a bank statement (date,amount[,reference,description,id])."""
+    import pandas as pd
+
+    from lib import csv_utils, matching
+
+    ledger = csv_utils.read_ledger_frame(Path(ledger_path)).columns
+    # Ledger rows are identified by their CSV line number.
+    ledger = ledger.assign(id=ledger.index + 2, amount=ledger["debit"] - ledger["credit"])
+    statement = pd.read_csv(statement_path, dtype={"reference": str, "description": str}, keep_default_na=False)
+    if "id" not in statement.columns:
+        statement["id"] = statement.index + 2
+    result = matching.match_transactions(ledger, statement, window, min_similarity)
+    click.echo(result.summary())
+    if output:
+        directory = Path(output)
+        directory.mkdir(parents=True, exist_ok=True)
+        result.matched.to_csv(directory / "matched.csv", index=False)
+        result.unmatched_ledger.to_csv(directory / "unmatched_ledger.csv", index=False)
+        result.unmatched_statement.to_csv(directory / "unmatched_statement.csv", index=False)
+        result.duplicates.to_csv(directory / "duplicates.csv", index=False)
+
+
+@cli.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--period", type=click.DateTime(formats=["%Y-%m"]), help="Only check lines dated in this month (YYYY-MM)")
+@click.option("--chunk-size", default=defaults.DEFAULT_CHUNK_SIZE, show_default=True, help="Rows read per chunk")
+@click.option("--limit", default=20, show_default=True, help="Findings listed per kind (0 lists all)")
+@click.option("--output", type=click.Path(file_okay=False), help="Write unbalanced/orphans/duplicates CSVs here")
+def validate(paths: tuple[str, ...], period: datetime | None, chunk_size: int, limit: int, output: str | None) -> None:
+    """Check that every journal transaction balances, with no orphan lines or duplicate postings.
+
+    Lines are grouped by journal_id when the ledger has one, otherwise by
+    date and description. Exits non-zero when anything is found, so the
+    monthly close stops on a broken journal.
+    """
+    from lib import csv_utils, journal
+
+    files = []
+    for name in paths:
+        path = Path(name)
+        files.extend(sorted(path.glob("*.csv")) if path.is_dir() else [path])
+    try:
+        report = journal.validate_ledgers(files, chunk_size, month_key(period) if period else None)
+    except csv_utils.LedgerFormatError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(report.summary())
+    for kind, frame in (("unbalanced", report.unbalanced), ("orphan", report.orphans), ("duplicate", report.duplicates)):
+        shown = frame if limit <= 0 else frame.head(limit)
+        for row in shown.itertuples(index=False):
+            if kind == "unbalanced":
+                detail = (
+                    f"{row.transaction!r} on {row.date}: {row.lines} lines, debits {row.debit:.2f} "
+                    f"{row.currency} vs credits {row.credit:.2f}"
+                )
+            elif kind == "orphan":
+                detail = f"{row.transaction!r} on {row.date}: {row.reason}"
+            else:
+                detail = f"posted {row.postings} times, last at {row.last_file}:{row.last_line}"
+            click.echo(f"  {kind} {row.file}:{row.line} {detail}")
+        if len(shown) < len(frame):
+            click.echo(f"  ... {len(frame) - len(shown)} more {kind} finding(s)")
+    if output:
+        directory = Path(output)
+        directory.mkdir(parents=True, exist_ok=True)
+        report.unbalanced.to_csv(directory / "unbalanced.csv", index=False)
+        report.orphans.to_csv(directory / "orphans.csv", index=False)
+        report.duplicates.to_csv(directory / "duplicates.csv", index=False)
+    if not report.ok:
+        findings = len(report.unbalanced) + len(report.orphans) + len(report.duplicates)
+        raise click.ClickException(f"{findings} journal integrity finding(s)")
+
+
+@cli.command(name="reconcile-accounts")
+@click.argument("jobs_path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--fetch-concurrency",
+    default=16,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Concurrent transaction fetches",
+)
+@workers_option
+def reconcile_accounts(jobs_path: str, fetch_concurrency: int, workers: int) -> None:
+    """Reconcile many accounts from a CSV of account,expected_balance,start,end[,currency].
+
+    Transactions come from the imported ledger store; timeouts and retries
+    follow the reconcile agent settings in configs/finance-pack.yml.
+    """
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    import pandas as pd
+
+    from agents import reconcile as reconcile_agent
+    from lib import ledger_store
+
+    frame = pd.read_csv(jobs_path, dtype=str, keep_default_na=False)
+    jobs = [
+        reconcile_agent.ReconcileJob(
+            account=row["account"],
+            expected_balance=Decimal(row["expected_balance"]),
+            start_date=datetime.fromisoformat(row["start"]),
+            end_date=datetime.fromisoformat(row["end"]),
+            currency=row.get("currency") or "USD",
+        )
+        for row in frame.to_dict("records")
+    ]
+    agent = reconcile_agent.Reconcile(ledger_store.StoreTransactionService(DB_PATH))
+    try:
+        run = agent.reconcile_accounts(jobs, fetch_concurrency=fetch_concurrency, workers=workers)
+    except ValueError as error:
+        raise click.ClickException(str(error)) from None
+    for result in run.results:
+        status = "ok" if result["is_balanced"] else f"variance {result['variance']}"
+        click.echo(f"{result['account']:<40} {result['period_start'][:10]}..{result['period_end'][:10]}  {status}")
+    for label, error in run.failed.items():
+        click.echo(f"{label}: failed: {error}", err=True)
+    click.echo(run.summary())
+    if run.failed:
+        raise click.ClickException(f"{len(run.failed)} account(s) failed to reconcile")
+
+
+def date_key(value: datetime | None) -> int | None:
+    return None if value is None else value.year * 10000 + value.month * 100 + value.day
+
+
+def month_key(value: datetime) -> int:
+    return value.year * 100 + value.month
+
+
+@cli.command()
+@click.option(
+    "--by",
+    type=click.Choice(["account", "month", "day"]),
+    default="account",
+    show_default=True,
+    help="Roll balances up per account (trial balance), month or day",
+)
+@click.option("--account", "accounts", multiple=True, help="Limit to these accounts")
+@click.option("--start", type=click.DateTime(formats=["%Y-%m-%d"]), help="First day (inclusive)")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day (inclusive)")
+def balances(by: str, accounts: tuple[str, ...], start: datetime | None, end: datetime | None) -> None:
+    """Print debit, credit and net balances from the imported ledger rollups."""
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    query = {"by": by, "accounts": list(accounts) or None, "start": date_key(start), "end": date_key(end)}
+    client = daemon_client()
+    if client is not None:
+        rows = forward(client, "balances", **query)
+    else:
+        from lib import ledger_store
+
+        conn = ledger_store.connect(DB_PATH)
+        try:
+            rows = ledger_store.balances(conn, **query).to_dict("records")
+        finally:
+            conn.close()
+    period = {"account": None, "month": "month", "day": "date"}[by]
+    for row in rows:
+        label = row["account"] if period is None else f"{row['account']} {row[period]}"
+        click.echo(
+            f"{label:<40} debit {row['debit_cents'] / 100:>14,.2f}  "
+            f"credit {row['credit_cents'] / 100:>14,.2f}  net {row['net_cents'] / 100:>14,.2f}"
+        )
+    if period is None:
+        click.echo(
+            f"{'Total':<40} debit {sum(row['debit_cents'] for row in rows) / 100:>14,.2f}  "
+            f"credit {sum(row['credit_cents'] for row in rows) / 100:>14,.2f}  "
+            f"net {sum(row['net_cents'] for row in rows) / 100:>14,.2f}"
+        )
+
+
+@cli.command()
+@click.option("--start", type=click.DateTime(formats=["%Y-%m"]), help="First month (YYYY-MM) [default: first in ledger]")
+@click.option("--end", type=click.DateTime(formats=["%Y-%m"]), help="Last month (YYYY-MM) [default: last in ledger]")
+@click.option(
+    "--budgets",
+    "budgets_path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Budget lines CSV (id,name,account,period,allocated) instead of the store's budgets",
+)
+@click.option("--warn-at", default=90.0, show_default=True, help="Utilization percent that raises a warning")
+@click.option("--limit", default=20, show_default=True, help="Breaches and warnings listed (0 lists all)")
+@click.option("--output", type=click.Path(file_okay=False), help="Write variance.csv here")
+@click.option("--fail-on-breach", is_flag=True, help="Exit non-zero when any line is over budget")
+@click.option("--fail-on-empty", is_flag=True, help="Exit non-zero when no budget line falls in the range")
+def variance(
+    start: datetime | None,
+    end: datetime | None,
+    budgets_path: str | None,
+    warn_at: float,
+    limit: int,
+    output: str | None,
+    fail_on_breach: bool,
+    fail_on_empty: bool,
+) -> None:
+    """Compare monthly, quarterly and yearly budgets with ledger actuals per period.
+
+    Actuals are each account's net debits from the imported ledger rollups;
+    every period overlapping --start..--end is reported whole.
+    """
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    from lib import ledger_store
+    from lib import variance as variances
+
+    conn = ledger_store.connect(DB_PATH)
+    try:
+        budgets = variances.read_budgets(budgets_path) if budgets_path else None
+        report = variances.store_variance(
+            conn, month_key(start) if start else None, month_key(end) if end else None, budgets, warn_at
+        )
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    finally:
+        conn.close()
+    click.echo(variances.summary(report))
+    flagged = report[report["breach"] | report["warning"]]
+    flagged = flagged.sort_values("utilization", ascending=False, kind="stable")
+    shown = flagged if limit <= 0 else flagged.head(limit)
+    for row in shown.itertuples(index=False):
+        label = "breach" if row.breach else "warning"
+        click.echo(
+            f"  {label:<7} {row.id} {row.account!r} {row.period} {row.period_start}-{row.period_end}: "
+            f"actual {row.actual:,.2f} vs allocated {row.allocated:,.2f} {row.currency} ({row.utilization:.1f}%)"
+        )
+    if len(shown) < len(flagged):
+        click.echo(f"  ... {len(flagged) - len(shown)} more flagged line(s)")
+    if output:
+        directory = Path(output)
+        directory.mkdir(parents=True, exist_ok=True)
+        report.to_csv(directory / "variance.csv", index=False)
+    if fail_on_empty and report.empty:
+        raise click.ClickException("No budget lines in range; allocate budgets or pass --budgets")
+    breaches = int(report["breach"].sum())
+    if fail_on_breach and breaches:
+        raise click.ClickException(f"{breaches} budget line(s) over allocation")
 
 
 @cli.command()
 @click.argument("target", type=click.Choice(["cash-flow"]))
-@click.option("--months", default=3, show_default=True, help="Months to forecast")
-def forecast(target: str, months: int) -> None:
-    """Forecast cash flow with a simple rolling-average heuristic."""
+@click.option(
+    "--horizon",
+    "--months",
+    "horizon",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Periods to forecast",
+)
+@click.option(
+    "--model",
+    type=click.Choice(defaults.FORECAST_MODELS),
+    default="rolling",
+    show_default=True,
+    help="Forecast model",
+)
+@click.option(
+    "--freq",
+    type=click.Choice(defaults.FORECAST_FREQUENCIES),
+    default="month",
+    show_default=True,
+    help="Resample the ledger into monthly or daily net flows",
+)
+@click.option("--by-account", is_flag=True, help="Print one forecast row per account")
+@click.option("--account", "accounts", multiple=True, help="Limit to these accounts")
+@click.option("--no-cache", is_flag=True, help="Recompute even if a cached forecast is current")
+def forecast(
+    target: str,
+    horizon: int,
+    model: str,
+    freq: str,
+    by_account: bool,
+    accounts: tuple[str, ...],
+    no_cache: bool,
+) -> None:
+    """Forecast net cash flow per period from the imported ledger."""
     if target != "cash-flow":
         raise click.ClickException("Unsupported forecast target")
-    series = forecast_cash_flow(months)
-    click.echo("Cash-Flow Forecast")
+    client = daemon_client()
+    if client is not None:
+        result = forward(
+            client,
+            "forecast",
+            horizon=horizon,
+            model=model,
+            freq=freq,
+            accounts=list(accounts) or None,
+            use_cache=not no_cache,
+        )
+    else:
+        from lib.forecast_cache import as_dict
+
+        result = as_dict(forecast_accounts(horizon, model, freq, list(accounts) or None, not no_cache))
+    if by_account:
+        click.echo(f"{'account':<40} " + " ".join(f"{label:>12}" for label in result["labels"]))
+        for account, row in zip(result["accounts"], result["values"]):
+            click.echo(f"{account:<40} " + " ".join(f"{value:>12.2f}" for value in row))
+        return
+    series = [round(float(value), 2) for value in result["total"]]
+    prefix = "M" if freq == "month" else "D"
+    click.echo(f"Cash-Flow Forecast ({model})")
     for idx, value in enumerate(series, start=1):
-        click.echo(f"M{idx}: {value:.2f}")
-    click.echo("\n" + ascii_chart(series))
+        click.echo(f"{prefix}{idx}: {value:.2f}")
+    click.echo("\n" + ascii_chart(series, prefix))
+
+
+@cli.command(name="forecast-cache")
+@click.option("--clear", is_flag=True, help="Drop every cached forecast")
+def forecast_cache_(clear: bool) -> None:
+    """Show forecast cache statistics."""
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    from lib import forecast_cache, ledger_store
+
+    conn = ledger_store.connect(DB_PATH)
+    try:
+        cache = forecast_cache.ForecastCache(conn)
+        if clear:
+            cache.clear()
+        click.echo(cache.stats())
+    finally:
+        conn.close()
+
+
+@cli.command(name="runway")
+@click.option("--budget", "budget_limit", type=float, required=True, help="Monthly budget limit")
+@click.option(
+    "--account",
+    "accounts",
+    multiple=True,
+    help="Spend accounts to simulate (net flow) [default: debits across every account]",
+)
+@click.option("--as-of", type=click.DateTime(formats=["%Y-%m-%d"]), help="Last day of actuals [default: today]")
+@click.option("--lookback", default=90, show_default=True, type=click.IntRange(min=1), help="Days of history to resample")
+@click.option("--paths", default=defaults.DEFAULT_PATHS, show_default=True, type=click.IntRange(min=1))
+@click.option("--seed", default=0, show_default=True, help="Random seed; the same seed reproduces a run")
+@workers_option
+def runway_(
+    budget_limit: float,
+    accounts: tuple[str, ...],
+    as_of: datetime | None,
+    lookback: int,
+    paths: int,
+    seed: int,
+    workers: int,
+) -> None:
+    """Simulate month-end spend (P10/P50/P90) and the odds of breaching the budget.
+
+    With --account the spend is those accounts' net flow. Without it every
+    account's net flow would cancel out, so spend is the debit side of the
+    whole ledger instead.
+    """
+    if not DB_PATH.exists():
+        raise click.ClickException(f"No ledger store at {DB_PATH}; run import first")
+    import calendar
+
+    from agents.budgeteer import Budgeteer
+    from lib import ledger_store, runway
+
+    as_of = as_of or datetime.now()
+    month_start = as_of.replace(day=1)
+    conn = ledger_store.connect(DB_PATH)
+    try:
+        selected = list(accounts) or None
+        side = "net" if selected else "debit"
+        month_to_date = runway.daily_flows(conn, selected, date_key(month_start), date_key(as_of), side)
+        history = runway.daily_flows(
+            conn, selected, date_key(as_of - timedelta(days=lookback - 1)), date_key(as_of), side
+        )
+    finally:
+        conn.close()
+    if not len(history):
+        raise click.ClickException("No ledger activity in the lookback window")
+    simulation = Budgeteer(budget_limit=budget_limit).simulate(
+        history,
+        current_spend=int(month_to_date.sum()) / 100,
+        days_elapsed=as_of.day,
+        days_in_month=calendar.monthrange(as_of.year, as_of.month)[1],
+        paths=paths,
+        seed=seed,
+        workers=workers,
+    )
+    click.echo(simulation.summary())
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Interface to listen on")
+@click.option("--port", default=0, show_default=True, help="Port to listen on; 0 picks a free one")
+@click.option("--workers", default=8, show_default=True, type=click.IntRange(min=1), help="Request threads")
+@click.option("--status", "show_status", is_flag=True, help="Describe the running daemon and exit")
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+def daemon(host: str, port: int, workers: int, show_status: bool, stop: bool) -> None:
+    """Serve the ledger store warm over a local RPC API until stopped.
+
+    While it runs, balances, forecast and run forward to it, and so does
+    ingest if features.real_time_sync is on; pass --no-daemon (or set
+    BR_FIN_NO_DAEMON=1) to bypass it.
+    """
+    from lib.daemon_client import find_daemon
+
+    client = find_daemon(DB_PATH)
+    if show_status or stop:
+        if client is None:
+            raise click.ClickException(f"No daemon is serving {DB_PATH}")
+        click.echo(forward(client, "shutdown" if stop else "status"))
+        return
+    if client is not None:
+        raise click.ClickException(f"A daemon is already serving {DB_PATH} on port {client.port}")
+    from lib.daemon import FinanceDaemon
+
+    server = FinanceDaemon(DB_PATH, host, port, workers)
+    click.echo(f"Serving {DB_PATH} on http://{server.host}:{server.port} with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
 
 
 @cli.command()
@@ -213,6 +974,10 @@ def forecast(target: str, months: int) -> None:
 @click.option("--limit", default=1500.0)
 def scaffold_budget(owner: str, limit: float) -> None:
     """Generate a starter budget JSON document."""
+    import pandas as pd
+
+    from models.budget_model import BudgetLine, BudgetModel
+
     model = BudgetModel(
         effective_date=pd.Timestamp("2025-11-01").date(),
         lines=[
@@ -223,6 +988,11 @@ def scaffold_budget(owner: str, limit: float) -> None:
     click.echo(model.json(indent=2))
 
 
-if __name__ == "__main__":
-    # TODO(fin-pack-next): add multi-currency flag and Stripe webhook trigger
+def main() -> None:
+    """Main CLI entry point."""
+    # TODO(fin-pack-next): add Stripe webhook trigger
     cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Event-driven budget breach alerts, fed one ledger entry or cost record at a time.
+
+``BudgetMonitor`` keeps each watched budget's spend for its current period
+(monthly, quarterly or yearly, on calendar boundaries) and updates it in
+O(1) per event: an account lookup, an add, and a forecast of the period
+from the burn so far, the same straight-line projection as
+``Budgeteer.forecast``:
+
+    forecast = spent / days_elapsed * days_in_period
+
+When the forecast's share of the allocation crosses one of ``thresholds``
+(percentages, e.g. 80 and 100), one alert is posted through a ``Reporter``.
+Alerts are debounced per budget: after a post, further crossings wait out
+``debounce_seconds`` and are then sent by ``flush`` as one message per
+channel carrying each budget's highest level. A budget whose forecast falls
+back below a threshold (refunds) re-arms it.
+
+An event dated after its budget's period starts the next period from zero;
+one dated before the current period is counted as ``stale`` and ignored.
+Every event is charged, so callers feed only entries the store accepted as
+new; ``br_fin.py ingest`` charges what ``LedgerWriter`` reports as stored,
+so a redelivered entry is not counted twice.
+``from_store`` seeds every USD budget that has an account with its
+period-to-date spend from the ledger rollups.
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import itertools
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Iterable
+
+from lib import ledger_store
+from lib.defaults import DEFAULT_ALERT_THRESHOLDS, DEFAULT_DEBOUNCE_SECONDS
+from lib.fx import DEFAULT_CURRENCY
+from lib.ingest import ledger_row
+from lib.variance import PERIOD_MONTHS
+from models.money import Money
+
+ALL_ACCOUNTS = None
+
+
+def _period(day: date, months: int) -> tuple[int, int]:
+    """First day and the day after the last, as ordinals, of the period containing ``day``."""
+    first = (day.month - 1) // months * months
+    start = date(day.year, first + 1, 1)
+    year, month = divmod(first + months, 12)
+    return start.toordinal(), date(day.year + year, month + 1, 1).toordinal()
+
+
+def _date(value: date | datetime | str | int) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, int):
+        return date(value // 10000, value // 100 % 100, value % 100)
+    return date.fromisoformat(value[:10])
+
+
+def _day_key(day: date) -> int:
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+@dataclass(frozen=True)
+class BudgetAlert:
+    budget_id: str
+    name: str
+    channel: str
+    threshold: float
+    spent: Money
+    allocated: Money
+    forecast: Money
+    utilization: float
+    day: int
+    days: int
+
+    def message(self) -> str:
+        return (
+            f"{self.name} ({self.budget_id}): projected ${self.forecast.to_decimal():,.2f} is "
+            f"{self.utilization:,.1f}% of ${self.allocated.to_decimal():,.2f} (alert at {self.threshold:g}%); "
+            f"spent ${self.spent.to_decimal():,.2f} by day {self.day} of {self.days}"
+        )
+
+
+class _Budget:
+    __slots__ = (
+        "budget_id",
+        "name",
+        "channel",
+        "allocated",
+        "months",
+        "start",
+        "end",
+        "spent",
+        "level",
+        "posted_at",
+        "day",
+    )
+
+    def __init__(self, budget_id: str, name: str, channel: str, allocated: int, months: int, start: date, spent: int):
+        self.budget_id = budget_id
+        self.name = name
+        self.channel = channel
+        self.allocated = allocated
+        self.months = months
+        self.start, self.end = _period(start, months)
+        self.spent = spent
+        # Index of the highest threshold alerted this period, -1 for none.
+        self.level = -1
+        self.posted_at: float | None = None
+        # Ordinal of the latest event day, for days elapsed.
+        self.day = start.toordinal()
+
+
+class BudgetMonitor:
+    """Incremental per-budget spend, burn and forecast alerts; see the module docstring."""
+
+    def __init__(
+        self,
+        reporter: Any,
+        channel: str = "#finops",
+        thresholds: Iterable[float] = DEFAULT_ALERT_THRESHOLDS,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.reporter = reporter
+        self.channel = channel
+        self.thresholds = sorted(float(threshold) for threshold in thresholds)
+        if not self.thresholds:
+            raise ValueError("at least one alert threshold is required")
+        self.debounce_seconds = debounce_seconds
+        self.clock = clock
+        self._budgets: dict[str, _Budget] = {}
+        self._by_account: dict[str | None, list[_Budget]] = {}
+        # Held budgets, and a heap of (due time, hold order, budget) over them.
+        self._pending: dict[str, _Budget] = {}
+        self._due: list[tuple[float, int, _Budget]] = []
+        self._held = itertools.count()
+        self.events = 0
+        self.stale = 0
+        self.posted = 0
+
+    def watch(
+        self,
+        budget_id: str,
+        allocated: object,
+        period: str = "monthly",
+        accounts: Iterable[str] | None = ALL_ACCOUNTS,
+        name: str | None = None,
+        as_of: date | datetime | str | None = None,
+        spent: object = 0,
+        channel: str | None = None,
+    ) -> None:
+        """Watch a budget charged by events on ``accounts`` (every event when None).
+
+        ``spent`` is the spend so far in the period containing ``as_of``
+        (default today). Amounts are USD, like the ledger store.
+        """
+        if period not in PERIOD_MONTHS:
+            raise ValueError(f"Unknown budget period {period!r}; use {sorted(PERIOD_MONTHS)}")
+        if budget_id in self._budgets:
+            raise ValueError(f"Budget {budget_id} is already watched")
+        budget = _Budget(
+            budget_id,
+            name or budget_id,
+            channel or self.channel,
+            Money.of(allocated, DEFAULT_CURRENCY).minor,
+            PERIOD_MONTHS[period],
+            date.today() if as_of is None else _date(as_of),
+            Money.of(spent, DEFAULT_CURRENCY).minor,
+        )
+        self._budgets[budget_id] = budget
+        for account in [ALL_ACCOUNTS] if accounts is ALL_ACCOUNTS else accounts:
+            self._by_account.setdefault(account, []).append(budget)
+        self._check(budget)
+
+    @classmethod
+    def from_store(
+        cls,
+        conn: sqlite3.Connection,
+        reporter: Any,
+        as_of: date | datetime | str | None = None,
+        **options: Any,
+    ) -> BudgetMonitor:
+        """A monitor watching every USD store budget with an account, seeded with period-to-date spend."""
+        monitor = cls(reporter, **options)
+        day = date.today() if as_of is None else _date(as_of)
+        rows = conn.execute(
+            "SELECT id, name, period, allocated_minor, account FROM budgets"
+            " WHERE account IS NOT NULL AND currency = ? ORDER BY id",
+            (DEFAULT_CURRENCY,),
+        ).fetchall()
+        # One rollup read per period length in use, not one per budget.
+        spent: dict[str, dict[str, int]] = {}
+        for period in {row[2] for row in rows} & set(PERIOD_MONTHS):
+            start, _ = _period(day, PERIOD_MONTHS[period])
+            totals = ledger_store.balances(conn, start=_day_key(date.fromordinal(start)), end=_day_key(day))
+            spent[period] = dict(zip(totals["account"], totals["net_cents"].tolist()))
+        for budget_id, name, period, allocated, account in rows:
+            monitor.watch(
+                budget_id,
+                Money(allocated, DEFAULT_CURRENCY).to_decimal(),
+                period,
+                [account],
+                name,
+                day,
+                Money(spent.get(period, {}).get(account, 0), DEFAULT_CURRENCY).to_decimal(),
+            )
+        return monitor
+
+    def observe(self, entry: Any) -> list[BudgetAlert]:
+        """Charge one ledger entry (any shape ``ingest.ledger_row`` takes); returns alerts posted."""
+        return self.observe_row(ledger_row(entry))
+
+    def observe_row(self, row: tuple) -> list[BudgetAlert]:
+        """Charge one ``ledger_store.append_entries`` row; returns alerts posted."""
+        _, day, account, debit, credit, _ = row
+        return self._charge(account, debit - credit, _date(day))
+
+    def observe_cost(
+        self, amount: object, when: date | datetime | str, key: str | None = None
+    ) -> list[BudgetAlert]:
+        """Charge one cost record (e.g. a linked account's new spend) to budgets watching ``key``."""
+        return self._charge(key, Money.of(amount, DEFAULT_CURRENCY).minor, _date(when))
+
+    def _charge(self, account: str | None, cents: int, day: date) -> list[BudgetAlert]:
+        self.events += 1
+        posted: list[BudgetAlert] = []
+        ordinal = day.toordinal()
+        for key in (account, ALL_ACCOUNTS) if account is not ALL_ACCOUNTS else (ALL_ACCOUNTS,):
+            for budget in self._by_account.get(key, ()):
+                if ordinal < budget.start:
+                    self.stale += 1
+                    continue
+                if ordinal >= budget.end:
+                    budget.start, budget.end = _period(day, budget.months)
+                    budget.spent, budget.level = 0, -1
+                    self._pending.pop(budget.budget_id, None)
+                budget.spent += cents
+                budget.day = max(budget.day, ordinal)
+                alert = self._check(budget)
+                if alert is not None:
+                    posted.append(alert)
+        return posted
+
+    def _forecast(self, budget: _Budget) -> tuple[int, float]:
+        elapsed = max(budget.day - budget.start + 1, 1)
+        forecast = round(budget.spent * (budget.end - budget.start) / elapsed)
+        utilization = forecast / budget.allocated * 100 if budget.allocated > 0 else 0.0
+        return forecast, utilization
+
+    def _check(self, budget: _Budget) -> BudgetAlert | None:
+        _, utilization = self._forecast(budget)
+        level = bisect.bisect_right(self.thresholds, utilization) - 1
+        if level <= budget.level:
+            # Re-arm thresholds the forecast has fallen back below.
+            budget.level = level
+            return None
+        now = self.clock()
+        if budget.posted_at is not None and now - budget.posted_at < self.debounce_seconds:
+            if budget.budget_id not in self._pending:
+                self._pending[budget.budget_id] = budget
+                heapq.heappush(self._due, (budget.posted_at + self.debounce_seconds, next(self._held), budget))
+            return None
+        alert = self._alert(budget, level)
+        budget.level, budget.posted_at = level, now
+        self._post(budget.channel, [alert])
+        return alert
+
+    def _alert(self, budget: _Budget, level: int) -> BudgetAlert:
+        forecast, utilization = self._forecast(budget)
+        return BudgetAlert(
+            budget.budget_id,
+            budget.name,
+            budget.channel,
+            self.thresholds[level],
+            Money(budget.spent, DEFAULT_CURRENCY),
+            Money(budget.allocated, DEFAULT_CURRENCY),
+            Money(forecast, DEFAULT_CURRENCY),
+            utilization,
+            max(budget.day - budget.start + 1, 1),
+            budget.end - budget.start,
+        )
+
+    def _post(self, channel: str, alerts: list[BudgetAlert]) -> None:
+        self.posted += len(alerts)
+        lines = "\n".join(alert.message() for alert in alerts)
+        self.reporter.post(channel, f"[finance-budgeteer] Budget alert{'s' if len(alerts) > 1 else ''} — {lines}")
+
+    def flush(self, force: bool = False) -> list[BudgetAlert]:
+        """Post held alerts whose debounce window has passed (all of them with ``force``).
+
+        Held alerts due together go out as one message per channel; a budget
+        whose forecast has dropped back meanwhile is not reported.
+        """
+        if not self._pending:
+            return []
+        now = self.clock()
+        if force:
+            ready = list(self._pending.values())
+            self._pending.clear()
+            self._due.clear()
+        else:
+            ready = []
+            while self._due and self._due[0][0] <= now:
+                budget = heapq.heappop(self._due)[2]
+                # Skip entries left behind by a period rollover or an earlier flush.
+                if self._pending.get(budget.budget_id) is budget and now - budget.posted_at >= self.debounce_seconds:
+                    del self._pending[budget.budget_id]
+                    ready.append(budget)
+        due: dict[str, list[BudgetAlert]] = {}
+        for budget in ready:
+            _, utilization = self._forecast(budget)
+            level = bisect.bisect_right(self.thresholds, utilization) - 1
+            if level > budget.level:
+                due.setdefault(budget.channel, []).append(self._alert(budget, level))
+                budget.level, budget.posted_at = level, now
+            else:
+                budget.level = level
+        posted = []
+        for channel, alerts in due.items():
+            self._post(channel, alerts)
+            posted.extend(alerts)
+        return posted
+
+    def state(self, budget_id: str) -> dict:
+        """Period-to-date spend, daily burn and forecast utilization for one budget."""
+        budget = self._budgets[budget_id]
+        forecast, utilization = self._forecast(budget)
+        elapsed = max(budget.day - budget.start + 1, 1)
+        return {
+            "budget_id": budget_id,
+            "period_start": date.fromordinal(budget.start).isoformat(),
+            "period_end": date.fromordinal(budget.end - 1).isoformat(),
+            "allocated": str(Money(budget.allocated, DEFAULT_CURRENCY)),
+            "spent": str(Money(budget.spent, DEFAULT_CURRENCY)),
+            "burn_rate": str(Money(round(budget.spent / elapsed), DEFAULT_CURRENCY)),
+            "forecast": str(Money(forecast, DEFAULT_CURRENCY)),
+            "forecast_utilization": round(utilization, 2),
+            "alerted_at": None if budget.level < 0 else self.thresholds[budget.level],
+        }
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "budgets": len(self._budgets),
+            "events": self.events,
+            "stale": self.stale,
+            "alerts": self.posted,
+            "held": len(self._pending),
+        }
+
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "configs" / "finance-pack.yml"
+
+
+def load_pack_config(path: Path = CONFIG_PATH) -> dict[str, Any]:
+    """Load ``configs/finance-pack.yml`` (or another pack config) as a dict."""
+    with path.open(encoding="utf-8") as handle:
+        return yaml.safe_load(handle) or {}
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    requests_per_minute: int = 60
+    burst: int = 10
+
+
+def rate_limits(config: dict[str, Any] | None = None) -> RateLimits:
+    section = (config if config is not None else load_pack_config()).get("rate_limits") or {}
+    defaults = RateLimits()
+    return RateLimits(
+        requests_per_minute=int(section.get("requests_per_minute", defaults.requests_per_minute)),
+        burst=int(section.get("burst", defaults.burst)),
+    )
+
+
+@dataclass(frozen=True)
+class AgentSettings:
+    enabled: bool = True
+    timeout: float = 30.0
+    retry: int = 0
+
+
+def agent_settings(name: str, config: dict[str, Any] | None = None) -> AgentSettings:
+    """Settings for one entry of the ``agents`` section (e.g. ``"reconcile"``)."""
+    section = ((config if config is not None else load_pack_config()).get("agents") or {}).get(name) or {}
+    defaults = AgentSettings()
+    return AgentSettings(
+        enabled=bool(section.get("enabled", defaults.enabled)),
+        timeout=float(section.get("timeout", defaults.timeout)),
+        retry=int(section.get("retry", defaults.retry)),
+    )
+
+
+def feature_enabled(name: str, config: dict[str, Any] | None = None) -> bool:
+    """Whether ``features.<name>`` is switched on; missing flags are off."""
+    features = (config if config is not None else load_pack_config()).get("features") or {}
+    return bool(features.get(name, False))
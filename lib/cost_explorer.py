@@ -0,0 +1,206 @@
+"""Asyncio fetch engine for Cost Explorer ``get_cost_and_usage``.
+
+Queries fan out across linked accounts and services under a concurrency
+limit and the pack's ``rate_limits``, follow ``NextPageToken`` until every
+page is read, and retry throttling and transient errors with exponential
+backoff. Clients may be synchronous (boto3, run in a worker thread) or expose
+an ``async def get_cost_and_usage`` (aiobotocore, test fakes).
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+from lib.config import RateLimits
+
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "LimitExceededException",
+    "RequestLimitExceeded",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+    "InternalFailure",
+}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Throttling/transient AWS error codes, plus connection errors and timeouts."""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES
+    return False
+
+
+class AsyncRateLimiter:
+    """Token bucket: ``requests_per_minute`` sustained, bursts up to ``burst``."""
+
+    def __init__(
+        self,
+        limits: RateLimits,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.rate = limits.requests_per_minute / 60.0
+        self.capacity = max(1, limits.burst)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await self.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(frozen=True)
+class CostQuery:
+    """One ``get_cost_and_usage`` request, optionally scoped to an account and service."""
+
+    time_period: Dict[str, str]
+    granularity: str = "DAILY"
+    metrics: tuple[str, ...] = ("UnblendedCost",)
+    account: str | None = None
+    service: str | None = None
+    group_by: tuple[Dict[str, str], ...] = ()
+
+    def request(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {
+            "TimePeriod": dict(self.time_period),
+            "Granularity": self.granularity,
+            "Metrics": list(self.metrics),
+        }
+        dimensions = []
+        if self.account is not None:
+            dimensions.append({"Dimensions": {"Key": "LINKED_ACCOUNT", "Values": [self.account]}})
+        if self.service is not None:
+            dimensions.append({"Dimensions": {"Key": "SERVICE", "Values": [self.service]}})
+        if len(dimensions) == 1:
+            kwargs["Filter"] = dimensions[0]
+        elif dimensions:
+            kwargs["Filter"] = {"And": dimensions}
+        if self.group_by:
+            kwargs["GroupBy"] = [dict(group) for group in self.group_by]
+        return kwargs
+
+
+@dataclass
+class CostResult:
+    query: CostQuery
+    results_by_time: List[Dict[str, Any]] = field(default_factory=list)
+    pages: int = 0
+    error: BaseException | None = None
+
+    def total(self, metric: str = "UnblendedCost") -> float:
+        """Sum ``metric`` over every period (and every group, when grouped)."""
+        amount = 0.0
+        for period in self.results_by_time:
+            buckets = [period.get("Total", {})] + [group.get("Metrics", {}) for group in period.get("Groups", [])]
+            for bucket in buckets:
+                try:
+                    amount += float(bucket.get(metric, {}).get("Amount", 0))
+                except (TypeError, ValueError):
+                    continue
+        return amount
+
+
+class CostExplorerFetcher:
+    """Fetches many ``CostQuery`` objects concurrently with paging and retry."""
+
+    def __init__(
+        self,
+        client: Any,
+        concurrency: int = 8,
+        rate_limits: RateLimits | None = None,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        retryable: Callable[[BaseException], bool] = is_retryable,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.rate_limits = rate_limits
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retryable = retryable
+        self.sleep = sleep
+        self.calls = 0
+
+    async def _call(self, kwargs: Dict[str, Any], limiter: AsyncRateLimiter | None) -> Dict[str, Any]:
+        method = self.client.get_cost_and_usage
+        attempt = 0
+        while True:
+            if limiter is not None:
+                await limiter.acquire()
+            self.calls += 1
+            try:
+                if inspect.iscoroutinefunction(method):
+                    return await method(**kwargs)
+                return await asyncio.to_thread(method, **kwargs)
+            except Exception as exc:
+                if attempt >= self.retries or not self.retryable(exc):
+                    raise
+                delay = min(self.max_backoff, self.backoff * 2**attempt)
+                attempt += 1
+                # Full jitter keeps retries from many tasks from re-aligning.
+                await self.sleep(random.uniform(0, delay))
+
+    async def _fetch(
+        self, query: CostQuery, semaphore: asyncio.Semaphore, limiter: AsyncRateLimiter | None
+    ) -> CostResult:
+        result = CostResult(query)
+        kwargs = query.request()
+        async with semaphore:
+            try:
+                while True:
+                    response = await self._call(kwargs, limiter)
+                    result.pages += 1
+                    result.results_by_time.extend(response.get("ResultsByTime", []))
+                    token = response.get("NextPageToken")
+                    if not token:
+                        break
+                    kwargs = {**kwargs, "NextPageToken": token}
+            except Exception as exc:
+                result.error = exc
+        return result
+
+    async def fetch_all(self, queries: Iterable[CostQuery]) -> List[CostResult]:
+        """Run every query; results come back in input order with per-query errors."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = AsyncRateLimiter(self.rate_limits, sleep=self.sleep) if self.rate_limits else None
+        return list(await asyncio.gather(*(self._fetch(query, semaphore, limiter) for query in queries)))
+
+    def run(self, queries: Iterable[CostQuery]) -> List[CostResult]:
+        """Synchronous entry point for callers outside an event loop."""
+        return asyncio.run(self.fetch_all(list(queries)))
+
+
+def fan_out(
+    time_period: Dict[str, str],
+    accounts: Iterable[str | None] = (None,),
+    services: Iterable[str | None] = (None,),
+    granularity: str = "DAILY",
+    metrics: tuple[str, ...] = ("UnblendedCost",),
+) -> List[CostQuery]:
+    """One query per (account, service) pair."""
+    services = list(services)
+    return [
+        CostQuery(time_period, granularity, metrics, account=account, service=service)
+        for account in accounts
+        for service in services
+    ]
@@ -65,12 +65,20 @@ def write_ledger_csv(path: Path, entries: list[dict[str, Any]]) -> None:
                 'category': entry.get('category', ''),
             }
             writer.writerow(row)
+import io
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Iterable, Iterator, List, Sequence, TypeVar
 
 import pandas as pd
 
+from lib.defaults import DEFAULT_CHUNK_SIZE
+from lib.fx import DEFAULT_CURRENCY, FxRateTable, convert_ledger_frame
 from models.ledger_entry import LedgerEntry, LedgerFile
+from models.money import to_minor_array
+
+T = TypeVar("T")
 
 
 def read_ledger_csv(path: Path) -> LedgerFile:
@@ -82,17 +90,220 @@ def read_ledger_csv(path: Path) -> LedgerFile:
     return LedgerFile(name=path.name, entries=rows)
 
 
-def load_ledgers(directory: Path) -> list[LedgerFile]:
-    return [read_ledger_csv(path) for path in sorted(directory.glob("*.csv"))]
+LEDGER_COLUMNS = ["date", "account", "debit", "credit", "description"]
+AMOUNT_COLUMNS = ["debit", "credit"]
+# Optional ISO 4217 column; ledgers without it are in DEFAULT_CURRENCY.
+CURRENCY_COLUMN = "currency"
+# Optional id tying the lines of one journal transaction together.
+JOURNAL_COLUMN = "journal_id"
+
+
+class LedgerFormatError(ValueError):
+    """Raised when ledger rows fail validation; ``errors`` holds (line, message) pairs."""
+
+    def __init__(self, name: str, errors: List[tuple[int, str]]):
+        self.name = name
+        self.errors = errors
+        detail = "; ".join(f"line {line}: {message}" for line, message in errors[:20])
+        if len(errors) > 20:
+            detail += f"; ... {len(errors) - 20} more"
+        super().__init__(f"{name}: {len(errors)} invalid row(s): {detail}")
+
+    def __reduce__(self):
+        # Keep the error picklable so process-pool workers can return it.
+        return (self.__class__, (self.name, self.errors))
+
+
+def validate_ledger_frame(frame: pd.DataFrame, name: str, first_line: int = 2) -> pd.DataFrame:
+    """Apply the LedgerEntry checks to whole columns of raw CSV text.
+
+    Empty amounts become zero, amounts must be numeric and non-negative, dates
+    must be ISO formatted and accounts present. An optional ``currency``
+    column is upper-cased, blanks default to ``DEFAULT_CURRENCY``, and codes
+    must be three letters. An optional ``journal_id`` column is kept as
+    stripped text, blank when absent. ``first_line`` is the file line number
+    of the frame's first row (the header is line 1).
+    """
+    missing = [column for column in LEDGER_COLUMNS if column not in frame.columns]
+    if missing:
+        raise LedgerFormatError(name, [(1, f"missing column(s): {', '.join(missing)}")])
+
+    problems: list[tuple[pd.Series, str]] = []
+    typed = pd.DataFrame(index=frame.index)
+
+    raw_dates = frame["date"]
+    typed["date"] = pd.to_datetime(raw_dates, format="%Y-%m-%d", errors="coerce")
+    problems.append((typed["date"].isna(), "invalid date"))
+
+    account = frame["account"].fillna("")
+    typed["account"] = account
+    problems.append((account.str.strip() == "", "account is required"))
+
+    for column in AMOUNT_COLUMNS:
+        raw = frame[column]
+        if pd.api.types.is_numeric_dtype(raw):
+            values = raw.astype("float64")
+            blank = values.isna()
+            unparsable = pd.Series(False, index=frame.index)
+        else:
+            text = raw.fillna("").astype(str).str.strip()
+            blank = text == ""
+            values = pd.to_numeric(text.where(~blank), errors="coerce")
+            unparsable = values.isna() & ~blank
+        values = values.fillna(0.0)
+        problems.append((unparsable, f"{column} is not a number"))
+        problems.append((values < 0, "Amounts must be non-negative"))
+        typed[column] = values
+
+    typed["description"] = frame["description"]
+
+    if CURRENCY_COLUMN in frame.columns:
+        currency = frame[CURRENCY_COLUMN].fillna("").astype(str).str.strip().str.upper()
+        currency = currency.where(currency != "", DEFAULT_CURRENCY)
+        problems.append((~currency.str.fullmatch("[A-Z]{3}"), "currency must be a 3-letter code"))
+        typed[CURRENCY_COLUMN] = currency
+
+    if JOURNAL_COLUMN in frame.columns:
+        typed[JOURNAL_COLUMN] = frame[JOURNAL_COLUMN].fillna("").astype(str).str.strip()
+
+    errors: list[tuple[int, str]] = []
+    for mask, message in problems:
+        for position in mask.to_numpy().nonzero()[0]:
+            errors.append((first_line + int(position), message))
+    if errors:
+        errors.sort()
+        raise LedgerFormatError(name, errors)
+    return typed.reset_index(drop=True)
+
+
+_READ_CSV_OPTIONS = {
+    "dtype": {"account": str, "description": str, CURRENCY_COLUMN: str, JOURNAL_COLUMN: str},
+    "keep_default_na": False,
+    "na_values": {column: [""] for column in AMOUNT_COLUMNS},
+}
+
+
+def read_ledger_frame(path: Path) -> LedgerFile:
+    """Columnar fast path for ``read_ledger_csv`` that never builds per-row models."""
+    frame = pd.read_csv(path, **_READ_CSV_OPTIONS)
+    return LedgerFile(name=path.name, columns=validate_ledger_frame(frame, path.name))
+
+
+def iter_ledger_chunks(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Yield validated column chunks of at most ``chunk_size`` rows."""
+    first_line = 2
+    with pd.read_csv(path, chunksize=chunk_size, **_READ_CSV_OPTIONS) as reader:
+        for chunk in reader:
+            yield validate_ledger_frame(chunk, path.name, first_line=first_line)
+            first_line += len(chunk)
+
+
+def read_ledger_tail(path: Path, offset: int, first_line: int) -> pd.DataFrame:
+    """Validate only the rows stored after byte ``offset`` (an earlier end of file)."""
+    with path.open("rb") as handle:
+        header = handle.readline()
+        handle.seek(offset)
+        tail = handle.read()
+    frame = pd.read_csv(io.BytesIO(header + tail), **_READ_CSV_OPTIONS)
+    return validate_ledger_frame(frame, path.name, first_line=first_line)
+
+
+def stream_ledger_summary(
+    path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    fx: FxRateTable | None = None,
+    currency: str | None = None,
+) -> dict[str, float]:
+    """``LedgerFile.summary()`` computed from running totals in constant memory.
+
+    With ``fx`` and ``currency`` every chunk is restated in ``currency`` first.
+    """
+    entries = 0
+    debit_cents = 0
+    credit_cents = 0
+    for chunk in iter_ledger_chunks(path, chunk_size):
+        if fx is not None and currency is not None:
+            chunk = convert_ledger_frame(chunk, fx, currency)
+        entries += len(chunk)
+        debit_cents += int(to_minor_array(chunk["debit"]).sum())
+        credit_cents += int(to_minor_array(chunk["credit"]).sum())
+    return {
+        "entries": entries,
+        "debits": debit_cents / 100,
+        "credits": credit_cents / 100,
+        "imbalance": (debit_cents - credit_cents) / 100,
+    }
+
+
+def parallel_map(
+    func: Callable[..., T], calls: Sequence[tuple], workers: int = 1
+) -> list[tuple[T | None, BaseException | None]]:
+    """Run ``func(*args)`` for each call, in order, isolating failures per call.
+
+    With ``workers > 1`` the calls are spread across a process pool, so
+    ``func`` and its arguments must be picklable. Each result is a
+    ``(value, error)`` pair in the order of ``calls``.
+    """
+    if workers <= 1 or len(calls) <= 1:
+        results: list[tuple[T | None, BaseException | None]] = []
+        for args in calls:
+            try:
+                results.append((func(*args), None))
+            except Exception as exc:
+                results.append((None, exc))
+        return results
+    with ProcessPoolExecutor(max_workers=min(workers, len(calls))) as pool:
+        futures = [pool.submit(func, *args) for args in calls]
+        return [
+            (None, future.exception()) if future.exception() else (future.result(), None)
+            for future in futures
+        ]
+
+
+@dataclass
+class LedgerLoad:
+    path: Path
+    ledger: LedgerFile | None = None
+    error: BaseException | None = None
+
+
+def load_ledger_files(
+    paths: Iterable[Path], columnar: bool = False, workers: int = 1
+) -> list[LedgerLoad]:
+    """Parse ledger files, optionally in parallel, keeping per-file errors apart."""
+    paths = list(paths)
+    reader = read_ledger_frame if columnar else read_ledger_csv
+    results = parallel_map(reader, [(path,) for path in paths], workers)
+    return [LedgerLoad(path, ledger, error) for path, (ledger, error) in zip(paths, results)]
+
+
+def load_ledgers(directory: Path, columnar: bool = False, workers: int = 1) -> list[LedgerFile]:
+    loads = load_ledger_files(sorted(directory.glob("*.csv")), columnar, workers)
+    for load in loads:
+        if load.error is not None:
+            raise load.error
+    return [load.ledger for load in loads]
 
 
 def to_dataframe(ledger: LedgerFile) -> pd.DataFrame:
+    if ledger.columns is not None:
+        return ledger.columns
     data = [entry.dict() for entry in ledger.entries]
     return pd.DataFrame(data)
 
 
-def aggregate_balances(ledgers: Iterable[LedgerFile]) -> pd.DataFrame:
-    frames = [to_dataframe(ledger) for ledger in ledgers]
+def aggregate_balances(
+    ledgers: Iterable[LedgerFile], fx: FxRateTable | None = None, currency: str | None = None
+) -> pd.DataFrame:
+    """Debit, credit and net per account; restated in ``currency`` when ``fx`` is given."""
+    convert = fx is not None and currency is not None
+    frames = [
+        (convert_ledger_frame(to_dataframe(ledger), fx, currency) if convert else to_dataframe(ledger))[
+            ["account", "debit", "credit"]
+        ]
+        for ledger in ledgers
+        if ledger.entry_count()
+    ]
     if not frames:
         return pd.DataFrame(columns=["account", "debit", "credit"])
     combined = pd.concat(frames, ignore_index=True)
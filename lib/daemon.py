@@ -0,0 +1,418 @@
+"""Long-running finance daemon with a warm ledger and a local RPC API.
+
+``FinanceDaemon`` keeps the balance rollups (per account, month and day) as
+DataFrames and every budget as a dict in memory, and serves RPC calls over
+HTTP on localhost (see ``lib.daemon_client`` for the wire format):
+
+``ping``, ``status``
+    Liveness and a summary of the warm state.
+``check_budget(budget_id, amount)``
+    ``Budgeteer.check_budget`` against the in-memory budgets.
+``balances(by, accounts, start, end)``
+    ``ledger_store.balances`` rows, answered from the in-memory rollups.
+``reconcile(account, start, end, expected_balance, currency)``
+    ``Reconcile.reconcile_account`` over the store's raw rows.
+``forecast(horizon, model, freq, accounts, use_cache)``
+    ``forecast_engine.forecast`` from the in-memory rollups, memoized until
+    the ledger changes.
+``run(agent, args)``
+    Anything ``br_fin.py run`` accepts, against the warm services.
+``append(entries, wait)``
+    Append live entries through a group-committing ``lib.ingest.LedgerWriter``
+    and, with ``wait``, return once they are durable along with the positions
+    of the entries that were new (``stored``). Only served when
+    ``features.real_time_sync`` is on in ``configs/finance-pack.yml``.
+``shutdown``
+    Stop serving and remove the state file.
+
+Raw ledger rows stay in SQLite; reconcile reads them through connections
+that live as long as the worker threads, so their page cache stays warm.
+
+Before each call the daemon reads SQLite's ``PRAGMA data_version``, which
+changes whenever another connection commits. Budgets are then reloaded, and
+the rollups too if the store generation moved, so imports and other writers
+are picked up without a restart. With live entries committing every few
+milliseconds, the rollups are reloaded at most once per ``LIVE_MAX_LAG``
+seconds instead; budgets are still reloaded on every change.
+"""
+from __future__ import annotations
+
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from agents.budgeteer import ServiceBudgeteer
+from agents.reconcile import Reconcile
+from agents.registry import AgentUsageError, dispatch
+from lib import forecast_cache, forecast_engine, ledger_store
+from lib.config import feature_enabled
+from lib.daemon_client import TOKEN_HEADER, state_path, write_state
+from lib.ingest import LedgerWriter
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_WORKERS = 8
+PERIODS = {"account": None, "month": "month", "day": "date"}
+LIVE_MAX_LAG = 1.0
+
+
+class WarmBudgetService:
+    """``BudgetService`` reading the daemon's budget dict and writing through to the store."""
+
+    def __init__(self, ledger: WarmLedger):
+        self.ledger = ledger
+
+    def get_budget(self, budget_id: str) -> dict:
+        budget = self.ledger.budgets.get(budget_id)
+        if budget is None:
+            raise KeyError(f"No budget {budget_id}")
+        return dict(budget)
+
+    def update_spent(self, budget_id: str, amount: Decimal) -> None:
+        self.ledger.store_budgets.update_spent(budget_id, amount)
+        self.ledger.reload_budget(budget_id)
+
+    def put_budget(
+        self,
+        budget_id: str,
+        name: str,
+        allocated: Decimal,
+        period: str,
+        currency: str = "USD",
+        account: str | None = None,
+    ) -> None:
+        self.ledger.store_budgets.put_budget(budget_id, name, allocated, period, currency, account)
+        self.ledger.reload_budget(budget_id)
+
+
+class WarmServices:
+    """``agents.registry.StoreServices`` backed by a ``WarmLedger``."""
+
+    def __init__(self, ledger: WarmLedger):
+        self.ledger = ledger
+
+    def budgets(self) -> WarmBudgetService:
+        return WarmBudgetService(self.ledger)
+
+    def transactions(self) -> ledger_store.StoreTransactionService:
+        return self.ledger.transactions
+
+
+class WarmLedger:
+    """In-memory rollups and budgets for one ledger store, refreshed when the store changes."""
+
+    def __init__(
+        self, db_path: Path, max_forecasts: int = forecast_cache.DEFAULT_MAX_ENTRIES, max_lag: float = 0.0
+    ):
+        self.db_path = db_path
+        self.max_forecasts = max_forecasts
+        self.max_lag = max_lag
+        self.store_budgets = ledger_store.StoreBudgetService(db_path)
+        self.transactions = ledger_store.StoreTransactionService(db_path)
+        self.services = WarmServices(self)
+        self.budgets: dict[str, dict] = {}
+        self.rollups: dict[str, pd.DataFrame] = {}
+        self.generation: tuple[str, int] | None = None
+        self.reloads = 0
+        self._reloaded_at = float("-inf")
+        self._forecasts: OrderedDict[tuple, forecast_engine.Forecast] = OrderedDict()
+        self._lock = threading.Lock()
+        # Only used under the lock; it exists to watch ``data_version``.
+        self._conn = ledger_store.connect(db_path, check_same_thread=False)
+        self._data_version: int | None = None
+        self.refresh()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def refresh(self) -> None:
+        """Reload whatever another connection changed since the last call.
+
+        Rollups reloaded less than ``max_lag`` seconds ago are kept; the
+        change stays pending until a call after the lag is up.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self.budgets = ledger_store.load_budgets(self._conn)
+            generation = ledger_store.generation(self._conn)
+            if generation != self.generation:
+                if time.monotonic() - self._reloaded_at < self.max_lag:
+                    return
+                self.rollups = {by: ledger_store.balances(self._conn, by=by) for by in PERIODS}
+                self.generation = generation
+                self._forecasts.clear()
+                self.reloads += 1
+                self._reloaded_at = time.monotonic()
+            self._data_version = version
+
+    def reload_budget(self, budget_id: str) -> None:
+        budget = self.store_budgets.get_budget(budget_id)
+        with self._lock:
+            self.budgets = {**self.budgets, budget_id: budget}
+
+    def balances(
+        self,
+        by: str = "account",
+        accounts: list[str] | None = None,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> pd.DataFrame:
+        """Same rows as ``ledger_store.balances``, without touching SQLite."""
+        self.refresh()
+        rollups = self.rollups
+        period = PERIODS[by]
+        if start is None and end is None:
+            frame = rollups[by]
+            if accounts is not None:
+                frame = frame[frame["account"].isin(accounts)]
+            return frame.reset_index(drop=True)
+        daily = rollups["day"]
+        mask = np.ones(len(daily), dtype=bool)
+        if accounts is not None:
+            mask &= daily["account"].isin(accounts).to_numpy()
+        if start is not None:
+            mask &= daily["date"].to_numpy() >= start
+        if end is not None:
+            mask &= daily["date"].to_numpy() <= end
+        frame = daily[mask]
+        if by == "month":
+            frame = frame.assign(month=frame["date"] // 100)
+        keys = ["account"] + ([period] if period else [])
+        columns = keys + ["debit_cents", "credit_cents", "entries"]
+        totals = frame.groupby(keys, sort=True)[columns[len(keys) :]].sum().reset_index()
+        totals = totals[columns].astype({column: "int64" for column in columns[1:]})
+        totals["net_cents"] = totals["debit_cents"] - totals["credit_cents"]
+        return totals
+
+    def forecast(
+        self,
+        horizon: int = 3,
+        model: str = "rolling",
+        freq: str = "month",
+        accounts: list[str] | None = None,
+        use_cache: bool = True,
+    ) -> forecast_engine.Forecast:
+        self.refresh()
+        key = (self.generation, model, horizon, freq, tuple(accounts) if accounts is not None else None)
+        if use_cache:
+            with self._lock:
+                if key in self._forecasts:
+                    self._forecasts.move_to_end(key)
+                    return self._forecasts[key]
+        series = forecast_engine.net_series(self.balances(by=freq, accounts=accounts), freq)
+        result = forecast_engine.forecast(series, model, horizon)
+        with self._lock:
+            # A reload while computing means the result is already stale.
+            if key[0] == self.generation:
+                self._forecasts[key] = result
+                while len(self._forecasts) > self.max_forecasts:
+                    self._forecasts.popitem(last=False)
+        return result
+
+    def check_budget(self, budget_id: str, amount: Decimal) -> dict:
+        self.refresh()
+        return ServiceBudgeteer(self.services.budgets()).check_budget(budget_id, amount)
+
+    def reconcile(
+        self,
+        account: str,
+        start: datetime,
+        end: datetime,
+        expected_balance: Decimal = Decimal(0),
+        currency: str = "USD",
+    ) -> dict:
+        return Reconcile(self.transactions).reconcile_account(account, expected_balance, start, end, currency)
+
+    def run(self, agent: str, args: list[str]) -> Any:
+        self.refresh()
+        return dispatch(agent, args, self.services)
+
+
+class _PooledHTTPServer(HTTPServer):
+    """Serves each connection on a fixed thread pool.
+
+    Unlike ``ThreadingHTTPServer``'s thread per request, pool threads
+    outlive requests, so their per-thread SQLite connections stay open.
+    """
+
+    def __init__(self, address: tuple[str, int], workers: int, daemon: FinanceDaemon):
+        super().__init__(address, _RpcHandler)
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="br-fin-rpc")
+        self.finance_daemon = daemon
+
+    def process_request(self, request, client_address) -> None:
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class _RpcHandler(BaseHTTPRequestHandler):
+    server_version = "br-fin-daemon"
+
+    def do_POST(self) -> None:
+        daemon = self.server.finance_daemon
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), daemon.token):
+            return self._reply(401, {"error": "Bad or missing token", "kind": "auth"})
+        method = daemon.methods.get(self.path.removeprefix("/rpc/"))
+        if method is None:
+            return self._reply(404, {"error": f"Unknown method {self.path}", "kind": "usage"})
+        try:
+            params = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            result = method(**params)
+        except (AgentUsageError, InvalidOperation, KeyError, TypeError, ValueError) as error:
+            message = error.args[0] if isinstance(error, KeyError) and error.args else str(error)
+            return self._reply(400, {"error": message, "kind": "usage"})
+        except Exception as error:
+            return self._reply(500, {"error": f"{type(error).__name__}: {error}", "kind": "error"})
+        self._reply(200, {"result": result})
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class FinanceDaemon:
+    def __init__(
+        self,
+        db_path: Path,
+        host: str = DEFAULT_HOST,
+        port: int = 0,
+        workers: int = DEFAULT_WORKERS,
+        config: dict[str, Any] | None = None,
+    ):
+        self.db_path = db_path
+        self.writer: LedgerWriter | None = None
+        if feature_enabled("real_time_sync", config):
+            self.writer = LedgerWriter(db_path)
+            self.ledger = WarmLedger(db_path, max_lag=LIVE_MAX_LAG)
+        else:
+            self.ledger = WarmLedger(db_path)
+        self.token = secrets.token_hex(16)
+        self.workers = workers
+        self.server = _PooledHTTPServer((host, port), workers, self)
+        self.host, self.port = self.server.server_address[:2]
+        self.methods: dict[str, Callable[..., Any]] = {
+            "ping": self._ping,
+            "status": self._status,
+            "check_budget": self._check_budget,
+            "balances": self._balances,
+            "reconcile": self._reconcile,
+            "forecast": self._forecast,
+            "run": self._run,
+            "append": self._append,
+            "shutdown": self.shutdown,
+        }
+
+    def serve_forever(self) -> None:
+        """Serve until ``shutdown``; the state file exists exactly while serving."""
+        state = write_state(self.db_path, self.host, self.port, self.token)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if self.writer is not None:
+                self.writer.close()
+            self.ledger.close()
+            state.unlink(missing_ok=True)
+
+    def shutdown(self) -> str:
+        # ``HTTPServer.shutdown`` blocks until the serve loop exits, so it
+        # cannot run on the thread answering this call.
+        threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return "stopping"
+
+    def _ping(self) -> str:
+        return "pong"
+
+    def _status(self) -> dict[str, Any]:
+        self.ledger.refresh()
+        return {
+            "pid": os.getpid(),
+            "db_path": str(self.db_path),
+            "state_path": str(state_path(self.db_path)),
+            "workers": self.workers,
+            "generation": self.ledger.generation[1],
+            "reloads": self.ledger.reloads,
+            "accounts": len(self.ledger.rollups["account"]),
+            "daily_rows": len(self.ledger.rollups["day"]),
+            "budgets": len(self.ledger.budgets),
+            "forecasts_memoized": len(self.ledger._forecasts),
+            "real_time_sync": self.writer is not None,
+            "ingest": self.writer.stats.summary() if self.writer is not None else None,
+        }
+
+    def _check_budget(self, budget_id: str, amount: str) -> dict:
+        return self.ledger.check_budget(budget_id, Decimal(amount))
+
+    def _balances(
+        self,
+        by: str = "account",
+        accounts: list[str] | None = None,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> list[dict]:
+        if by not in PERIODS:
+            raise ValueError(f"by must be one of {', '.join(PERIODS)}")
+        return self.ledger.balances(by, accounts, start, end).to_dict("records")
+
+    def _reconcile(
+        self, account: str, start: str, end: str, expected_balance: str = "0", currency: str = "USD"
+    ) -> dict:
+        return self.ledger.reconcile(
+            account, datetime.fromisoformat(start), datetime.fromisoformat(end), Decimal(expected_balance), currency
+        )
+
+    def _forecast(
+        self,
+        horizon: int = 3,
+        model: str = "rolling",
+        freq: str = "month",
+        accounts: list[str] | None = None,
+        use_cache: bool = True,
+    ) -> dict[str, Any]:
+        return forecast_cache.as_dict(self.ledger.forecast(horizon, model, freq, accounts, use_cache))
+
+    def _run(self, agent: str, args: list[str]) -> Any:
+        return self.ledger.run(agent, args)
+
+    def _append(self, entries: list[dict[str, Any]], wait: bool = True) -> dict[str, Any]:
+        if self.writer is None:
+            raise AgentUsageError("append needs features.real_time_sync enabled in configs/finance-pack.yml")
+        stored: list[int] = []
+        sequence = self.writer.append_many(entries, lambda position, _: stored.append(position))
+        result = {"accepted": len(entries), "sequence": sequence, "durable": wait}
+        if wait:
+            self.writer.wait(sequence)
+            result["stored"] = sorted(stored)
+        return result
@@ -0,0 +1,85 @@
+"""Client for the ``br_fin.py daemon`` RPC API.
+
+The daemon (``lib.daemon``) listens on localhost and records its address and
+access token in a state file next to the ledger store. Every call is an HTTP
+``POST /rpc/<method>`` with a JSON object of parameters and the token in the
+``X-Br-Fin-Token`` header. The reply is ``{"result": ...}``, or
+``{"error": ..., "kind": ...}`` with a 4xx/5xx status.
+
+The client speaks HTTP/1.0 over a plain socket rather than ``http.client``,
+which would import the ``email`` package and cost more than a forwarded call
+saves.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any
+
+TOKEN_HEADER = "X-Br-Fin-Token"
+CONNECT_TIMEOUT = 0.5
+
+
+class DaemonError(RuntimeError):
+    """The daemon rejected a call; ``kind`` is ``"usage"`` for bad arguments."""
+
+    def __init__(self, message: str, kind: str = "error"):
+        super().__init__(message)
+        self.kind = kind
+
+
+def state_path(db_path: Path) -> Path:
+    """Where the daemon serving ``db_path`` records its address and token."""
+    return db_path.with_name(db_path.name + ".daemon.json")
+
+
+def write_state(db_path: Path, host: str, port: int, token: str) -> Path:
+    path = state_path(db_path)
+    # Created owner-only so other local users cannot read the token.
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump({"pid": os.getpid(), "host": host, "port": port, "token": token}, handle)
+    return path
+
+
+class DaemonClient:
+    def __init__(self, host: str, port: int, token: str, timeout: float | None = 60.0):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+
+    def call(self, method: str, **params: Any) -> Any:
+        body = json.dumps(params).encode()
+        request = (
+            f"POST /rpc/{method} HTTP/1.0\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            f"{TOKEN_HEADER}: {self.token}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        ).encode() + body
+        with socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT) as sock:
+            sock.settimeout(self.timeout)
+            sock.sendall(request)
+            chunks = []
+            while chunk := sock.recv(1 << 16):
+                chunks.append(chunk)
+        head, _, payload = b"".join(chunks).partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        reply = json.loads(payload) if payload else {}
+        if status != 200:
+            raise DaemonError(reply.get("error", f"HTTP {status}"), reply.get("kind", "error"))
+        return reply["result"]
+
+
+def find_daemon(db_path: Path) -> DaemonClient | None:
+    """A client for the daemon serving ``db_path``, or None if none answers."""
+    try:
+        state = json.loads(state_path(db_path).read_text(encoding="utf-8"))
+        client = DaemonClient(state["host"], state["port"], state["token"])
+        client.call("ping")
+    except (OSError, ValueError, KeyError, DaemonError):
+        return None
+    return client
@@ -0,0 +1,29 @@
+"""Defaults shared by the CLI and the engines.
+
+This module imports nothing, so ``br_fin.py`` can build its command options
+without loading pandas or numpy; the engines re-export these names.
+"""
+
+# Rows per chunk when streaming a ledger CSV (``lib.csv_utils``).
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Model and frequency names accepted by ``lib.forecast_engine.forecast``.
+FORECAST_MODELS = ("rolling", "ses", "seasonal-naive", "linear")
+FORECAST_FREQUENCIES = ("month", "day")
+
+# Statement matching window and description threshold (``lib.matching``).
+DEFAULT_WINDOW_DAYS = 3
+DEFAULT_MIN_SIMILARITY = 0.2
+
+# Monte Carlo paths per runway simulation (``lib.runway``).
+DEFAULT_PATHS = 100_000
+
+# Group commit of live entries (``lib.ingest.LedgerWriter``): commit once this
+# many are waiting, or once the oldest has waited this many seconds.
+DEFAULT_BATCH_SIZE = 2_000
+DEFAULT_MAX_DELAY = 0.05
+
+# Forecast utilization percentages that raise a budget alert, and the seconds
+# a budget waits after one alert before the next (``lib.budget_monitor``).
+DEFAULT_ALERT_THRESHOLDS = (80.0, 100.0)
+DEFAULT_DEBOUNCE_SECONDS = 300.0
@@ -0,0 +1,176 @@
+"""Persistent forecast cache stored next to the ledger it was computed from.
+
+Entries live in the store's ``forecast_cache`` table, keyed on a hash of the
+model, parameters, horizon, frequency and account filter and tagged with the
+store generation they were computed at. Any import that changes the ledger
+bumps the generation and clears the table in the same transaction, so a hit
+is always consistent with the current data. The table is bounded by entry
+count and payload bytes, evicting least-recently-used entries first.
+
+Hits stay read-only where possible: hit and miss counts are kept in memory
+and added to ``store_state`` with the cache's next write or ``flush``, and an
+entry's ``last_used`` stamp is only refreshed once it is
+``TOUCH_INTERVAL_SECONDS`` old.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from lib import forecast_engine, ledger_store
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 << 20
+# Bump when forecast_engine output changes for the same inputs.
+CACHE_FORMAT = 1
+# LRU stamps are seconds; a hit rewrites one no more often than this.
+TOUCH_INTERVAL_SECONDS = 60
+
+
+def cache_key(**spec: Any) -> str:
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def encode(result: forecast_engine.Forecast) -> str:
+    return json.dumps(
+        {
+            "accounts": result.accounts.tolist(),
+            "labels": result.labels,
+            "values": result.values.tolist(),
+            "model": result.model,
+        }
+    )
+
+
+def as_dict(result: forecast_engine.Forecast) -> dict[str, Any]:
+    """JSON-ready ``result`` plus ``total``, the per-period sum over accounts."""
+    return {
+        "accounts": result.accounts.tolist(),
+        "labels": result.labels,
+        "values": result.values.tolist(),
+        "model": result.model,
+        "total": result.total().tolist(),
+    }
+
+
+def decode(payload: str) -> forecast_engine.Forecast:
+    data = json.loads(payload)
+    values = np.asarray(data["values"], dtype=np.float64).reshape(len(data["accounts"]), len(data["labels"]))
+    return forecast_engine.Forecast(
+        np.asarray(data["accounts"], dtype=object), data["labels"], values, data["model"]
+    )
+
+
+class ForecastCache:
+    """LRU cache of ``Forecast`` results inside a ledger store connection."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.conn = conn
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._hits = 0
+        self._misses = 0
+
+    def _write_counts(self) -> None:
+        if self._hits or self._misses:
+            self.conn.execute(
+                "UPDATE store_state SET cache_hits = cache_hits + ?, cache_misses = cache_misses + ? WHERE id = 1",
+                (self._hits, self._misses),
+            )
+            self._hits = self._misses = 0
+
+    def flush(self) -> None:
+        """Add the in-memory hit and miss counts to ``store_state``."""
+        if self._hits or self._misses:
+            with self.conn:
+                self._write_counts()
+
+    def get_or_compute(
+        self, compute: Callable[[], forecast_engine.Forecast], **spec: Any
+    ) -> forecast_engine.Forecast:
+        """Return the cached forecast for ``spec`` or compute, store and return it."""
+        store_id, generation = ledger_store.generation(self.conn)
+        key = cache_key(format=CACHE_FORMAT, store_id=store_id, **spec)
+        now = int(self.clock())
+        row = self.conn.execute(
+            "SELECT payload, last_used FROM forecast_cache WHERE key = ? AND generation = ?", (key, generation)
+        ).fetchone()
+        if row is not None:
+            self._hits += 1
+            if now - row[1] >= TOUCH_INTERVAL_SECONDS:
+                with self.conn:
+                    self.conn.execute("UPDATE forecast_cache SET last_used = ? WHERE key = ?", (now, key))
+                    self._write_counts()
+            return decode(row[0])
+        self._misses += 1
+        result = compute()
+        payload = encode(result)
+        with self.conn:
+            # Skip the write if an import landed while computing.
+            if ledger_store.generation(self.conn)[1] == generation:
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO forecast_cache (key, generation, payload, size, last_used)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (key, generation, payload, len(payload), now),
+                )
+                self._evict()
+            self._write_counts()
+        return result
+
+    def _evict(self) -> None:
+        evicted = self.conn.execute(
+            """
+            DELETE FROM forecast_cache WHERE key IN (
+                SELECT key FROM (
+                    SELECT key,
+                           ROW_NUMBER() OVER recent AS position,
+                           SUM(size) OVER recent AS running_size
+                    FROM forecast_cache
+                    -- Entries stamped in the same second keep insertion order.
+                    WINDOW recent AS (ORDER BY last_used DESC, rowid DESC)
+                )
+                WHERE position > ? OR (position > 1 AND running_size > ?)
+            )
+            """,
+            (self.max_entries, self.max_bytes),
+        ).rowcount
+        if evicted:
+            self.conn.execute(
+                "UPDATE store_state SET cache_evictions = cache_evictions + ? WHERE id = 1", (evicted,)
+            )
+
+    def clear(self) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM forecast_cache")
+
+    def stats(self) -> dict[str, Any]:
+        entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM forecast_cache").fetchone()
+        hits, misses, evictions, generation = self.conn.execute(
+            "SELECT cache_hits, cache_misses, cache_evictions, generation FROM store_state WHERE id = 1"
+        ).fetchone()
+        hits += self._hits
+        misses += self._misses
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "generation": generation,
+        }
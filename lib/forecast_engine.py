@@ -0,0 +1,146 @@
+"""Vectorized cash-flow forecasting over per-account net series.
+
+The ledger rollups are resampled into a dense ``(accounts, periods)`` float
+matrix, with zero for periods without activity, and each model computes every
+account's forecast at once with NumPy array operations. Python loops only run
+over time steps, never over accounts. All models are linear in the input, so
+the forecast of the total equals the sum of the per-account forecasts.
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from lib import ledger_store
+
+FREQUENCIES = {"month": "month", "day": "date"}
+SEASONS = {"month": 12, "day": 7}
+
+
+@dataclass
+class NetSeries:
+    """Net flow (debit - credit, major units) per account and period.
+
+    ``start`` is the ordinal of the first column: months since year 0 for
+    ``freq="month"``, days since 1970-01-01 for ``freq="day"``.
+    """
+
+    accounts: np.ndarray
+    values: np.ndarray
+    start: int
+    freq: str
+
+    @property
+    def periods(self) -> int:
+        return self.values.shape[1]
+
+    def labels(self, offset: int, count: int) -> list[str]:
+        ordinals = np.arange(self.start + offset, self.start + offset + count)
+        if self.freq == "month":
+            return [f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}" for ordinal in ordinals]
+        return [str(day) for day in ordinals.astype("datetime64[D]")]
+
+
+@dataclass
+class Forecast:
+    accounts: np.ndarray
+    labels: list[str]
+    values: np.ndarray
+    model: str
+
+    def total(self) -> np.ndarray:
+        return self.values.sum(axis=0)
+
+
+def period_ordinals(keys: np.ndarray, freq: str) -> np.ndarray:
+    """Map yyyymm (``month``) or yyyymmdd (``day``) keys to consecutive integers."""
+    if freq == "month":
+        return (keys // 100) * 12 + keys % 100 - 1
+    # Dates repeat across accounts; convert each distinct key once.
+    unique, inverse = np.unique(keys, return_inverse=True)
+    days = pd.to_datetime(
+        {"year": unique // 10000, "month": unique // 100 % 100, "day": unique % 100}
+    ).to_numpy("datetime64[D]")
+    return days.astype(np.int64)[inverse]
+
+
+def net_series(frame: pd.DataFrame, freq: str = "month") -> NetSeries:
+    """Pivot ``ledger_store.balances`` output into a dense account x period matrix."""
+    if frame.empty:
+        return NetSeries(np.array([], dtype=object), np.zeros((0, 0)), 0, freq)
+    ordinals = period_ordinals(frame[FREQUENCIES[freq]].to_numpy(np.int64), freq)
+    codes, accounts = pd.factorize(frame["account"], sort=True)
+    start = int(ordinals.min())
+    values = np.zeros((len(accounts), int(ordinals.max()) - start + 1))
+    # Rollup rows are unique per (account, period), so plain assignment is enough.
+    values[codes, ordinals - start] = frame["net_cents"].to_numpy(np.int64) / 100
+    return NetSeries(np.asarray(accounts, dtype=object), values, start, freq)
+
+
+def load_net_series(
+    conn: sqlite3.Connection, freq: str = "month", accounts: list[str] | None = None
+) -> NetSeries:
+    return net_series(ledger_store.balances(conn, by=freq, accounts=accounts), freq)
+
+
+def rolling_growth(values: np.ndarray, horizon: int, window: int = 2, growth: float = 0.01, **_) -> np.ndarray:
+    """Mean of the ``window``-period rolling means, grown linearly by ``growth`` per period."""
+    periods = values.shape[1]
+    cumulative = np.cumsum(values, axis=1)
+    lagged = np.zeros_like(cumulative)
+    lagged[:, window:] = cumulative[:, :-window]
+    counts = np.minimum(np.arange(1, periods + 1), window)
+    baseline = ((cumulative - lagged) / counts).mean(axis=1)
+    return baseline[:, None] * (1 + np.arange(horizon) * growth)
+
+
+def exponential_smoothing(values: np.ndarray, horizon: int, alpha: float = 0.5, **_) -> np.ndarray:
+    """Simple exponential smoothing; the final level is carried flat."""
+    level = values[:, 0].copy()
+    for column in values.T[1:]:
+        level += alpha * (column - level)
+    return np.repeat(level[:, None], horizon, axis=1)
+
+
+def seasonal_naive(values: np.ndarray, horizon: int, season: int = 12, **_) -> np.ndarray:
+    """Repeat the last full season (or the last value when history is shorter)."""
+    if values.shape[1] < season:
+        return np.repeat(values[:, -1:], horizon, axis=1)
+    last = values[:, -season:]
+    return np.tile(last, (1, -(-horizon // season)))[:, :horizon]
+
+
+def linear_trend(values: np.ndarray, horizon: int, **_) -> np.ndarray:
+    """Per-account least-squares line, solved in closed form for all accounts at once."""
+    periods = values.shape[1]
+    t = np.arange(periods, dtype=np.float64)
+    t_mean = t.mean()
+    y_mean = values.mean(axis=1)
+    denominator = ((t - t_mean) ** 2).sum()
+    slope = ((values - y_mean[:, None]) @ (t - t_mean)) / denominator if denominator else np.zeros(len(values))
+    future = np.arange(periods, periods + horizon, dtype=np.float64)
+    return y_mean[:, None] + slope[:, None] * (future - t_mean)
+
+
+MODELS: dict[str, Callable[..., np.ndarray]] = {
+    "rolling": rolling_growth,
+    "ses": exponential_smoothing,
+    "seasonal-naive": seasonal_naive,
+    "linear": linear_trend,
+}
+
+
+def forecast(series: NetSeries, model: str = "rolling", horizon: int = 3, **params) -> Forecast:
+    """Forecast ``horizon`` periods past the end of ``series`` for every account."""
+    if model not in MODELS:
+        raise ValueError(f"Unknown forecast model: {model}")
+    params.setdefault("season", SEASONS[series.freq])
+    if series.periods == 0:
+        values = np.zeros((len(series.accounts), horizon))
+    else:
+        values = MODELS[model](series.values, horizon, **params)
+    return Forecast(series.accounts, series.labels(series.periods, horizon), values, model)
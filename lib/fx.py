@@ -0,0 +1,143 @@
+"""Local FX rate table with as-of lookup and vectorized conversion.
+
+Rates are loaded from a CSV with ``date,currency,rate`` columns, where
+``rate`` is the value of one unit of ``currency`` in the table's ``base``
+currency on ``date``. Each currency's rates are kept as sorted yyyymmdd and
+rate arrays, so an as-of lookup is a ``searchsorted``: the latest rate on or
+before the requested day.
+
+Converting a column first collapses it to its distinct (currency, day) pairs
+and looks each pair up once. Millions of entries over a few currencies and a
+year of dates cost a few thousand lookups. Scalar lookups are memoized on the
+table.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from models.money import minor_exponent, to_minor_array
+
+DEFAULT_CURRENCY = "USD"
+
+
+class MissingRateError(LookupError):
+    """No rate on or before the requested day for a currency."""
+
+
+class FxRateTable:
+    def __init__(self, rates: pd.DataFrame, base: str = DEFAULT_CURRENCY):
+        self.base = base
+        self._series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._cache: dict[tuple[str, int], float] = {}
+        frame = pd.DataFrame(
+            {
+                "date": _date_keys(pd.to_datetime(rates["date"], format="%Y-%m-%d")),
+                "currency": rates["currency"].astype(str).str.strip().str.upper().to_numpy(),
+                "rate": pd.to_numeric(rates["rate"]).to_numpy(np.float64),
+            }
+        )
+        if (frame["rate"] <= 0).any() or frame["rate"].isna().any():
+            raise ValueError("FX rates must be positive numbers")
+        # Later rows win when a (currency, date) pair repeats.
+        frame = frame.drop_duplicates(["currency", "date"], keep="last").sort_values(["currency", "date"])
+        for currency, group in frame.groupby("currency", sort=False):
+            self._series[currency] = (group["date"].to_numpy(np.int64), group["rate"].to_numpy())
+
+    @classmethod
+    def from_csv(cls, path: Path, base: str = DEFAULT_CURRENCY) -> FxRateTable:
+        return cls(pd.read_csv(path, dtype={"currency": str, "date": str}), base)
+
+    @property
+    def currencies(self) -> list[str]:
+        return sorted({self.base, *self._series})
+
+    def _lookup(self, currency: str, dates: np.ndarray) -> np.ndarray:
+        """Base-currency value of one ``currency`` unit as of each yyyymmdd key."""
+        if currency == self.base:
+            return np.ones(len(dates))
+        if currency not in self._series:
+            raise MissingRateError(f"No FX rates for {currency}")
+        known, rates = self._series[currency]
+        positions = np.searchsorted(known, dates, side="right") - 1
+        if (positions < 0).any():
+            first = int(np.asarray(dates)[positions < 0].min())
+            raise MissingRateError(f"No {currency} rate on or before {first}")
+        return rates[positions]
+
+    def rate(self, currency: str, target: str, date: int) -> float:
+        """Units of ``target`` per unit of ``currency`` as of yyyymmdd ``date``."""
+        key_from, key_to = (currency, date), (target, date)
+        for key in (key_from, key_to):
+            if key not in self._cache:
+                self._cache[key] = float(self._lookup(key[0], np.array([date]))[0])
+        return self._cache[key_from] / self._cache[key_to]
+
+    def rates(self, currencies: np.ndarray, dates: np.ndarray, target: str) -> np.ndarray:
+        """Vectorized ``rate`` for parallel arrays of currencies and yyyymmdd dates."""
+        dates = np.asarray(dates, dtype=np.int64)
+        if not len(dates):
+            return np.ones(0)
+        # Pack (currency code, yyyymmdd) into one int64 so pairs hash as integers.
+        currency_codes, currency_names = pd.factorize(np.asarray(currencies, dtype=object))
+        codes, pairs = pd.factorize(currency_codes.astype(np.int64) * 100_000_000 + dates)
+        pair_currencies, pair_dates = np.divmod(pairs, 100_000_000)
+        result = np.empty(len(pairs))
+        for index, currency in enumerate(currency_names):
+            mask = pair_currencies == index
+            result[mask] = self._lookup(currency, pair_dates[mask])
+        result /= self._lookup(target, pair_dates)
+        return result[codes]
+
+    def convert(
+        self, amounts: np.ndarray | pd.Series, currencies: np.ndarray, dates: np.ndarray, target: str
+    ) -> np.ndarray:
+        """Convert major-unit amounts into integer minor units of ``target``.
+
+        Each amount is first rounded to its own currency's minor unit, then
+        converted and rounded half to even in ``target``.
+        """
+        return restate(amounts, currencies, self.rates(currencies, dates, target), target)
+
+
+def restate(amounts: np.ndarray | pd.Series, currencies: np.ndarray, rates: np.ndarray, target: str) -> np.ndarray:
+    """Apply per-row ``rates`` (from ``FxRateTable.rates``) to major-unit amounts.
+
+    Returns integer minor units of ``target``.
+    """
+    codes, names = pd.factorize(np.asarray(currencies, dtype=object))
+    minor = np.empty(len(codes), dtype=np.int64)
+    scale = np.empty(len(codes))
+    values = np.asarray(amounts)
+    for index, currency in enumerate(names):
+        mask = codes == index
+        minor[mask] = to_minor_array(values[mask], currency)
+        scale[mask] = 10.0 ** -minor_exponent(currency)
+    return np.rint(minor * scale * rates * 10 ** minor_exponent(target)).astype(np.int64)
+
+
+def _date_keys(dates: pd.Series) -> np.ndarray:
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).to_numpy(np.int64)
+
+
+def convert_ledger_frame(
+    frame: pd.DataFrame, fx: FxRateTable, target: str, default_currency: str = DEFAULT_CURRENCY
+) -> pd.DataFrame:
+    """Return ``frame`` with ``debit``/``credit`` restated in ``target`` as of each row's date.
+
+    Rows without a ``currency`` column are taken to be in ``default_currency``.
+    """
+    currencies = (
+        frame["currency"].to_numpy(dtype=object)
+        if "currency" in frame.columns
+        else np.full(len(frame), default_currency, dtype=object)
+    )
+    rates = fx.rates(currencies, _date_keys(pd.to_datetime(frame["date"])), target)
+    scale = 10 ** minor_exponent(target)
+    converted = frame.copy()
+    for column in ("debit", "credit"):
+        converted[column] = restate(frame[column], currencies, rates, target) / scale
+    converted["currency"] = target
+    return converted
@@ -0,0 +1,271 @@
+"""Append-only ingest of live ledger entries with group commit.
+
+``LedgerWriter.append`` validates an entry on the caller's thread, converts
+it to a store row and queues it. A single writer thread commits the queue
+through ``ledger_store.append_entries`` once ``batch_size`` entries are
+waiting, or once the oldest waiting entry is ``max_delay`` seconds old,
+whichever comes first. Each commit is one transaction: the rows, the
+balance rollups and the spent totals of the budgets on the entries'
+accounts change together or not at all.
+
+The writer's connection runs with ``synchronous = FULL``, so a commit is on
+disk when it returns, and the fsync is paid once per batch rather than once
+per entry. ``append`` returns a sequence number; ``wait(sequence)`` blocks
+until it is durable. ``flush()`` commits everything appended so far without
+waiting out the delay.
+
+Entries carrying an ``id`` are stored at most once, so a processor may
+safely redeliver after a timeout. Entries dated in a closed month (see
+``ledger_store.close_month``) are dropped and counted as rejected. Callers
+that act on new entries (e.g. budget alerts) pass ``on_stored`` to
+``append_many``; it is called after the commit for new entries only, so
+redeliveries are not acted on twice.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping
+
+from lib import ledger_store
+from lib.defaults import DEFAULT_BATCH_SIZE, DEFAULT_MAX_DELAY
+from lib.fx import DEFAULT_CURRENCY
+from models.compact_entry import CompactEntry
+from models.ledger_entry import LedgerEntry, TransactionEntry
+from models.money import to_minor
+
+
+def _day(value: date | datetime | str) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def _cents(value: Any) -> int:
+    cents = to_minor(value or 0, DEFAULT_CURRENCY)
+    if cents < 0:
+        raise ValueError("Amounts must be non-negative")
+    return cents
+
+
+def ledger_row(entry: TransactionEntry | CompactEntry | LedgerEntry | Mapping[str, Any]) -> tuple:
+    """``ledger_store.append_entries`` row for one entry.
+
+    Accepts a ``TransactionEntry`` (id, timestamp, amount, entry_type) or
+    its ``CompactEntry`` form, a CSV-row ``LedgerEntry`` (date, debit,
+    credit), or a dict of either shape as produced by ``to_dict`` or read
+    from JSON. Raises ``ValueError`` for an amount that is not a finite,
+    non-negative number within the store's int64 cents, so a bad entry is
+    rejected before it is queued.
+    """
+    if isinstance(entry, Mapping):
+        data = entry
+    elif isinstance(entry, (TransactionEntry, CompactEntry)):
+        data = {
+            "id": entry.id,
+            "timestamp": entry.timestamp,
+            "account": entry.account,
+            "description": entry.description,
+            "amount": entry.amount,
+            "currency": entry.currency,
+            "entry_type": entry.entry_type,
+        }
+    elif isinstance(entry, LedgerEntry):
+        data = {
+            "date": entry.date,
+            "account": entry.account,
+            "debit": entry.debit,
+            "credit": entry.credit,
+            "description": entry.description,
+        }
+    else:
+        raise TypeError(f"cannot ingest {type(entry).__name__}")
+    currency = data.get("currency") or DEFAULT_CURRENCY
+    if currency != DEFAULT_CURRENCY:
+        raise ValueError(f"currency must be {DEFAULT_CURRENCY} in the ledger store, got {currency}")
+    account = data.get("account")
+    if not account:
+        raise ValueError("account is required")
+    day = _day(data.get("timestamp") or data["date"])
+    if "amount" in data:
+        cents = _cents(data["amount"])
+        entry_type = data.get("entry_type", "debit")
+        if entry_type not in ("debit", "credit"):
+            raise ValueError(f"entry_type must be debit or credit, got {entry_type}")
+        debit, credit = (cents, 0) if entry_type == "debit" else (0, cents)
+    else:
+        debit, credit = _cents(data.get("debit")), _cents(data.get("credit"))
+    entry_id = data.get("id")
+    return (None if entry_id is None else str(entry_id), day, account, debit, credit, data.get("description"))
+
+
+@dataclass
+class IngestStats:
+    appended: int = 0
+    committed: int = 0
+    stored: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    batches: int = 0
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "appended": self.appended,
+            "stored": self.stored,
+            "duplicates": self.duplicates,
+            "rejected": self.rejected,
+            "batches": self.batches,
+        }
+
+
+class LedgerWriter:
+    """Group-committing writer for live entries; see the module docstring."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.stats = IngestStats()
+        # (row, on_stored, position in its append_many call) per queued entry.
+        self._pending: deque[tuple[tuple, Callable[[int, tuple], None] | None, int]] = deque()
+        # Monotonic time the oldest pending entry arrived.
+        self._oldest = 0.0
+        # Commit everything up to this sequence without waiting for a full batch.
+        self._flush_to = 0
+        self._closing = False
+        self._error: BaseException | None = None
+        self._cond = threading.Condition()
+        self._committed = threading.Condition(self._cond)
+        # Open here so a bad path or schema fails the constructor, not the thread.
+        self._conn = ledger_store.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA synchronous = FULL")
+        self._thread = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> LedgerWriter:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def append(
+        self,
+        entry: TransactionEntry | CompactEntry | LedgerEntry | Mapping[str, Any],
+        on_stored: Callable[[int, tuple], None] | None = None,
+    ) -> int:
+        """Queue one entry; returns its sequence number for ``wait``."""
+        return self.append_many((entry,), on_stored)
+
+    def append_many(
+        self,
+        entries: Iterable[TransactionEntry | CompactEntry | LedgerEntry | Mapping[str, Any]],
+        on_stored: Callable[[int, tuple], None] | None = None,
+    ) -> int:
+        """Queue entries in order; returns the sequence number of the last one.
+
+        Every entry is validated before any is queued, so a bad entry
+        rejects the whole call. ``on_stored(position, row)`` runs on the
+        writer thread after each commit for every entry of this call that
+        was new, not a duplicate id or in a closed month.
+        """
+        rows = [(ledger_row(entry), on_stored, position) for position, entry in enumerate(entries)]
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("LedgerWriter is closed")
+            self._raise_error()
+            if rows and not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.extend(rows)
+            self.stats.appended += len(rows)
+            # Wake the writer to start the delay clock, or for a full batch.
+            if len(self._pending) == len(rows) or len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+            return self.stats.appended
+
+    def wait(self, sequence: int, timeout: float | None = None) -> bool:
+        """Block until entry ``sequence`` is committed; False on timeout."""
+        with self._cond:
+            done = self._committed.wait_for(lambda: self.stats.committed >= sequence or self._error, timeout)
+            self._raise_error()
+            return bool(done)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Commit everything appended so far now and block until it is durable."""
+        with self._cond:
+            sequence = self._flush_to = self.stats.appended
+            self._cond.notify_all()
+        return self.wait(sequence, timeout)
+
+    def close(self) -> None:
+        """Commit what is pending, then stop the writer thread."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._conn.close()
+        with self._cond:
+            self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("ledger writer failed; entries after the last commit were not stored") from self._error
+
+    def _next_batch(self) -> list[tuple[tuple, Callable[[int, tuple], None] | None, int]] | None:
+        with self._cond:
+            while not self._pending and not self._closing:
+                self._cond.wait()
+            while (
+                len(self._pending) < self.batch_size
+                and not self._closing
+                and self.stats.committed + len(self._pending) > self._flush_to
+            ):
+                remaining = self._oldest + self.max_delay - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            if not self._pending:
+                return None
+            count = min(len(self._pending), self.batch_size)
+            batch = [self._pending.popleft() for _ in range(count)]
+            if self._pending:
+                self._oldest = time.monotonic()
+            return batch
+
+    def _run(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            try:
+                rejected = 0
+                try:
+                    stored = [batch[i] for i in ledger_store.append_entries(self._conn, [item[0] for item in batch])]
+                except ledger_store.PartitionClosedError as closed:
+                    kept = [item for item in batch if item[0][1] // 100 not in closed.months]
+                    rejected = len(batch) - len(kept)
+                    stored = [kept[i] for i in ledger_store.append_entries(self._conn, [item[0] for item in kept])]
+                for row, on_stored, position in stored:
+                    if on_stored is not None:
+                        on_stored(position, row)
+            except BaseException as error:
+                with self._cond:
+                    self._error = error
+                    self._pending.clear()
+                    self._closing = True
+                    self._committed.notify_all()
+                return
+            with self._cond:
+                self.stats.committed += len(batch)
+                self.stats.stored += len(stored)
+                self.stats.duplicates += len(batch) - rejected - len(stored)
+                self.stats.rejected += rejected
+                self.stats.batches += 1
+                self._committed.notify_all()
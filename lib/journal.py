@@ -0,0 +1,316 @@
+"""Journal-level integrity checks for double-entry ledgers.
+
+Lines are keyed by their ``journal_id`` when they carry one, and otherwise
+by (date, description), with descriptions compared exactly as written, and
+by currency. Lines with the same key form a transaction in file order until
+they balance; the next line with that key starts another. So two same-day
+payments with one description are two transactions, and a stray line after
+its transaction balanced is reported on its own. ``validate_ledgers``
+reports three kinds of finding:
+
+unbalanced
+    Transactions of two or more lines whose debits and credits differ.
+orphan
+    Lines that cannot be grouped (no journal id and a blank description),
+    and transactions of a single line, which has nothing to balance against.
+duplicate
+    Lines posted more than once: the same date, account, amounts, currency
+    and journal id or description. Lines are compared by a 64-bit hash of
+    those fields, so a collision, however unlikely, errs towards reporting.
+
+Files are read in chunks with ``csv_utils.iter_ledger_chunks``, in one pass,
+and every step is a hash ``groupby(sort=False)``. Only transactions still
+open at the end of a chunk are carried to the next, so that state stays as
+small as the number of unfinished transactions. Duplicate detection keeps
+one 64-bit hash and two positions per distinct line; per-chunk counts are
+merged into the running counts once they outgrow them, so the work stays
+linear. Only the findings are sorted.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from lib import csv_utils
+from lib.defaults import DEFAULT_CHUNK_SIZE
+from lib.fx import DEFAULT_CURRENCY
+from lib.ledger_store import date_keys
+from models.money import minor_exponent, to_minor_array
+
+# A line's position, packed as file index * _LINE_SPAN + line number.
+_LINE_SPAN = 1 << 40
+_GROUP_KEYS = ["journal", "day", "label", "currency"]
+_SEGMENT_TOTALS = {"date": "min", "debit": "sum", "credit": "sum", "lines": "sum", "location": "min", "first": "min"}
+_LINE_FIELDS = ["date", "account", "debit", "credit", "journal", "label", "currency"]
+_LINE_TOTALS = {"postings": "sum", "location": "min", "repeat": "max"}
+
+
+@dataclass
+class JournalReport:
+    files: list[str]
+    lines: int
+    transactions: int
+    unbalanced: pd.DataFrame
+    orphans: pd.DataFrame
+    duplicates: pd.DataFrame
+
+    @property
+    def ok(self) -> bool:
+        return self.unbalanced.empty and self.orphans.empty and self.duplicates.empty
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "lines": self.lines,
+            "transactions": self.transactions,
+            "unbalanced": len(self.unbalanced),
+            "orphans": len(self.orphans),
+            "duplicates": len(self.duplicates),
+        }
+
+
+class _RunningTotals:
+    """Hash-grouped totals over a stream of partial aggregates.
+
+    Partials wait in ``pending`` until they hold as many rows as the running
+    totals, then everything is re-grouped at once; the totals at least
+    double between merges unless keys repeat, so the work stays linear.
+    """
+
+    def __init__(self, keys: list[str], totals: dict[str, str]):
+        self.keys = keys
+        self.totals = totals
+        self.frame: pd.DataFrame | None = None
+        self.pending: list[pd.DataFrame] = []
+        self.pending_rows = 0
+
+    def _reduce(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.groupby(self.keys, sort=False, as_index=False).agg(self.totals)
+
+    def add(self, rows: pd.DataFrame) -> None:
+        if rows.empty:
+            return
+        partial = self._reduce(rows)
+        self.pending.append(partial)
+        self.pending_rows += len(partial)
+        if self.frame is None or self.pending_rows >= len(self.frame):
+            self._merge()
+
+    def _merge(self) -> None:
+        frames = ([] if self.frame is None else [self.frame]) + self.pending
+        self.frame = self._reduce(pd.concat(frames, ignore_index=True)) if len(frames) > 1 else frames[0]
+        self.pending, self.pending_rows = [], 0
+
+    def result(self) -> pd.DataFrame | None:
+        if self.pending:
+            self._merge()
+        return self.frame
+
+
+class _OpenTransactions:
+    """Transactions whose lines do not balance yet, carried from chunk to chunk.
+
+    Lines with the same key accumulate in file order. A transaction closes
+    on the line that brings its running debit - credit back to zero and is
+    dropped; a later line with that key starts a new transaction. Each open
+    transaction is carried as one row of totals, placed ahead of the next
+    chunk's lines, so the outcome does not depend on where chunks split.
+    """
+
+    def __init__(self):
+        self.open: pd.DataFrame | None = None
+        self.closed = 0
+
+    def add(self, lines: pd.DataFrame) -> None:
+        if lines.empty:
+            return
+        items = lines[_GROUP_KEYS + ["date", "debit", "credit", "location"]].assign(lines=1)
+        if self.open is not None and not self.open.empty:
+            items = pd.concat([self.open, items], ignore_index=True)
+        else:
+            items = items.reset_index(drop=True)
+        group = items.groupby(_GROUP_KEYS, sort=False).ngroup().to_numpy()
+        balance = pd.Series(items["debit"].to_numpy() - items["credit"].to_numpy()).groupby(group).cumsum()
+        previous = balance.groupby(group).shift(fill_value=0).to_numpy()
+        balance = balance.to_numpy()
+        closes = (balance == 0) & (previous != 0)
+        segment = pd.Series(closes).groupby(group).cumsum().to_numpy() - closes
+        # One numeric key per (group, segment); keys are looked up only for
+        # the segments that stay open.
+        key = group.astype(np.int64) * (int(segment.max()) + 1) + segment
+        totals = (
+            items[["date", "debit", "credit", "lines", "location"]]
+            .assign(key=key, first=np.arange(len(items)), closes=closes)
+            .groupby("key", sort=False)
+            .agg({**_SEGMENT_TOTALS, "closes": "any"})
+        )
+        still_open = totals[~totals["closes"].to_numpy()]
+        self.closed += len(totals) - len(still_open)
+        keys = items[_GROUP_KEYS].iloc[still_open["first"].to_numpy()].reset_index(drop=True)
+        self.open = pd.concat(
+            [keys, still_open.drop(columns=["first", "closes"]).reset_index(drop=True)], axis=1
+        )
+
+
+def _minor(chunk: pd.DataFrame, column: str, currency: np.ndarray) -> np.ndarray:
+    minor = np.empty(len(chunk), dtype=np.int64)
+    for code in pd.unique(currency):
+        mask = currency == code
+        minor[mask] = to_minor_array(chunk[column].to_numpy()[mask], code)
+    return minor
+
+
+def _major(minor: pd.Series, currency: pd.Series) -> pd.Series:
+    scale = currency.map(lambda code: 10 ** minor_exponent(code)).astype(np.int64)
+    return minor / scale
+
+
+def _lines(chunk: pd.DataFrame, file_index: int, first_line: int, period: int | None) -> pd.DataFrame:
+    """One row per ledger line, with its transaction key and packed location."""
+    currency = (
+        chunk[csv_utils.CURRENCY_COLUMN].to_numpy(dtype=object)
+        if csv_utils.CURRENCY_COLUMN in chunk.columns
+        else np.full(len(chunk), DEFAULT_CURRENCY, dtype=object)
+    )
+    description = chunk["description"].fillna("").to_numpy(dtype=object)
+    date = date_keys(chunk["date"])
+    if csv_utils.JOURNAL_COLUMN in chunk.columns:
+        journal_ids = chunk[csv_utils.JOURNAL_COLUMN].to_numpy(dtype=object)
+        journal = journal_ids != ""
+        label = np.where(journal, journal_ids, description)
+        # A journal id names the whole transaction, whatever its lines' dates.
+        day = np.where(journal, 0, date)
+    else:
+        journal, label, day = np.zeros(len(chunk), dtype=bool), description, date
+    lines = pd.DataFrame(
+        {
+            "date": date,
+            "day": day,
+            "account": chunk["account"].to_numpy(),
+            "debit": _minor(chunk, "debit", currency),
+            "credit": _minor(chunk, "credit", currency),
+            "journal": journal,
+            "label": label,
+            "currency": currency,
+            "location": file_index * _LINE_SPAN + first_line + np.arange(len(chunk), dtype=np.int64),
+        }
+    )
+    if period is not None:
+        lines = lines[lines["date"] // 100 == period]
+    return lines
+
+
+def _locate(frame: pd.DataFrame, files: list[str], column: str = "location") -> tuple[np.ndarray, np.ndarray]:
+    location = frame[column].to_numpy(np.int64)
+    return np.asarray(files, dtype=object)[location // _LINE_SPAN], location % _LINE_SPAN
+
+
+def validate_ledgers(
+    paths: Iterable[Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    period: int | None = None,
+) -> JournalReport:
+    """Check every transaction in ``paths``; see the module docstring.
+
+    ``period`` (yyyymm) restricts the check to lines dated in that month.
+    Raises ``csv_utils.LedgerFormatError`` for rows that fail validation.
+    """
+    files: list[str] = []
+    transactions = _OpenTransactions()
+    postings = _RunningTotals(["hash"], _LINE_TOTALS)
+    ungrouped: list[pd.DataFrame] = []
+    line_count = 0
+    for file_index, path in enumerate(paths):
+        files.append(path.name)
+        first_line = 2
+        for chunk in csv_utils.iter_ledger_chunks(path, chunk_size):
+            lines = _lines(chunk, file_index, first_line, period)
+            first_line += len(chunk)
+            line_count += len(lines)
+            blank = (lines["label"] == "").to_numpy()
+            if blank.any():
+                ungrouped.append(lines[blank])
+                lines = lines[~blank]
+            transactions.add(lines)
+            postings.add(
+                pd.DataFrame(
+                    {
+                        "hash": pd.util.hash_pandas_object(lines[_LINE_FIELDS], index=False).to_numpy(),
+                        "postings": 1,
+                        "location": lines["location"].to_numpy(),
+                        "repeat": lines["location"].to_numpy(),
+                    }
+                )
+            )
+
+    still_open = transactions.open
+    if still_open is None:
+        still_open = pd.DataFrame(columns=_GROUP_KEYS + ["date", "debit", "credit", "lines", "location"])
+    # Only the findings are sorted, into file and line order. Open
+    # transactions of two or more lines that net to zero (all lines with
+    # equal debit and credit) are fine.
+    still_open = still_open.sort_values("location", kind="stable")
+    single = still_open[still_open["lines"] == 1]
+    unbalanced = still_open[(still_open["lines"] > 1) & (still_open["debit"] != still_open["credit"])]
+
+    file, line = _locate(unbalanced, files)
+    unbalanced = pd.DataFrame(
+        {
+            "file": file,
+            "line": line,
+            "date": unbalanced["date"].to_numpy(np.int64),
+            "transaction": unbalanced["label"].to_numpy(),
+            "by_journal_id": unbalanced["journal"].to_numpy(bool),
+            "currency": unbalanced["currency"].to_numpy(),
+            "lines": unbalanced["lines"].to_numpy(np.int64),
+            "debit": _major(unbalanced["debit"], unbalanced["currency"]).to_numpy(),
+            "credit": _major(unbalanced["credit"], unbalanced["currency"]).to_numpy(),
+        }
+    )
+    unbalanced["difference"] = unbalanced["debit"] - unbalanced["credit"]
+
+    orphan_lines = pd.concat(
+        [frame.assign(reason="no journal id or description") for frame in ungrouped]
+        + [single.assign(reason="single-line transaction")],
+        ignore_index=True,
+    ).sort_values("location", kind="stable")
+    file, line = _locate(orphan_lines, files)
+    orphans = pd.DataFrame(
+        {
+            "file": file,
+            "line": line,
+            "date": orphan_lines["date"].to_numpy(np.int64),
+            "transaction": orphan_lines["label"].to_numpy(),
+            "currency": orphan_lines["currency"].to_numpy(),
+            "debit": _major(orphan_lines["debit"], orphan_lines["currency"]).to_numpy(),
+            "credit": _major(orphan_lines["credit"], orphan_lines["currency"]).to_numpy(),
+            "reason": orphan_lines["reason"].to_numpy(),
+        }
+    )
+
+    repeated = postings.result()
+    if repeated is None:
+        repeated = pd.DataFrame(columns=["hash"] + list(_LINE_TOTALS))
+    repeated = repeated[repeated["postings"] > 1].sort_values("location", kind="stable")
+    file, line = _locate(repeated, files)
+    repeat_file, repeat_line = _locate(repeated, files, "repeat")
+    duplicates = pd.DataFrame(
+        {
+            "file": file,
+            "line": line,
+            "postings": repeated["postings"].to_numpy(np.int64),
+            "last_file": repeat_file,
+            "last_line": repeat_line,
+        }
+    )
+    return JournalReport(
+        files=files,
+        lines=line_count,
+        transactions=transactions.closed + len(still_open),
+        unbalanced=unbalanced,
+        orphans=orphans,
+        duplicates=duplicates,
+    )
@@ -0,0 +1,1185 @@
+"""SQLite ledger store behind ``br_fin.py import`` and ``forecast``.
+
+Every imported CSV is recorded in the ``ledger_files`` manifest with its size,
+mtime and SHA-256 so re-running an import only touches files that changed:
+unchanged files are skipped, files that only grew have just the new rows
+ingested, and anything else is replaced wholesale. Files that were deleted
+or renamed since the last import of their directory are pruned along with
+their rows.
+
+Rows are stored typed for range scans: ``date`` as a yyyymmdd integer, money
+as integer cents, indexed by ``(account, date)``. ``connect`` applies the
+bulk-load pragmas (WAL, relaxed sync) and migrates older stores in place.
+
+Raw rows are partitioned by month: each month's rows live in their own
+``ledger_<yyyymm>`` table, listed in the ``ledger_partitions`` catalog, and
+period-bounded reads (``StoreTransactionService``, ``read_rows``) only open
+the months they overlap. ``ledger`` is a view over every partition for ad-hoc
+SQL. ``close_month`` makes a month read-only, after which ``compact_month``
+can rewrite it in ``(account, date)`` order; imports and live entries that
+would change a closed month fail with ``PartitionClosedError``.
+
+Per-account balances are materialized per day, per month and all-time in the
+``balance_*`` tables, updated in the same transaction as each file's rows, so
+trial balances and period series never rescan raw entries.
+
+``store_state.generation`` is bumped in the same transaction as any change
+to the rollups, so derived results (see ``lib.forecast_cache``) can be keyed
+on it and go stale exactly when the ledger does.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import re
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lib import csv_utils
+from models.money import Money, to_minor_array
+
+HASH_BLOCK_SIZE = 1 << 20
+SCHEMA_VERSION = 8
+REINDEX_MIN_ROWS = 10_000
+
+LEDGER_COLUMNS = ["file_id", "date", "account", "debit_cents", "credit_cents", "description", "entry_id"]
+PARTITION_TABLE = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        file_id INTEGER REFERENCES ledger_files (id),
+        date INTEGER NOT NULL,
+        account TEXT NOT NULL,
+        debit_cents INTEGER NOT NULL DEFAULT 0,
+        credit_cents INTEGER NOT NULL DEFAULT 0,
+        description TEXT,
+        entry_id TEXT
+    )
+"""
+
+
+def partition_table(month: int) -> str:
+    """Name of the partition holding the rows of ``month`` (yyyymm)."""
+    return f"ledger_{month:06d}"
+
+
+def partition_indexes(table: str) -> dict[str, str]:
+    return {
+        # Covering index: per-account period aggregates never touch the table.
+        f"{table}_account_date": (
+            f"CREATE INDEX IF NOT EXISTS {table}_account_date "
+            f"ON {table} (account, date, debit_cents, credit_cents)"
+        ),
+        f"{table}_file": f"CREATE INDEX IF NOT EXISTS {table}_file ON {table} (file_id)",
+    }
+
+# Version 0 is the original untracked ``ledger`` table, version 1 added the
+# TEXT ``source`` column and the manifest. Version 2 stores dates as yyyymmdd
+# integers and money as integer cents, keyed to the manifest by file id,
+# version 3 makes the (account, date) index cover the amount columns,
+# version 4 adds the materialized balance rollups, version 5 the
+# generation counter and the forecast cache, version 6 the budgets behind
+# ``StoreBudgetService``, version 7 live entries (``ledger.entry_id``)
+# charged to budgets by account (``budgets.account``) and version 8 splits
+# ``ledger`` into monthly partitions.
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS ledger_files (
+        id INTEGER PRIMARY KEY,
+        path TEXT NOT NULL UNIQUE,
+        size INTEGER NOT NULL,
+        mtime REAL NOT NULL,
+        sha256 TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        imported_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ledger_partitions (
+        month INTEGER PRIMARY KEY,
+        rows INTEGER NOT NULL DEFAULT 0,
+        closed_at TEXT,
+        compacted_at TEXT
+    )
+    """,
+    # Which partitions hold each file's rows, so replacing a file opens only those.
+    """
+    CREATE TABLE IF NOT EXISTS ledger_file_months (
+        file_id INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        PRIMARY KEY (file_id, month)
+    ) WITHOUT ROWID
+    """,
+    # Live entries (see ``append_entries``) are deduplicated on their id.
+    """
+    CREATE TABLE IF NOT EXISTS ledger_entry_ids (
+        entry_id TEXT NOT NULL PRIMARY KEY,
+        month INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS balance_daily (
+        account TEXT NOT NULL,
+        date INTEGER NOT NULL,
+        debit_cents INTEGER NOT NULL,
+        credit_cents INTEGER NOT NULL,
+        entries INTEGER NOT NULL,
+        PRIMARY KEY (account, date)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS balance_monthly (
+        account TEXT NOT NULL,
+        month INTEGER NOT NULL,
+        debit_cents INTEGER NOT NULL,
+        credit_cents INTEGER NOT NULL,
+        entries INTEGER NOT NULL,
+        PRIMARY KEY (account, month)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS balance_account (
+        account TEXT NOT NULL PRIMARY KEY,
+        debit_cents INTEGER NOT NULL,
+        credit_cents INTEGER NOT NULL,
+        entries INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS store_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        store_id TEXT NOT NULL,
+        generation INTEGER NOT NULL,
+        cache_hits INTEGER NOT NULL DEFAULT 0,
+        cache_misses INTEGER NOT NULL DEFAULT 0,
+        cache_evictions INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS forecast_cache (
+        key TEXT NOT NULL PRIMARY KEY,
+        generation INTEGER NOT NULL,
+        payload TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        last_used INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS budgets (
+        id TEXT NOT NULL PRIMARY KEY,
+        name TEXT NOT NULL,
+        period TEXT NOT NULL,
+        currency TEXT NOT NULL,
+        allocated_minor INTEGER NOT NULL,
+        spent_minor INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL,
+        account TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS budgets_account ON budgets (account)",
+    """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER NOT NULL,
+        applied_at TEXT NOT NULL
+    )
+    """,
+]
+
+# Rollup table -> period column (None for the all-time per-account totals).
+ROLLUPS = {"balance_daily": "date", "balance_monthly": "month", "balance_account": None}
+PERIOD_TABLES = {"day": "balance_daily", "month": "balance_monthly", "account": "balance_account"}
+
+INSERT_SQL = (
+    "INSERT INTO {table} (file_id, date, account, debit_cents, credit_cents, description) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+LIVE_INSERT_SQL = (
+    "INSERT INTO {table} (file_id, date, account, debit_cents, credit_cents, description, entry_id) "
+    "VALUES (NULL, ?, ?, ?, ?, ?, ?)"
+)
+# Bound parameters per ``entry_id IN (...)`` lookup.
+ID_LOOKUP_CHUNK = 500
+
+
+class PartitionClosedError(ValueError):
+    """A write would change a month that ``close_month`` made read-only."""
+
+    def __init__(self, months: list[int]):
+        self.months = months
+        names = ", ".join(f"{month // 100:04d}-{month % 100:02d}" for month in months)
+        super().__init__(f"ledger month {names} is closed; reopen it to change its entries")
+
+
+def connect(path: Path | str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """Open the store with bulk-load pragmas and migrate it to the current schema."""
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    init_db(conn)
+    return conn
+
+
+def _tables(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def schema_version(conn: sqlite3.Connection) -> int | None:
+    """Return the store's schema version, or ``None`` for an empty database."""
+    tables = _tables(conn)
+    if "schema_version" in tables:
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+    if "ledger" not in tables:
+        return None
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(ledger)")}
+    return 1 if "source" in columns else 0
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE ledger RENAME TO ledger_v1")
+    conn.execute("ALTER TABLE ledger_files RENAME TO ledger_files_v1")
+    for statement in SCHEMA:
+        conn.execute(statement)
+    # The unpartitioned table of versions 2-7; ``_partition_ledger`` splits it.
+    conn.execute(PARTITION_TABLE.format(table="ledger"))
+    conn.execute(
+        """
+        INSERT INTO ledger_files (path, size, mtime, sha256, rows, imported_at)
+        SELECT path, size, mtime, sha256, rows, imported_at FROM ledger_files_v1
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO ledger (file_id, date, account, debit_cents, credit_cents, description)
+        SELECT f.id,
+               CAST(REPLACE(SUBSTR(l.date, 1, 10), '-', '') AS INTEGER),
+               l.account,
+               CAST(ROUND(COALESCE(l.debit, 0) * 100) AS INTEGER),
+               CAST(ROUND(COALESCE(l.credit, 0) * 100) AS INTEGER),
+               l.description
+        FROM ledger_v1 AS l JOIN ledger_files AS f ON f.path = l.source
+        ORDER BY l.rowid
+        """
+    )
+    conn.execute("DROP TABLE ledger_v1")
+    conn.execute("DROP TABLE ledger_files_v1")
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str) -> None:
+    """``ALTER TABLE ... ADD COLUMN`` unless ``table`` is missing or already has it."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if existing and column.split()[0] not in existing:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
+
+def _partition_ledger(conn: sqlite3.Connection) -> None:
+    """Move the rows of the single pre-version-8 ``ledger`` table into monthly partitions."""
+    conn.execute("CREATE INDEX ledger_migrate_date ON ledger (date)")
+    months = [month for (month,) in conn.execute("SELECT DISTINCT date / 100 FROM ledger ORDER BY 1")]
+    for month in months:
+        table = _create_partition(conn, month)
+        conn.execute(
+            f"""
+            INSERT INTO {table} ({', '.join(LEDGER_COLUMNS)})
+            SELECT {', '.join(LEDGER_COLUMNS)} FROM ledger
+            WHERE date BETWEEN ? AND ? ORDER BY rowid
+            """,
+            (month * 100, month * 100 + 99),
+        )
+    conn.execute(
+        """
+        UPDATE ledger_partitions SET rows = (
+            SELECT COUNT(*) FROM ledger WHERE date / 100 = ledger_partitions.month
+        )
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO ledger_file_months (file_id, month)
+        SELECT DISTINCT file_id, date / 100 FROM ledger WHERE file_id IS NOT NULL
+        """
+    )
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO ledger_entry_ids (entry_id, month)
+        SELECT entry_id, date / 100 FROM ledger WHERE entry_id IS NOT NULL
+        """
+    )
+    conn.execute("DROP TABLE ledger")
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    version = schema_version(conn)
+    if version == SCHEMA_VERSION:
+        return
+    if version is not None and version > SCHEMA_VERSION:
+        raise RuntimeError(f"ledger store schema {version} is newer than supported {SCHEMA_VERSION}")
+    conn.execute("BEGIN")
+    try:
+        if version == 0:
+            # Rows written before the manifest existed cannot be attributed to
+            # a file; drop them so the next import rebuilds the table.
+            conn.execute("DROP TABLE ledger")
+        if version == 1:
+            _migrate_v1(conn)
+        if version == 2:
+            conn.execute("DROP INDEX IF EXISTS ledger_account_date")
+        if version is not None and version < 7:
+            _add_column(conn, "ledger", "entry_id TEXT")
+            _add_column(conn, "budgets", "account TEXT")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        if "ledger" in _tables(conn):
+            _partition_ledger(conn)
+        _create_ledger_view(conn)
+        if version is not None and version < 4:
+            _backfill_rollups(conn)
+        conn.execute(
+            "INSERT OR IGNORE INTO store_state (id, store_id, generation) VALUES (1, ?, 0)",
+            (uuid.uuid4().hex,),
+        )
+        conn.execute(
+            "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+            (SCHEMA_VERSION, datetime.now().isoformat()),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _backfill_rollups(conn: sqlite3.Connection) -> None:
+    for table in ROLLUPS:
+        conn.execute(f"DELETE FROM {table}")
+    conn.execute(
+        """
+        INSERT INTO balance_daily (account, date, debit_cents, credit_cents, entries)
+        SELECT account, date, SUM(debit_cents), SUM(credit_cents), COUNT(*)
+        FROM ledger GROUP BY account, date
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO balance_monthly (account, month, debit_cents, credit_cents, entries)
+        SELECT account, date / 100, SUM(debit_cents), SUM(credit_cents), SUM(entries)
+        FROM balance_daily GROUP BY account, date / 100
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO balance_account (account, debit_cents, credit_cents, entries)
+        SELECT account, SUM(debit_cents), SUM(credit_cents), SUM(entries)
+        FROM balance_daily GROUP BY account
+        """
+    )
+
+
+def generation(conn: sqlite3.Connection) -> tuple[str, int]:
+    """``(store_id, generation)``: changes whenever the ledger contents do.
+
+    ``store_id`` is random per store, so a recreated database never reuses
+    the generations of the one it replaced.
+    """
+    return conn.execute("SELECT store_id, generation FROM store_state WHERE id = 1").fetchone()
+
+
+def _bump_generation(conn: sqlite3.Connection) -> None:
+    conn.execute("UPDATE store_state SET generation = generation + 1 WHERE id = 1")
+    conn.execute("DELETE FROM forecast_cache")
+
+
+def _apply_rollup_delta(conn: sqlite3.Connection, daily: pd.DataFrame, sign: int) -> None:
+    """Add (``sign=1``) or remove (``sign=-1``) per-(account, date) totals from every rollup.
+
+    ``daily`` has ``account``, ``date``, ``debit_cents``, ``credit_cents`` and
+    ``entries`` columns, one row per account and day.
+    """
+    if daily.empty:
+        return
+    _bump_generation(conn)
+    amounts = ["debit_cents", "credit_cents", "entries"]
+    daily = daily.assign(month=daily["date"] // 100)
+    for table, period in ROLLUPS.items():
+        keys = ["account"] + ([period] if period else [])
+        delta = daily.groupby(keys, sort=False)[amounts].sum().reset_index()
+        delta[amounts] *= sign
+        columns = keys + amounts
+        conn.executemany(
+            f"""
+            INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})
+            ON CONFLICT ({', '.join(keys)}) DO UPDATE SET
+                debit_cents = debit_cents + excluded.debit_cents,
+                credit_cents = credit_cents + excluded.credit_cents,
+                entries = entries + excluded.entries
+            """,
+            delta[columns].itertuples(index=False, name=None),
+        )
+        if sign < 0:
+            conn.execute(f"DELETE FROM {table} WHERE entries <= 0")
+
+
+@dataclass
+class Partition:
+    month: int
+    table: str
+    rows: int
+    closed_at: str | None = None
+    compacted_at: str | None = None
+    size_bytes: int | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self.closed_at is not None
+
+
+def _create_partition(conn: sqlite3.Connection, month: int) -> str:
+    table = partition_table(month)
+    conn.execute(PARTITION_TABLE.format(table=table))
+    for statement in partition_indexes(table).values():
+        conn.execute(statement)
+    conn.execute("INSERT OR IGNORE INTO ledger_partitions (month) VALUES (?)", (month,))
+    return table
+
+
+def _create_ledger_view(conn: sqlite3.Connection) -> None:
+    """(Re)create ``ledger`` as the union of every partition."""
+    months = [month for (month,) in conn.execute("SELECT month FROM ledger_partitions ORDER BY month")]
+    columns = ", ".join(LEDGER_COLUMNS)
+    if months:
+        body = "\n UNION ALL ".join(f"SELECT {columns} FROM {partition_table(month)}" for month in months)
+    else:
+        body = (
+            "SELECT CAST(NULL AS INTEGER) AS file_id, 0 AS date, '' AS account, 0 AS debit_cents, "
+            "0 AS credit_cents, NULL AS description, NULL AS entry_id WHERE 0"
+        )
+    conn.execute("DROP VIEW IF EXISTS ledger")
+    conn.execute(f"CREATE VIEW ledger AS {body}")
+
+
+def _writable_partitions(conn: sqlite3.Connection, months: list[int]) -> dict[int, str]:
+    """Partition table per month, created as needed; raises if any month is closed."""
+    placeholders = ", ".join("?" for _ in months)
+    existing = dict(
+        conn.execute(f"SELECT month, closed_at FROM ledger_partitions WHERE month IN ({placeholders})", months)
+    )
+    closed = sorted(month for month, closed_at in existing.items() if closed_at is not None)
+    if closed:
+        raise PartitionClosedError(closed)
+    created = False
+    for month in months:
+        if month not in existing:
+            _create_partition(conn, month)
+            created = True
+    if created:
+        _create_ledger_view(conn)
+    return {month: partition_table(month) for month in months}
+
+
+def partition_months(conn: sqlite3.Connection, start: int | None = None, end: int | None = None) -> list[int]:
+    """Months (yyyymm) with a partition overlapping the inclusive yyyymmdd bounds."""
+    rows = conn.execute(
+        "SELECT month FROM ledger_partitions WHERE month >= ? AND month <= ? ORDER BY month",
+        (0 if start is None else start // 100, 999999 if end is None else end // 100),
+    )
+    return [month for (month,) in rows]
+
+
+def partitions(conn: sqlite3.Connection, sizes: bool = False) -> list[Partition]:
+    """The partition catalog, oldest month first; ``sizes`` adds bytes on disk (needs dbstat)."""
+    catalog = [
+        Partition(month, partition_table(month), rows, closed_at, compacted_at)
+        for month, rows, closed_at, compacted_at in conn.execute(
+            "SELECT month, rows, closed_at, compacted_at FROM ledger_partitions ORDER BY month"
+        )
+    ]
+    if sizes:
+        for partition in catalog:
+            partition.size_bytes = _partition_bytes(conn, partition.table)
+    return catalog
+
+
+def _partition_bytes(conn: sqlite3.Connection, table: str) -> int | None:
+    names = [table, *partition_indexes(table)]
+    try:
+        return conn.execute(
+            f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({', '.join('?' for _ in names)})", names
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None  # SQLite built without the dbstat virtual table
+
+
+def read_rows(
+    conn: sqlite3.Connection,
+    account: str | None = None,
+    start: int | None = None,
+    end: int | None = None,
+    columns: tuple[str, ...] = ("date", "account", "debit_cents", "credit_cents", "description"),
+) -> list[tuple]:
+    """Raw rows between the inclusive yyyymmdd bounds, ordered by date.
+
+    Only the partitions of the months overlapping the bounds are read.
+    """
+    clauses, params = [], []
+    if account is not None:
+        clauses.append("account = ?")
+        params.append(account)
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("date <= ?")
+        params.append(end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows: list[tuple] = []
+    for month in partition_months(conn, start, end):
+        rows.extend(
+            conn.execute(
+                f"SELECT {', '.join(columns)} FROM {partition_table(month)} {where} ORDER BY date", params
+            )
+        )
+    return rows
+
+
+def _lock_partition(conn: sqlite3.Connection, month: int) -> None:
+    """Triggers rejecting any change to ``month``'s rows, whoever issues it."""
+    table = partition_table(month)
+    for action in ("INSERT", "UPDATE", "DELETE"):
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_closed_{action.lower()}
+            BEFORE {action} ON {table}
+            BEGIN SELECT RAISE(ABORT, 'ledger month {month} is closed'); END
+            """
+        )
+
+
+def close_month(conn: sqlite3.Connection, month: int) -> None:
+    """Make ``month`` (yyyymm) read-only: imports and live entries into it now fail."""
+    with conn:
+        _writable_partitions(conn, [month])
+        _lock_partition(conn, month)
+        conn.execute(
+            "UPDATE ledger_partitions SET closed_at = ? WHERE month = ?", (datetime.now().isoformat(), month)
+        )
+
+
+def reopen_month(conn: sqlite3.Connection, month: int) -> None:
+    with conn:
+        table = partition_table(month)
+        for action in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {table}_closed_{action}")
+        conn.execute("UPDATE ledger_partitions SET closed_at = NULL WHERE month = ?", (month,))
+
+
+def compact_month(conn: sqlite3.Connection, month: int) -> Partition:
+    """Rewrite a closed month's partition in ``(account, date)`` order.
+
+    The rebuilt table has full pages and keeps each account's rows together,
+    so per-account scans of the month read contiguous pages. Pages freed by
+    the old table are reused by later writes; ``VACUUM`` returns them to the
+    file system.
+    """
+    catalog = {partition.month: partition for partition in partitions(conn)}
+    if month not in catalog:
+        raise KeyError(f"No ledger partition for {month}")
+    if not catalog[month].closed:
+        raise ValueError(f"close ledger month {month} before compacting it")
+    table = partition_table(month)
+    columns = ", ".join(LEDGER_COLUMNS)
+    with conn:
+        conn.execute("DROP VIEW ledger")
+        conn.execute(PARTITION_TABLE.format(table=f"{table}_compact"))
+        conn.execute(
+            f"INSERT INTO {table}_compact ({columns}) SELECT {columns} FROM {table} ORDER BY account, date"
+        )
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_compact RENAME TO {table}")
+        for statement in partition_indexes(table).values():
+            conn.execute(statement)
+        _lock_partition(conn, month)
+        _create_ledger_view(conn)
+        conn.execute(
+            "UPDATE ledger_partitions SET compacted_at = ? WHERE month = ?", (datetime.now().isoformat(), month)
+        )
+    return next(partition for partition in partitions(conn, sizes=True) if partition.month == month)
+
+
+def _delete_file_rows(conn: sqlite3.Connection, file_id: int) -> None:
+    months = [
+        month
+        for (month,) in conn.execute("SELECT month FROM ledger_file_months WHERE file_id = ? ORDER BY month", (file_id,))
+    ]
+    if not months:
+        return
+    tables = _writable_partitions(conn, months)
+    for month, table in tables.items():
+        daily = pd.DataFrame(
+            conn.execute(
+                f"""
+                SELECT account, date, SUM(debit_cents), SUM(credit_cents), COUNT(*)
+                FROM {table} WHERE file_id = ? GROUP BY account, date
+                """,
+                (file_id,),
+            ).fetchall(),
+            columns=["account", "date", "debit_cents", "credit_cents", "entries"],
+        )
+        _apply_rollup_delta(conn, daily, sign=-1)
+        conn.execute(f"DELETE FROM {table} WHERE file_id = ?", (file_id,))
+        conn.execute("UPDATE ledger_partitions SET rows = rows - ? WHERE month = ?", (int(daily["entries"].sum()), month))
+    conn.execute("DELETE FROM ledger_file_months WHERE file_id = ?", (file_id,))
+
+
+def balances(
+    conn: sqlite3.Connection,
+    by: str = "account",
+    accounts: list[str] | None = None,
+    start: int | None = None,
+    end: int | None = None,
+) -> pd.DataFrame:
+    """Debit, credit and net cents per account and ``by`` period, from the rollups.
+
+    ``by`` is ``"account"`` (trial balance), ``"month"`` or ``"day"``;
+    ``start``/``end`` are inclusive yyyymmdd bounds. Bounded queries are
+    answered from ``balance_daily`` so partial months stay exact; raw ledger
+    rows are never scanned.
+    """
+    period = {"account": None, "month": "month", "day": "date"}[by]
+    clauses, params = [], []
+    if accounts is not None:
+        clauses.append(f"account IN ({', '.join('?' for _ in accounts)})")
+        params.extend(accounts)
+    if start is not None or end is not None:
+        table = "balance_daily"
+        period_expr = {"account": None, "month": "date / 100", "day": "date"}[by]
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(end)
+    else:
+        table = PERIOD_TABLES[by]
+        period_expr = period
+    select = ["account"] + ([f"{period_expr} AS {period}"] if period else [])
+    group = ", ".join(["account"] + ([period] if period else []))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"""
+        SELECT {', '.join(select)}, SUM(debit_cents), SUM(credit_cents), SUM(entries)
+        FROM {table} {where}
+        GROUP BY {group}
+        ORDER BY {group}
+        """,
+        params,
+    ).fetchall()
+    columns = ["account"] + ([period] if period else []) + ["debit_cents", "credit_cents", "entries"]
+    frame = pd.DataFrame(rows, columns=columns)
+    frame = frame.astype({column: "int64" for column in columns[1:]})
+    frame["net_cents"] = frame["debit_cents"] - frame["credit_cents"]
+    return frame
+
+
+def monthly_net(
+    conn: sqlite3.Connection,
+    accounts: list[str] | None = None,
+    start: int | None = None,
+    end: int | None = None,
+) -> pd.DataFrame:
+    """Per-account monthly totals (``month`` as yyyymm) from the balance rollups."""
+    return balances(conn, by="month", accounts=accounts, start=start, end=end)
+
+
+def trial_balance(conn: sqlite3.Connection, as_of: int | None = None) -> pd.DataFrame:
+    """``aggregate_balances``-shaped totals (account, debit, credit, net) from the rollups."""
+    totals = balances(conn, by="account", end=as_of)
+    return pd.DataFrame(
+        {
+            "account": totals["account"],
+            "debit": totals["debit_cents"] / 100,
+            "credit": totals["credit_cents"] / 100,
+            "net": totals["net_cents"] / 100,
+        }
+    )
+
+
+class StoreTransactionService:
+    """``TransactionService`` over the store's raw rows; one connection per thread."""
+
+    def __init__(self, path: Path | str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def get_transactions(self, account: str, start_date: datetime, end_date: datetime) -> list[dict]:
+        rows = read_rows(
+            self._conn(),
+            account,
+            _day_key(start_date),
+            _day_key(end_date),
+            columns=("date", "debit_cents", "credit_cents", "description"),
+        )
+        return [
+            {
+                "date": f"{date // 10000:04d}-{date // 100 % 100:02d}-{date % 100:02d}",
+                "amount": str(Money(abs(debit - credit))),
+                "entry_type": "debit" if debit > credit else "credit",
+                "description": description,
+            }
+            for date, debit, credit, description in rows
+            if debit != credit
+        ]
+
+
+BUDGET_SELECT = "SELECT id, name, period, currency, allocated_minor, spent_minor, account FROM budgets"
+
+
+def _budget_record(row: tuple) -> dict:
+    budget_id, name, period, currency, allocated, spent, account = row
+    return {
+        "id": budget_id,
+        "name": name,
+        "allocated": str(Money(allocated, currency)),
+        "spent": str(Money(spent, currency)),
+        "period": period,
+        "currency": currency,
+        "account": account,
+    }
+
+
+def load_budgets(conn: sqlite3.Connection) -> dict[str, dict]:
+    """Every budget keyed by id, shaped like ``StoreBudgetService.get_budget``."""
+    return {row[0]: _budget_record(row) for row in conn.execute(BUDGET_SELECT)}
+
+
+class StoreBudgetService:
+    """``BudgetService`` over the store's ``budgets`` table; amounts are exact minor units."""
+
+    def __init__(self, path: Path | str):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def get_budget(self, budget_id: str) -> dict:
+        row = self._conn().execute(f"{BUDGET_SELECT} WHERE id = ?", (budget_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No budget {budget_id}")
+        return _budget_record(row)
+
+    def update_spent(self, budget_id: str, amount: Decimal) -> None:
+        conn = self._conn()
+        with conn:
+            currency = conn.execute("SELECT currency FROM budgets WHERE id = ?", (budget_id,)).fetchone()
+            if currency is None:
+                raise KeyError(f"No budget {budget_id}")
+            conn.execute(
+                "UPDATE budgets SET spent_minor = spent_minor + ?, updated_at = ? WHERE id = ?",
+                (Money.of(amount, currency[0]).minor, datetime.now().isoformat(), budget_id),
+            )
+
+    def put_budget(
+        self,
+        budget_id: str,
+        name: str,
+        allocated: Decimal,
+        period: str,
+        currency: str = "USD",
+        account: str | None = None,
+    ) -> None:
+        """Create ``budget_id`` or change its allocation; the spent total is kept.
+
+        Live entries posted to ``account`` (see ``append_entries``) are charged
+        to the budget: debits add to spent, credits refund it. ``currency``
+        must be a 3-letter code, as in ledger CSVs.
+        """
+        if not re.fullmatch("[A-Z]{3}", currency):
+            raise ValueError(f"currency must be a 3-letter code, got {currency!r}")
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                """
+                INSERT INTO budgets (id, name, period, currency, allocated_minor, updated_at, account)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name,
+                    period = excluded.period,
+                    currency = excluded.currency,
+                    allocated_minor = excluded.allocated_minor,
+                    updated_at = excluded.updated_at,
+                    account = excluded.account
+                """,
+                (
+                    budget_id,
+                    name,
+                    period,
+                    currency,
+                    Money.of(allocated, currency).minor,
+                    datetime.now().isoformat(),
+                    account,
+                ),
+            )
+
+
+def _day_key(value: datetime) -> int:
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def date_keys(dates: pd.Series) -> np.ndarray:
+    """Encode datetimes as the store's yyyymmdd integers."""
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).to_numpy(np.int64)
+
+
+@dataclass
+class ManifestEntry:
+    path: str
+    size: int
+    mtime: float
+    sha256: str
+    rows: int
+
+
+@dataclass
+class ImportReport:
+    imported: list[str] = field(default_factory=list)
+    appended: list[str] = field(default_factory=list)
+    replaced: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    pruned: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    rows: int = 0
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "imported": len(self.imported),
+            "appended": len(self.appended),
+            "replaced": len(self.replaced),
+            "skipped": len(self.skipped),
+            "pruned": len(self.pruned),
+            "failed": len(self.failed),
+            "rows": self.rows,
+        }
+
+
+def _hash_file(path: Path, prefix_size: int | None = None) -> tuple[str, str | None]:
+    """Return the SHA-256 of the whole file and of its first ``prefix_size`` bytes."""
+    digest = hashlib.sha256()
+    prefix_digest = None
+    remaining = prefix_size
+    with path.open("rb") as handle:
+        while remaining:
+            block = handle.read(min(HASH_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+        if prefix_size is not None and remaining == 0:
+            prefix_digest = digest.hexdigest()
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest(), prefix_digest
+
+
+def _ends_with_newline(path: Path, offset: int) -> bool:
+    if offset == 0:
+        return False
+    with path.open("rb") as handle:
+        handle.seek(offset - 1)
+        return handle.read(1) == b"\n"
+
+
+def manifest_entry(conn: sqlite3.Connection, key: str) -> ManifestEntry | None:
+    row = conn.execute(
+        "SELECT path, size, mtime, sha256, rows FROM ledger_files WHERE path = ?", (key,)
+    ).fetchone()
+    return ManifestEntry(*row) if row else None
+
+
+def _record(conn: sqlite3.Connection, entry: ManifestEntry) -> int:
+    """Upsert a manifest entry and return its file id."""
+    conn.execute(
+        """
+        INSERT INTO ledger_files (path, size, mtime, sha256, rows, imported_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (path) DO UPDATE SET
+            size = excluded.size,
+            mtime = excluded.mtime,
+            sha256 = excluded.sha256,
+            rows = excluded.rows,
+            imported_at = excluded.imported_at
+        """,
+        (entry.path, entry.size, entry.mtime, entry.sha256, entry.rows, datetime.now().isoformat()),
+    )
+    return conn.execute("SELECT id FROM ledger_files WHERE path = ?", (entry.path,)).fetchone()[0]
+
+
+def _insert_rows(conn: sqlite3.Connection, frame: pd.DataFrame, file_id: int) -> None:
+    if frame.empty:
+        return
+    # Inserting in (account, date) order keeps each account's rows on
+    # neighbouring pages and makes the index build a near-sequential merge.
+    frame = frame.sort_values(["account", "date"], kind="stable")
+    typed = pd.DataFrame(
+        {
+            "account": frame["account"].to_numpy(),
+            "date": date_keys(frame["date"]),
+            "debit_cents": to_minor_array(frame["debit"]),
+            "credit_cents": to_minor_array(frame["credit"]),
+            "description": frame["description"].to_numpy(),
+        }
+    )
+    month_keys = typed["date"].to_numpy() // 100
+    months = sorted(int(month) for month in np.unique(month_keys))
+    tables = _writable_partitions(conn, months)
+    stored = dict(
+        conn.execute(
+            f"SELECT month, rows FROM ledger_partitions WHERE month IN ({', '.join('?' for _ in months)})", months
+        )
+    )
+    for month, part in typed.groupby(month_keys, sort=True):
+        table = tables[int(month)]
+        # For a batch that dwarfs what the partition already holds (typically
+        # the first load), building the indexes once afterwards beats
+        # maintaining them row by row. The drop and rebuild share the
+        # caller's transaction.
+        rebuild = len(part) >= REINDEX_MIN_ROWS and len(part) > stored[int(month)]
+        if rebuild:
+            for name in partition_indexes(table):
+                conn.execute(f"DROP INDEX IF EXISTS {name}")
+        # One prepared statement fed lazily by executemany, rather than
+        # DataFrame.to_sql, which commits on its own and would split the
+        # delete-and-reinsert of a replaced file in two.
+        rows = zip(
+            itertools.repeat(file_id),
+            part["date"].tolist(),
+            part["account"].tolist(),
+            part["debit_cents"].tolist(),
+            part["credit_cents"].tolist(),
+            part["description"].tolist(),
+        )
+        conn.executemany(INSERT_SQL.format(table=table), rows)
+        if rebuild:
+            for statement in partition_indexes(table).values():
+                conn.execute(statement)
+        conn.execute("UPDATE ledger_partitions SET rows = rows + ? WHERE month = ?", (len(part), int(month)))
+    conn.executemany(
+        "INSERT OR IGNORE INTO ledger_file_months (file_id, month) VALUES (?, ?)",
+        ((file_id, month) for month in months),
+    )
+    daily = (
+        typed.groupby(["account", "date"], sort=False)
+        .agg(
+            debit_cents=("debit_cents", "sum"),
+            credit_cents=("credit_cents", "sum"),
+            entries=("debit_cents", "size"),
+        )
+        .reset_index()
+    )
+    _apply_rollup_delta(conn, daily, sign=1)
+
+
+def append_entries(conn: sqlite3.Connection, rows: list[tuple]) -> list[int]:
+    """Append live entries in one transaction; return the positions in ``rows`` that were new.
+
+    ``rows`` are ``(entry_id, date, account, debit_cents, credit_cents,
+    description)`` with ``date`` as yyyymmdd. An id that is already stored,
+    or repeats within ``rows``, is skipped, so a redelivered entry is
+    harmless; rows without an id are always appended. The balance rollups
+    and the spent total of every USD budget on an entry's account change in
+    the same transaction as the rows.
+    """
+    ids = [row[0] for row in rows if row[0] is not None]
+    with conn:
+        seen: set[str] = set()
+        for start in range(0, len(ids), ID_LOOKUP_CHUNK):
+            chunk = ids[start : start + ID_LOOKUP_CHUNK]
+            seen.update(
+                found
+                for (found,) in conn.execute(
+                    f"SELECT entry_id FROM ledger_entry_ids WHERE entry_id IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                )
+            )
+        fresh: dict[int, list[tuple]] = {}
+        daily: dict[tuple[str, int], list[int]] = {}
+        stored: list[int] = []
+        for position, (entry_id, date, account, debit, credit, description) in enumerate(rows):
+            if entry_id is not None:
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+            stored.append(position)
+            fresh.setdefault(date // 100, []).append((date, account, debit, credit, description, entry_id))
+            totals = daily.get((account, date))
+            if totals is None:
+                daily[account, date] = [debit, credit, 1]
+            else:
+                totals[0] += debit
+                totals[1] += credit
+                totals[2] += 1
+        if not fresh:
+            return stored
+        for month, table in _writable_partitions(conn, sorted(fresh)).items():
+            conn.executemany(LIVE_INSERT_SQL.format(table=table), fresh[month])
+            conn.execute("UPDATE ledger_partitions SET rows = rows + ? WHERE month = ?", (len(fresh[month]), month))
+            conn.executemany(
+                "INSERT INTO ledger_entry_ids (entry_id, month) VALUES (?, ?)",
+                ((row[5], month) for row in fresh[month] if row[5] is not None),
+            )
+        _apply_rollup_delta(
+            conn,
+            pd.DataFrame(
+                [(account, date, *totals) for (account, date), totals in daily.items()],
+                columns=["account", "date", "debit_cents", "credit_cents", "entries"],
+            ),
+            sign=1,
+        )
+        spent: dict[str, int] = {}
+        for (account, _), (debit, credit, _) in daily.items():
+            spent[account] = spent.get(account, 0) + debit - credit
+        now = datetime.now().isoformat()
+        conn.executemany(
+            "UPDATE budgets SET spent_minor = spent_minor + ?, updated_at = ? WHERE account = ? AND currency = ?",
+            ((delta, now, account, csv_utils.DEFAULT_CURRENCY) for account, delta in spent.items() if delta),
+        )
+    return stored
+
+
+def _check_currency(frame: pd.DataFrame, name: str, first_line: int = 2) -> None:
+    """Cents columns carry no currency, so only ``DEFAULT_CURRENCY`` rows may be stored."""
+    if csv_utils.CURRENCY_COLUMN not in frame.columns:
+        return
+    foreign = (frame[csv_utils.CURRENCY_COLUMN] != csv_utils.DEFAULT_CURRENCY).to_numpy().nonzero()[0]
+    if len(foreign):
+        raise csv_utils.LedgerFormatError(
+            name,
+            [
+                (first_line + int(position), f"currency must be {csv_utils.DEFAULT_CURRENCY} in the ledger store")
+                for position in foreign
+            ],
+        )
+
+
+@dataclass
+class PendingImport:
+    """Outcome of fingerprinting and parsing one file, ready to be written."""
+
+    key: str
+    action: str  # "skip", "touch", "append", "replace" or "import"
+    current: ManifestEntry | None = None
+    frame: pd.DataFrame | None = None
+
+
+def prepare_import(path: Path, previous: ManifestEntry | None) -> PendingImport:
+    """Fingerprint ``path`` against its manifest entry and parse what changed.
+
+    Touches no database so it can run in a process-pool worker.
+    """
+    key = str(path.resolve())
+    stat = path.stat()
+    if previous and previous.size == stat.st_size and previous.mtime == stat.st_mtime:
+        return PendingImport(key, "skip")
+
+    grew = previous is not None and stat.st_size > previous.size
+    sha256, prefix = _hash_file(path, previous.size if grew else None)
+    current = ManifestEntry(key, stat.st_size, stat.st_mtime, sha256, 0)
+
+    if previous and previous.sha256 == sha256:
+        current.rows = previous.rows
+        return PendingImport(key, "touch", current)
+    if grew and prefix == previous.sha256 and _ends_with_newline(path, previous.size):
+        frame = csv_utils.read_ledger_tail(path, previous.size, first_line=previous.rows + 2)
+        _check_currency(frame, path.name, first_line=previous.rows + 2)
+        current.rows = previous.rows + len(frame)
+        return PendingImport(key, "append", current, frame)
+    frame = csv_utils.read_ledger_frame(path).columns
+    _check_currency(frame, path.name)
+    current.rows = len(frame)
+    return PendingImport(key, "replace" if previous else "import", current, frame)
+
+
+def apply_import(conn: sqlite3.Connection, pending: PendingImport, report: ImportReport) -> None:
+    """Write a prepared file into the store inside a single transaction."""
+    if pending.action == "skip":
+        report.skipped.append(pending.key)
+        return
+    with conn:
+        file_id = _record(conn, pending.current)
+        if pending.action == "touch":
+            # Touched but not modified: refresh mtime so the next run skips it cheaply.
+            report.skipped.append(pending.key)
+        elif pending.action == "append":
+            _insert_rows(conn, pending.frame, file_id)
+            report.appended.append(pending.key)
+        else:
+            _delete_file_rows(conn, file_id)
+            _insert_rows(conn, pending.frame, file_id)
+            (report.replaced if pending.action == "replace" else report.imported).append(pending.key)
+    if pending.frame is not None:
+        report.rows += len(pending.frame)
+
+
+def import_file(conn: sqlite3.Connection, path: Path, report: ImportReport | None = None) -> ImportReport:
+    """Bring one ledger file up to date in the store."""
+    report = report or ImportReport()
+    previous = manifest_entry(conn, str(path.resolve()))
+    apply_import(conn, prepare_import(path, previous), report)
+    return report
+
+
+def prune_missing(conn: sqlite3.Connection, directory: Path, paths: list[Path], report: ImportReport) -> None:
+    """Remove manifest entries, rows and rollups of files in ``directory`` not among ``paths``."""
+    folder = directory.resolve()
+    present = {str(path.resolve()) for path in paths}
+    missing = [
+        (file_id, path)
+        for file_id, path in conn.execute("SELECT id, path FROM ledger_files ORDER BY path")
+        if Path(path).parent == folder and path not in present
+    ]
+    for file_id, path in missing:
+        try:
+            with conn:
+                _delete_file_rows(conn, file_id)
+                conn.execute("DELETE FROM ledger_files WHERE id = ?", (file_id,))
+                _bump_generation(conn)
+        except PartitionClosedError as closed:
+            report.failed[path] = str(closed)
+            continue
+        report.pruned.append(path)
+
+
+def import_directory(conn: sqlite3.Connection, directory: Path, workers: int = 1) -> ImportReport:
+    """Import every CSV in ``directory``; parsing runs on ``workers`` processes.
+
+    A file that fails to parse is recorded in ``report.failed`` and does not
+    stop the others; rows are always written in sorted file order. Manifest
+    entries for CSVs in ``directory`` that no longer exist are pruned first.
+    """
+    report = ImportReport()
+    paths = sorted(directory.glob("*.csv"))
+    prune_missing(conn, directory, paths, report)
+    calls = [(path, manifest_entry(conn, str(path.resolve()))) for path in paths]
+    for path, (pending, error) in zip(paths, csv_utils.parallel_map(prepare_import, calls, workers)):
+        if error is not None:
+            report.failed[str(path.resolve())] = str(error)
+            continue
+        try:
+            apply_import(conn, pending, report)
+        except PartitionClosedError as closed:
+            report.failed[pending.key] = str(closed)
+    return report
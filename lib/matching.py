@@ -0,0 +1,232 @@
+"""Pair ledger entries with bank-statement lines.
+
+Matching runs in two passes, each close to linear in the number of rows:
+
+1. Exact: equal amount and reference. This is a hash join on (amount,
+   reference, occurrence), so repeated identical payments pair off in date
+   order.
+2. Windowed: equal amount, dates at most ``window_days`` apart and
+   descriptions at least ``min_similarity`` alike by token Jaccard. Rows
+   that repeat (amount, day, description) on one side are collapsed into a
+   group first. Both sides' groups are sorted on a packed (amount, day)
+   integer key; each statement group's candidates are the nearest
+   ``_MAX_CANDIDATES`` groups of one ``searchsorted`` range, so repeating
+   amounts cost O(n) rather than O(n·k). Candidates are assigned greedily,
+   best similarity first and then nearest date, pairing the rows of two
+   groups in order, so every row is used at most once.
+
+Rows that repeat (amount, date, description) on the same side are reported
+as suspected duplicates; they still take part in matching.
+
+Both inputs are frames with ``date`` and signed ``amount`` columns (inflows
+positive), plus optional ``id``, ``reference`` and ``description`` columns.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from lib.defaults import DEFAULT_MIN_SIMILARITY, DEFAULT_WINDOW_DAYS
+from models.money import to_minor_array
+
+# Days since 1970 stay far below this, leaving the high digits for cents.
+_DAY_SPAN = 1_000_000
+# Ledger groups considered per statement group in the windowed pass.
+_MAX_CANDIDATES = 32
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class MatchResult:
+    matched: pd.DataFrame
+    unmatched_ledger: pd.DataFrame
+    unmatched_statement: pd.DataFrame
+    duplicates: pd.DataFrame
+
+    def summary(self) -> dict[str, int]:
+        methods = self.matched["method"].value_counts()
+        return {
+            "matched": len(self.matched),
+            "matched_exact": int(methods.get("exact", 0)),
+            "matched_fuzzy": int(methods.get("fuzzy", 0)),
+            "unmatched_ledger": len(self.unmatched_ledger),
+            "unmatched_statement": len(self.unmatched_statement),
+            "suspected_duplicates": len(self.duplicates),
+        }
+
+
+def _normalized(frame: pd.DataFrame, column: str, case: str) -> np.ndarray:
+    """Stripped, case-folded text; each distinct value is normalized once."""
+    if column not in frame.columns:
+        return np.full(len(frame), "", dtype=object)
+    codes, uniques = pd.factorize(frame[column].fillna("").astype(str))
+    cleaned = getattr(pd.Series(uniques, dtype=object).str.strip().str, case)()
+    return cleaned.to_numpy(dtype=object)[codes] if len(codes) else np.array([], dtype=object)
+
+
+def _prepare(frame: pd.DataFrame, currency: str) -> pd.DataFrame:
+    ids = frame["id"].to_numpy() if "id" in frame.columns else frame.index.to_numpy()
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "day": pd.to_datetime(frame["date"]).to_numpy("datetime64[D]").astype(np.int64),
+            "minor": to_minor_array(frame["amount"], currency),
+            "reference": _normalized(frame, "reference", "upper"),
+            "description": _normalized(frame, "description", "lower"),
+        }
+    )
+
+
+def _duplicates(prepared: pd.DataFrame, side: str) -> pd.DataFrame:
+    keys = ["minor", "day", "description"]
+    repeated = prepared.duplicated(keys, keep="first")
+    first_ids = prepared.drop_duplicates(keys).set_index(keys)["id"]
+    extras = prepared[repeated]
+    duplicate_of = first_ids.reindex(pd.MultiIndex.from_frame(extras[keys])).to_numpy()
+    return pd.DataFrame({"side": side, "id": extras["id"].to_numpy(), "duplicate_of": duplicate_of})
+
+
+def _exact_pass(ledger: pd.DataFrame, statement: pd.DataFrame) -> pd.DataFrame:
+    def keyed(frame: pd.DataFrame) -> pd.DataFrame:
+        frame = frame[frame["reference"] != ""].sort_values("day", kind="stable")
+        return frame.assign(occurrence=frame.groupby(["minor", "reference"], sort=False).cumcount())
+
+    pairs = keyed(ledger).reset_index().merge(
+        keyed(statement).reset_index(), on=["minor", "reference", "occurrence"], suffixes=("_l", "_s")
+    )
+    return pd.DataFrame(
+        {
+            "ledger_row": pairs["index_l"].to_numpy(),
+            "statement_row": pairs["index_s"].to_numpy(),
+            "similarity": np.nan,
+        }
+    )
+
+
+def _similarity(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Token Jaccard similarity of paired descriptions, computed once per distinct pair."""
+    codes, texts = pd.factorize(np.concatenate([left, right]))
+    tokens = [frozenset(_TOKEN.findall(text)) for text in texts]
+    pair_codes, pairs = pd.factorize(codes[: len(left)].astype(np.int64) * len(texts) + codes[len(left) :])
+    scores = np.empty(len(pairs))
+    for position, (a, b) in enumerate(zip(*np.divmod(pairs, len(texts)))):
+        x, y = tokens[a], tokens[b]
+        union = len(x | y)
+        scores[position] = len(x & y) / union if union else 1.0
+    return scores[pair_codes]
+
+
+def _groups(frame: pd.DataFrame) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Collapse repeated (amount, day, description) rows.
+
+    Returns one row per group, the frame's index sorted by group and the
+    offset of each group's first row in it; rows keep their order.
+    """
+    codes = frame.groupby(["minor", "day", "description"], sort=False).ngroup().to_numpy()
+    rows = frame.index.to_numpy()[np.argsort(codes, kind="stable")]
+    counts = np.bincount(codes)
+    groups = frame.iloc[np.unique(codes, return_index=True)[1]].reset_index(drop=True)
+    return groups.assign(count=counts), rows, np.cumsum(counts) - counts
+
+
+def _window_pass(
+    ledger: pd.DataFrame, statement: pd.DataFrame, window_days: int, min_similarity: float
+) -> pd.DataFrame:
+    if ledger.empty or statement.empty:
+        return pd.DataFrame({"ledger_row": [], "statement_row": [], "similarity": []})
+    ledger, ledger_rows, ledger_first = _groups(ledger)
+    statement, statement_rows, statement_first = _groups(statement)
+    ledger_keys = ledger["minor"].to_numpy() * _DAY_SPAN + ledger["day"].to_numpy()
+    order = np.argsort(ledger_keys, kind="stable")
+    ledger_keys = ledger_keys[order]
+    statement_keys = statement["minor"].to_numpy() * _DAY_SPAN + statement["day"].to_numpy()
+    low = np.searchsorted(ledger_keys, statement_keys - window_days, side="left")
+    high = np.searchsorted(ledger_keys, statement_keys + window_days, side="right")
+    # Keep at most _MAX_CANDIDATES groups of each range, centred on the statement's own day.
+    nearest = np.searchsorted(ledger_keys, statement_keys, side="left")
+    low = np.clip(nearest - _MAX_CANDIDATES // 2, low, np.maximum(low, high - _MAX_CANDIDATES))
+    counts = np.minimum(high - low, _MAX_CANDIDATES)
+    # Expand every statement group into its candidate range without a Python loop.
+    statement_pos = np.repeat(np.arange(len(statement)), counts)
+    starts = np.repeat(low - np.cumsum(counts) + counts, counts)
+    ledger_pos = order[starts + np.arange(counts.sum())]
+    if not len(ledger_pos):
+        return pd.DataFrame({"ledger_row": [], "statement_row": [], "similarity": []})
+
+    similarity = _similarity(
+        ledger["description"].to_numpy()[ledger_pos], statement["description"].to_numpy()[statement_pos]
+    )
+    distance = np.abs(ledger["day"].to_numpy()[ledger_pos] - statement["day"].to_numpy()[statement_pos])
+    keep = similarity >= min_similarity
+    ledger_pos, statement_pos = ledger_pos[keep], statement_pos[keep]
+    similarity, distance = similarity[keep], distance[keep]
+
+    ranking = np.lexsort((distance, -similarity))
+    # ``next_l``/``next_s`` walk each group's rows; ``end_l``/``end_s`` stop them.
+    next_l, end_l = ledger_first.tolist(), (ledger_first + ledger["count"]).tolist()
+    next_s, end_s = statement_first.tolist(), (statement_first + statement["count"]).tolist()
+    chosen, taken, from_l, from_s = [], [], [], []
+    for candidate, lp, sp in zip(ranking.tolist(), ledger_pos[ranking].tolist(), statement_pos[ranking].tolist()):
+        take = min(end_l[lp] - next_l[lp], end_s[sp] - next_s[sp])
+        if take:
+            chosen.append(candidate)
+            taken.append(take)
+            from_l.append(next_l[lp])
+            from_s.append(next_s[sp])
+            next_l[lp] += take
+            next_s[sp] += take
+    # Pair the next ``take`` unused rows of each chosen group pair, in order.
+    taken = np.asarray(taken, dtype=np.int64)
+    step = np.arange(taken.sum()) - np.repeat(np.cumsum(taken) - taken, taken)
+    return pd.DataFrame(
+        {
+            "ledger_row": ledger_rows[np.repeat(np.asarray(from_l, dtype=np.int64), taken) + step],
+            "statement_row": statement_rows[np.repeat(np.asarray(from_s, dtype=np.int64), taken) + step],
+            "similarity": np.repeat(similarity[np.asarray(chosen, dtype=np.int64)], taken),
+        }
+    )
+
+
+def match_transactions(
+    ledger: pd.DataFrame,
+    statement: pd.DataFrame,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+    currency: str = "USD",
+) -> MatchResult:
+    """Match ``ledger`` entries to ``statement`` lines; see the module docstring."""
+    left = _prepare(ledger.reset_index(drop=True), currency)
+    right = _prepare(statement.reset_index(drop=True), currency)
+
+    exact = _exact_pass(left, right)
+    rest_l = left.drop(index=exact["ledger_row"])
+    rest_s = right.drop(index=exact["statement_row"])
+    fuzzy = _window_pass(rest_l, rest_s, window_days, min_similarity)
+
+    pairs = pd.concat(
+        [exact.assign(method="exact"), fuzzy.assign(method="fuzzy")], ignore_index=True
+    ).astype({"ledger_row": np.int64, "statement_row": np.int64})
+    matched = pd.DataFrame(
+        {
+            "ledger_id": left["id"].to_numpy()[pairs["ledger_row"]],
+            "statement_id": right["id"].to_numpy()[pairs["statement_row"]],
+            "method": pairs["method"].to_numpy(),
+            "days_apart": right["day"].to_numpy()[pairs["statement_row"]]
+            - left["day"].to_numpy()[pairs["ledger_row"]],
+            "similarity": pairs["similarity"].to_numpy(),
+        }
+    )
+    unmatched_l = np.ones(len(left), dtype=bool)
+    unmatched_l[pairs["ledger_row"].to_numpy()] = False
+    unmatched_s = np.ones(len(right), dtype=bool)
+    unmatched_s[pairs["statement_row"].to_numpy()] = False
+    duplicates = pd.concat([_duplicates(left, "ledger"), _duplicates(right, "statement")], ignore_index=True)
+    return MatchResult(
+        matched=matched,
+        unmatched_ledger=ledger.reset_index(drop=True)[unmatched_l],
+        unmatched_statement=statement.reset_index(drop=True)[unmatched_s],
+        duplicates=duplicates,
+    )
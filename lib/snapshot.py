@@ -0,0 +1,320 @@
+"""Memory-mapped binary snapshot of the ledger store.
+
+``write_snapshot`` dumps every ledger row to one file next to the store
+(``<store>.snapshot``), sorted by date, as fixed-width little-endian columns:
+
+``date``
+    int32 days since 1970-01-01.
+``account``
+    int32 code into the header's sorted account dictionary.
+``debit_cents``, ``credit_cents``
+    int64 minor units.
+
+The file starts with an 8-byte magic, a uint32 header length and a JSON
+header (row count, accounts, column offsets, store generation); each column
+starts on a 64-byte boundary. ``open_snapshot`` maps the file read-only and
+exposes the columns as zero-copy NumPy views, so opening costs a header
+parse whatever the row count, and analytics page in only the columns and
+date range they scan. Descriptions are not included.
+
+A snapshot is current while the store's generation matches the one in its
+header (``LedgerSnapshot.is_current``); ``br_fin.py import`` rewrites it
+after every import that changed the store.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sqlite3
+import struct
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lib import ledger_store
+
+MAGIC = b"BRLSNAP\x01"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+COLUMNS = {"date": "<i4", "account": "<i4", "debit_cents": "<i8", "credit_cents": "<i8"}
+# Float64 sums of integer cents stay exact below this magnitude.
+_EXACT_FLOAT = 2**53
+
+
+def snapshot_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + ".snapshot")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def date_keys_to_days(keys: np.ndarray) -> np.ndarray:
+    """yyyymmdd integers to int32 days since the epoch."""
+    keys = np.asarray(keys, dtype=np.int64)
+    months = (keys // 10000 - 1970) * 12 + keys // 100 % 100 - 1
+    days = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64) + keys % 100 - 1
+    return days.astype(np.int32)
+
+
+def days_to_date_keys(days: np.ndarray) -> np.ndarray:
+    """int32 days since the epoch to yyyymmdd integers."""
+    dates = np.asarray(days).astype("datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    month_index = months.astype(np.int64)
+    return (
+        (month_index // 12 + 1970) * 10000
+        + (month_index % 12 + 1) * 100
+        + (dates - months.astype("datetime64[D]")).astype(np.int64)
+        + 1
+    )
+
+
+def write_snapshot(conn: sqlite3.Connection, path: Path) -> int:
+    """Write the store's rows to ``path`` (atomically replaced); returns the row count.
+
+    Reads run in one transaction, so the rows, accounts and generation
+    recorded all come from the same state of the store.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    conn.execute("BEGIN")
+    try:
+        store_id, generation = ledger_store.generation(conn)
+        accounts = [account for (account,) in conn.execute("SELECT account FROM balance_account ORDER BY account")]
+        rows = conn.execute("SELECT COALESCE(SUM(rows), 0) FROM ledger_partitions").fetchone()[0]
+        offsets, size = {}, 0
+        for name, dtype in COLUMNS.items():
+            offsets[name] = size
+            size = _align(size + rows * np.dtype(dtype).itemsize)
+        header = json.dumps(
+            {
+                "version": FORMAT_VERSION,
+                "rows": rows,
+                "accounts": accounts,
+                "columns": {name: {"dtype": dtype, "offset": offsets[name]} for name, dtype in COLUMNS.items()},
+                "store_id": store_id,
+                "generation": generation,
+                "created_at": datetime.now().isoformat(),
+            }
+        ).encode()
+        data_offset = _align(len(MAGIC) + 8 + len(header))
+        with tmp.open("wb") as handle:
+            handle.write(MAGIC + struct.pack("<II", len(header), 0) + header)
+            handle.truncate(data_offset + size)
+        written = 0
+        if rows:
+            columns = {
+                name: np.memmap(tmp, dtype=dtype, mode="r+", offset=data_offset + offsets[name], shape=(rows,))
+                for name, dtype in COLUMNS.items()
+            }
+            for month in ledger_store.partition_months(conn):
+                # Partitions are stored in (account, date) order; a stable
+                # NumPy sort by date is much cheaper than ORDER BY in SQLite.
+                frame = pd.DataFrame.from_records(
+                    conn.execute(
+                        f"SELECT date, account, debit_cents, credit_cents FROM {ledger_store.partition_table(month)}"
+                    ).fetchall(),
+                    columns=["date", "account", "debit_cents", "credit_cents"],
+                )
+                end = written + len(frame)
+                if end > rows:
+                    raise RuntimeError("ledger_partitions row counts are behind the partitions")
+                order = np.argsort(frame["date"].to_numpy(), kind="stable")
+                columns["date"][written:end] = date_keys_to_days(frame["date"].to_numpy()[order])
+                codes = pd.Categorical(frame["account"], categories=accounts).codes
+                columns["account"][written:end] = codes[order]
+                columns["debit_cents"][written:end] = frame["debit_cents"].to_numpy(np.int64)[order]
+                columns["credit_cents"][written:end] = frame["credit_cents"].to_numpy(np.int64)[order]
+                written = end
+            for column in columns.values():
+                column.flush()
+            del columns
+        if written != rows:
+            raise RuntimeError("ledger_partitions row counts are ahead of the partitions")
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        conn.rollback()
+    os.replace(tmp, path)
+    return rows
+
+
+class LedgerSnapshot:
+    """Read-only columns of a snapshot file (or a date range of one)."""
+
+    def __init__(
+        self,
+        header: dict,
+        accounts: np.ndarray,
+        dates: np.ndarray,
+        account_codes: np.ndarray,
+        debit_cents: np.ndarray,
+        credit_cents: np.ndarray,
+        buffer: mmap.mmap | None = None,
+    ):
+        self.header = header
+        self.accounts = accounts
+        self.dates = dates
+        self.account_codes = account_codes
+        self.debit_cents = debit_cents
+        self.credit_cents = credit_cents
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __enter__(self) -> LedgerSnapshot:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Drop the columns and unmap the file once no other view of it is alive."""
+        self.dates = self.account_codes = self.debit_cents = self.credit_cents = None
+        buffer, self._buffer = self._buffer, None
+        if buffer is not None:
+            try:
+                buffer.close()
+            except BufferError:
+                pass  # a slice from ``between`` still maps it; freed with that view
+
+    @property
+    def generation(self) -> tuple[str, int]:
+        return self.header["store_id"], self.header["generation"]
+
+    def is_current(self, conn: sqlite3.Connection) -> bool:
+        return self.generation == tuple(ledger_store.generation(conn))
+
+    def between(self, start: int | None = None, end: int | None = None) -> LedgerSnapshot:
+        """Rows between the inclusive yyyymmdd bounds, as views into the same mapping."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, date_keys_to_days([start])[0], "left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.dates, date_keys_to_days([end])[0], "right"))
+        return LedgerSnapshot(
+            self.header,
+            self.accounts,
+            self.dates[lo:hi],
+            self.account_codes[lo:hi],
+            self.debit_cents[lo:hi],
+            self.credit_cents[lo:hi],
+        )
+
+    def summary(self) -> dict[str, float]:
+        """``LedgerFile.summary()`` over every row."""
+        debits = int(self.debit_cents.sum())
+        credits = int(self.credit_cents.sum())
+        return {
+            "entries": len(self),
+            "debits": debits / 100,
+            "credits": credits / 100,
+            "imbalance": (debits - credits) / 100,
+        }
+
+    def balances(
+        self,
+        by: str = "account",
+        accounts: list[str] | None = None,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> pd.DataFrame:
+        """Same rows as ``ledger_store.balances``, computed from the mapped columns."""
+        period = {"account": None, "month": "month", "day": "date"}[by]
+        view = self.between(start, end) if start is not None or end is not None else self
+        codes = view.account_codes
+        debit, credit = view.debit_cents, view.credit_cents
+        if accounts is not None:
+            wanted = np.flatnonzero(np.isin(self.accounts, accounts))
+            mask = np.isin(codes, wanted)
+            codes, debit, credit = codes[mask], debit[mask], credit[mask]
+            dates = view.dates[mask]
+        else:
+            dates = view.dates
+        if period is None:
+            keys, first, periods = codes.astype(np.int64), 0, 1
+        else:
+            ordinals = dates.astype(np.int64)
+            if by == "month":
+                ordinals = dates.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+            first = int(ordinals.min()) if len(ordinals) else 0
+            periods = int(ordinals.max()) - first + 1 if len(ordinals) else 1
+            keys = codes.astype(np.int64) * periods + (ordinals - first)
+        size = len(self.accounts) * periods
+        entries = np.bincount(keys, minlength=size)
+        debit_totals = _sum_by(keys, debit, size)
+        credit_totals = _sum_by(keys, credit, size)
+        present = np.flatnonzero(entries)
+        columns = {"account": self.accounts[present // periods]}
+        if by == "month":
+            ordinal = present % periods + first
+            columns["month"] = (ordinal // 12 + 1970) * 100 + ordinal % 12 + 1
+        elif by == "day":
+            columns["date"] = days_to_date_keys(present % periods + first)
+        frame = pd.DataFrame(
+            {
+                **columns,
+                "debit_cents": debit_totals[present],
+                "credit_cents": credit_totals[present],
+                "entries": entries[present].astype(np.int64),
+            }
+        )
+        frame["net_cents"] = frame["debit_cents"] - frame["credit_cents"]
+        return frame
+
+    def aggregate_balances(self) -> pd.DataFrame:
+        """``csv_utils.aggregate_balances``-shaped totals (account, debit, credit, net)."""
+        totals = self.balances(by="account")
+        return pd.DataFrame(
+            {
+                "account": totals["account"],
+                "debit": totals["debit_cents"] / 100,
+                "credit": totals["credit_cents"] / 100,
+                "net": totals["net_cents"] / 100,
+            }
+        )
+
+
+def _sum_by(keys: np.ndarray, cents: np.ndarray, size: int) -> np.ndarray:
+    """Per-key int64 sums; float64 ``bincount`` when that is exact, ``np.add.at`` otherwise."""
+    if len(cents) and int(np.abs(cents).max()) * len(cents) >= _EXACT_FLOAT:
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, keys, cents)
+        return totals
+    return np.bincount(keys, weights=cents, minlength=size).astype(np.int64)
+
+
+def open_snapshot(path: Path) -> LedgerSnapshot:
+    """Map ``path`` read-only; raises ``ValueError`` if it is not a snapshot file."""
+    with path.open("rb") as handle:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a ledger snapshot")
+        (header_size,) = struct.unpack_from("<I", buffer, len(MAGIC))
+        start = len(MAGIC) + 8
+        header = json.loads(buffer[start : start + header_size])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"{path} has snapshot format {header['version']}, expected {FORMAT_VERSION}")
+    except BaseException:
+        buffer.close()
+        raise
+    data_offset = _align(start + header_size)
+    rows = header["rows"]
+    views = {
+        name: np.frombuffer(
+            buffer, dtype=spec["dtype"], count=rows, offset=data_offset + spec["offset"] if rows else 0
+        )
+        for name, spec in header["columns"].items()
+    }
+    return LedgerSnapshot(
+        header,
+        np.array(header["accounts"], dtype=object),
+        views["date"],
+        views["account"],
+        views["debit_cents"],
+        views["credit_cents"],
+        buffer,
+    )
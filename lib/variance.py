@@ -0,0 +1,324 @@
+"""Budget variance against ledger actuals, behind ``br_fin.py variance``.
+
+Budget lines come from the store's ``budgets`` table (``load_budgets``), a
+CSV (``read_budgets``) or ``BudgetModel`` objects (``budget_frame``), all
+normalized to one frame with a ``period`` of ``monthly``, ``quarterly`` or
+``yearly``. ``compute_variance`` expands every line over the periods in a
+month range and joins it to the account's net debits for each period in one
+vectorized pass:
+
+* actuals are read once from the ``balance_monthly`` rollup into a dense
+  account x month grid, so a period's spend is a difference of cumulative
+  sums whatever its length;
+* lines are matched to grid rows with a single index lookup, and accounts
+  with no postings read a zero row.
+
+Every period that overlaps the range is reported whole: a range ending in
+February still shows the full first quarter and the full year. Allocations
+are converted to ledger cents through their currency's minor-unit exponent
+and compared with actuals as-is; no FX is applied.
+"""
+from __future__ import annotations
+
+import itertools
+import sqlite3
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from models.money import minor_exponent, to_minor, to_minor_array
+
+PERIOD_MONTHS = {"monthly": 1, "quarterly": 3, "yearly": 12}
+BUDGET_COLUMNS = ["id", "name", "account", "period", "currency", "allocated_minor", "first_month", "last_month"]
+VARIANCE_COLUMNS = [
+    "id",
+    "name",
+    "account",
+    "period",
+    "period_start",
+    "period_end",
+    "currency",
+    "allocated",
+    "actual",
+    "variance",
+    "utilization",
+    "breach",
+    "warning",
+]
+# ``first_month``/``last_month`` bounds for budgets that never start or end.
+OPEN_START = 0
+OPEN_END = 999912
+DEFAULT_WARN_AT = 90.0
+
+
+def _ordinal(yyyymm: np.ndarray) -> np.ndarray:
+    """Months since year 0, so periods align on ``ordinal // months * months``."""
+    yyyymm = np.asarray(yyyymm, dtype=np.int64)
+    return yyyymm // 100 * 12 + yyyymm % 100 - 1
+
+
+def _yyyymm(ordinal: np.ndarray) -> np.ndarray:
+    return ordinal // 12 * 100 + ordinal % 12 + 1
+
+
+def _month(value: object) -> int:
+    stamp = pd.Timestamp(value)
+    return stamp.year * 100 + stamp.month
+
+
+def _frame(records: list[dict] | dict[str, object]) -> pd.DataFrame:
+    frame = pd.DataFrame(records, columns=BUDGET_COLUMNS)
+    unknown = sorted(set(frame["period"]) - set(PERIOD_MONTHS))
+    if unknown:
+        bad = frame.loc[frame["period"].isin(unknown), "id"].head(5).tolist()
+        raise ValueError(f"Unknown budget period(s) {unknown} on budget(s) {bad}; use {sorted(PERIOD_MONTHS)}")
+    return frame.astype({"allocated_minor": "int64", "first_month": "int64", "last_month": "int64"})
+
+
+def budget_frame(budgets: Iterable[object]) -> pd.DataFrame:
+    """Budget lines from ``BudgetModel`` objects.
+
+    A dataclass budget's ``categories`` split its allocation by ledger
+    account; without categories the whole allocation is charged to the
+    account named like the budget. It applies from ``start_date`` to
+    ``end_date``. A line-item budget (``lines``/``effective_date``) gives
+    one open-ended monthly line per account.
+    """
+    records = []
+    for budget in budgets:
+        if hasattr(budget, "lines"):
+            first = _month(budget.effective_date)
+            for line in budget.lines:
+                records.append(
+                    {
+                        "id": line.account,
+                        "name": line.account,
+                        "account": line.account,
+                        "period": "monthly",
+                        "currency": "USD",
+                        "allocated_minor": to_minor(line.monthly_limit),
+                        "first_month": first,
+                        "last_month": OPEN_END,
+                    }
+                )
+            continue
+        split = budget.categories or {budget.name: budget.allocated}
+        for account, allocated in split.items():
+            records.append(
+                {
+                    "id": budget.id if len(split) == 1 else f"{budget.id}:{account}",
+                    "name": budget.name,
+                    "account": account,
+                    "period": budget.period,
+                    "currency": budget.currency,
+                    "allocated_minor": to_minor(allocated, budget.currency),
+                    "first_month": _month(budget.start_date),
+                    "last_month": _month(budget.end_date),
+                }
+            )
+    return _frame(records)
+
+
+def load_budgets(conn: sqlite3.Connection) -> pd.DataFrame:
+    """Budget lines from the store; budgets without an account have no actuals and are skipped."""
+    rows = conn.execute(
+        "SELECT id, name, account, period, currency, allocated_minor FROM budgets WHERE account IS NOT NULL ORDER BY id"
+    ).fetchall()
+    frame = pd.DataFrame(rows, columns=BUDGET_COLUMNS[:6])
+    return _frame(frame.assign(first_month=OPEN_START, last_month=OPEN_END))
+
+
+def read_budgets(path: Path | str) -> pd.DataFrame:
+    """Budget lines from a CSV with ``id,name,account,period,allocated`` columns.
+
+    ``currency`` (default USD) and ``start_date``/``end_date`` (any date in
+    the first and last month the line applies to) are optional.
+    """
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [column for column in ("id", "name", "account", "period", "allocated") if column not in raw]
+    if missing:
+        raise ValueError(f"{path}: missing budget column(s) {missing}")
+    currency = raw["currency"].replace("", "USD") if "currency" in raw else pd.Series("USD", index=raw.index)
+    allocated = np.zeros(len(raw), dtype=np.int64)
+    for code, rows in raw.groupby(currency, sort=False).groups.items():
+        allocated[raw.index.get_indexer(rows)] = to_minor_array(raw.loc[rows, "allocated"], code)
+
+    def months(column: str, default: int) -> np.ndarray:
+        if column not in raw:
+            return np.full(len(raw), default, dtype=np.int64)
+        stamps = pd.to_datetime(raw[column].replace("", None), format="%Y-%m-%d")
+        return np.where(stamps.isna(), default, stamps.dt.year * 100 + stamps.dt.month).astype(np.int64)
+
+    return _frame(
+        {
+            "id": raw["id"],
+            "name": raw["name"],
+            "account": raw["account"],
+            "period": raw["period"].str.lower(),
+            "currency": currency,
+            "allocated_minor": allocated,
+            "first_month": months("start_date", OPEN_START),
+            "last_month": months("end_date", OPEN_END),
+        }
+    )
+
+
+def ledger_months(conn: sqlite3.Connection) -> tuple[int, int] | None:
+    """First and last yyyymm with rollup rows, or None for an empty store."""
+    first, last = conn.execute("SELECT MIN(month), MAX(month) FROM balance_monthly").fetchone()
+    return None if first is None else (first, last)
+
+
+def monthly_actuals(conn: sqlite3.Connection, first: int, last: int) -> pd.DataFrame:
+    """Net debit cents per account and yyyymm ``month`` between ``first`` and ``last``.
+
+    ``account`` is categorical. The rollup is clustered on (account, month),
+    so accounts are read once with their row counts and the rows themselves
+    come back as plain integers in the same order.
+    """
+    bounds = (first, last)
+    counts = conn.execute(
+        "SELECT account, COUNT(*) FROM balance_monthly WHERE month BETWEEN ? AND ? GROUP BY account ORDER BY account",
+        bounds,
+    ).fetchall()
+    rows = conn.execute(
+        "SELECT month, debit_cents - credit_cents FROM balance_monthly WHERE month BETWEEN ? AND ? ORDER BY account, month",
+        bounds,
+    ).fetchall()
+    accounts = [account for account, _ in counts]
+    codes = np.repeat(np.arange(len(accounts), dtype=np.int32), [count for _, count in counts])
+    values = np.fromiter(itertools.chain.from_iterable(rows), dtype=np.int64, count=2 * len(rows)).reshape(-1, 2)
+    return pd.DataFrame(
+        {
+            "account": pd.Categorical.from_codes(codes, categories=pd.Index(accounts, dtype=object)),
+            "month": values[:, 0],
+            "net_cents": values[:, 1],
+        }
+    )
+
+
+def period_bounds(budgets: pd.DataFrame, start: int, end: int) -> tuple[int, int]:
+    """The yyyymm months actuals are needed for: whole periods overlapping ``start``..``end``."""
+    lengths = [PERIOD_MONTHS[period] for period in set(budgets["period"])] or [1]
+    first, last = _ordinal(np.array([start, end]))
+    first = min(first // months * months for months in lengths)
+    last = max(last // months * months + months - 1 for months in lengths)
+    return int(_yyyymm(first)), int(_yyyymm(last))
+
+
+def compute_variance(
+    budgets: pd.DataFrame,
+    actuals: pd.DataFrame,
+    start: int,
+    end: int,
+    warn_at: float = DEFAULT_WARN_AT,
+) -> pd.DataFrame:
+    """Every budget line in every period overlapping yyyymm ``start``..``end``.
+
+    ``actuals`` is ``monthly_actuals`` output covering ``period_bounds``.
+    ``variance`` is actual minus allocated (positive is overspend) and
+    ``utilization`` is actual as a percentage of allocated (0 for a zero
+    allocation). ``breach`` flags spend over the allocation; ``warning``
+    flags lines at ``warn_at`` percent or more that have not breached.
+    Amounts are in ledger major units; rows are ordered by period start,
+    then by line order in ``budgets``.
+    """
+    if start > end:
+        raise ValueError(f"start {start} is after end {end}")
+    first, last = _ordinal(np.array(period_bounds(budgets, start, end)))
+    span = int(last - first + 1)
+
+    account_codes, accounts = pd.factorize(actuals["account"])
+    offsets = _ordinal(actuals["month"].to_numpy()) - first
+    inside = (offsets >= 0) & (offsets < span)
+    # One spare zero row for budget accounts with no postings (code -1).
+    grid = np.zeros((len(accounts) + 1) * span, dtype=np.int64)
+    np.add.at(grid, account_codes[inside] * span + offsets[inside], actuals["net_cents"].to_numpy()[inside])
+    cumulative = np.zeros((len(accounts) + 1, span + 1), dtype=np.int64)
+    np.cumsum(grid.reshape(len(accounts) + 1, span), axis=1, out=cumulative[:, 1:])
+    line_accounts = pd.Index(accounts).get_indexer(budgets["account"].to_numpy(dtype=object))
+
+    line_first = _ordinal(budgets["first_month"].to_numpy())
+    line_last = _ordinal(budgets["last_month"].to_numpy())
+    period_months = budgets["period"].map(PERIOD_MONTHS).to_numpy(dtype=np.int64)
+    start_ordinal, end_ordinal = _ordinal(np.array([start, end]))
+    lines, starts, lengths = [], [], []
+    for months in sorted(set(period_months)):
+        selected = np.flatnonzero(period_months == months)
+        periods = np.arange(start_ordinal // months * months, end_ordinal // months * months + 1, months)
+        line = np.repeat(selected, len(periods))
+        period = np.tile(periods, len(selected))
+        active = (period <= line_last[line]) & (period + months - 1 >= line_first[line])
+        lines.append(line[active])
+        starts.append(period[active])
+        lengths.append(np.full(int(active.sum()), months, dtype=np.int64))
+    line = np.concatenate(lines) if lines else np.zeros(0, dtype=np.int64)
+    period = np.concatenate(starts) if starts else np.zeros(0, dtype=np.int64)
+    months = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+    order = np.lexsort((line, period))
+    line, period, months = line[order], period[order], months[order]
+
+    row = line_accounts[line]
+    actual = cumulative[row, period + months - first] - cumulative[row, period - first]
+    currencies = budgets["currency"]
+    exponent = currencies.map({code: minor_exponent(code) for code in currencies.unique()}).to_numpy(dtype=np.int64)
+    allocated = np.rint(budgets["allocated_minor"].to_numpy(dtype=np.float64) * 10.0 ** (2 - exponent))
+    allocated = allocated.astype(np.int64)[line]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilization = np.where(allocated != 0, actual / allocated * 100, 0.0)
+    breach = actual > allocated
+    return pd.DataFrame(
+        {
+            "id": budgets["id"].to_numpy(dtype=object)[line],
+            "name": budgets["name"].to_numpy(dtype=object)[line],
+            "account": budgets["account"].to_numpy(dtype=object)[line],
+            "period": budgets["period"].to_numpy(dtype=object)[line],
+            "period_start": _yyyymm(period),
+            "period_end": _yyyymm(period + months - 1),
+            "currency": budgets["currency"].to_numpy(dtype=object)[line],
+            "allocated": allocated / 100,
+            "actual": actual / 100,
+            "variance": (actual - allocated) / 100,
+            "utilization": np.round(utilization, 2),
+            "breach": breach,
+            "warning": ~breach & (utilization >= warn_at),
+        },
+        columns=VARIANCE_COLUMNS,
+    )
+
+
+def store_variance(
+    conn: sqlite3.Connection,
+    start: int | None = None,
+    end: int | None = None,
+    budgets: pd.DataFrame | None = None,
+    warn_at: float = DEFAULT_WARN_AT,
+) -> pd.DataFrame:
+    """``compute_variance`` for the store's budgets (or ``budgets``) against its rollups.
+
+    ``start``/``end`` default to the first and last month in the ledger.
+    """
+    if budgets is None:
+        budgets = load_budgets(conn)
+    if start is None or end is None:
+        extent = ledger_months(conn)
+        if extent is None:
+            return pd.DataFrame(columns=VARIANCE_COLUMNS)
+        start = extent[0] if start is None else start
+        end = extent[1] if end is None else end
+    first, last = period_bounds(budgets, start, end)
+    return compute_variance(budgets, monthly_actuals(conn, first, last), start, end, warn_at)
+
+
+def summary(variance: pd.DataFrame) -> dict[str, object]:
+    return {
+        "lines": int(variance["id"].nunique()),
+        "rows": len(variance),
+        "allocated": round(float(variance["allocated"].sum()), 2),
+        "actual": round(float(variance["actual"].sum()), 2),
+        "breaches": int(variance["breach"].sum()),
+        "warnings": int(variance["warning"].sum()),
+    }
+
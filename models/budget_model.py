@@ -5,6 +5,8 @@ from decimal import Decimal
 from datetime import datetime
 from typing import Literal
 
+from models.money import Money, to_minor
+
 
 @dataclass
 class BudgetModel:
@@ -30,15 +32,24 @@ class BudgetModel:
         if self.categories is None:
             self.categories = {}
     
+    @property
+    def allocated_money(self) -> Money:
+        return Money.of(self.allocated, self.currency)
+    
+    @property
+    def spent_money(self) -> Money:
+        return Money.of(self.spent, self.currency)
+    
     def remaining(self) -> Decimal:
         """Calculate remaining budget."""
-        return self.allocated - self.spent
+        return (self.allocated_money - self.spent_money).to_decimal()
     
     def utilization(self) -> Decimal:
         """Calculate budget utilization percentage."""
-        if self.allocated == 0:
+        allocated = self.allocated_money.minor
+        if allocated == 0:
             return Decimal("0")
-        return (self.spent / self.allocated) * Decimal("100")
+        return Decimal(self.spent_money.minor) / Decimal(allocated) * Decimal("100")
     
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
@@ -79,5 +90,5 @@ class BudgetModel(BaseModel):
         variances: Dict[str, float] = {}
         for account, planned in summary.items():
             actual = actuals.get(account, 0)
-            variances[account] = round(actual - planned, 2)
+            variances[account] = (to_minor(actual) - to_minor(planned)) / 100
         return variances
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import array
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+
+from models.ledger_entry import TransactionEntry
+from models.money import Money, minor_exponent, to_minor
+
+# Shared by every entry without tags or metadata instead of a fresh list and
+# dict per instance.
+EMPTY_TAGS: tuple[str, ...] = ()
+EMPTY_METADATA: Mapping[str, str] = MappingProxyType({})
+ENTRY_TYPES = ("debit", "credit")
+# LedgerBatch.from_entries packs ids into fixed-width arrays this many at a time.
+_ID_CHUNK = 65_536
+
+
+def _tags(tags: Iterable[str] | None) -> tuple[str, ...]:
+    return tuple(sys.intern(tag) for tag in tags) if tags else EMPTY_TAGS
+
+
+def _metadata(metadata: Mapping[str, str] | None) -> Mapping[str, str]:
+    return MappingProxyType(dict(metadata)) if metadata else EMPTY_METADATA
+
+
+def _entry_type(entry_type: str) -> str:
+    if entry_type == "debit":
+        return "debit"
+    if entry_type == "credit":
+        return "credit"
+    raise ValueError(f"entry_type must be debit or credit, got {entry_type}")
+
+
+class CompactEntry:
+    """Memory-lean ``TransactionEntry``: same fields, ``__slots__`` storage.
+
+    The amount is held as integer minor units of ``currency`` (rounded half
+    to even like ``Money.of``), account, currency, category and tags are
+    interned, and entries without tags or metadata share one empty tuple and
+    one empty read-only mapping.
+    """
+
+    __slots__ = (
+        "id",
+        "timestamp",
+        "account",
+        "description",
+        "minor",
+        "currency",
+        "entry_type",
+        "category",
+        "tags",
+        "metadata",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        timestamp: datetime,
+        account: str,
+        description: str,
+        amount: object,
+        currency: str = "USD",
+        entry_type: str = "debit",
+        category: str | None = None,
+        tags: Iterable[str] | None = None,
+        metadata: Mapping[str, str] | None = None,
+    ):
+        self.id = id
+        self.timestamp = timestamp
+        self.account = sys.intern(account)
+        self.description = description
+        self.currency = sys.intern(currency)
+        self.minor = to_minor(amount, currency)
+        self.entry_type = _entry_type(entry_type)
+        self.category = None if category is None else sys.intern(category)
+        self.tags = _tags(tags)
+        self.metadata = _metadata(metadata)
+
+    @classmethod
+    def from_entry(cls, entry: TransactionEntry | CompactEntry | Mapping[str, Any]) -> CompactEntry:
+        """Build from a ``TransactionEntry`` or its ``to_dict`` form."""
+        if isinstance(entry, CompactEntry):
+            return entry
+        if isinstance(entry, Mapping):
+            timestamp = entry["timestamp"]
+            return cls(
+                id=entry["id"],
+                timestamp=datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp,
+                account=entry["account"],
+                description=entry.get("description", ""),
+                amount=entry["amount"],
+                currency=entry.get("currency") or "USD",
+                entry_type=entry.get("entry_type", "debit"),
+                category=entry.get("category"),
+                tags=entry.get("tags"),
+                metadata=entry.get("metadata"),
+            )
+        return cls(
+            entry.id,
+            entry.timestamp,
+            entry.account,
+            entry.description,
+            entry.amount,
+            entry.currency,
+            entry.entry_type,
+            entry.category,
+            entry.tags,
+            entry.metadata,
+        )
+
+    @property
+    def amount(self) -> Decimal:
+        return Decimal(self.minor).scaleb(-minor_exponent(self.currency))
+
+    @property
+    def money(self) -> Money:
+        return Money(self.minor, self.currency)
+
+    def to_entry(self) -> TransactionEntry:
+        return TransactionEntry(
+            id=self.id,
+            timestamp=self.timestamp,
+            account=self.account,
+            description=self.description,
+            amount=self.amount,
+            currency=self.currency,
+            entry_type=self.entry_type,
+            category=self.category,
+            tags=list(self.tags),
+            metadata=dict(self.metadata),
+        )
+
+    def to_dict(self) -> dict:
+        """Same keys and value types as ``TransactionEntry.to_dict``."""
+        return {
+            "id": self.id,
+            "timestamp": self.timestamp.isoformat(),
+            "account": self.account,
+            "description": self.description,
+            "amount": str(self.amount),
+            "currency": self.currency,
+            "entry_type": self.entry_type,
+            "category": self.category,
+            "tags": list(self.tags),
+            "metadata": dict(self.metadata),
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactEntry(id={self.id!r}, timestamp={self.timestamp!r}, account={self.account!r}, "
+            f"amount='{self.money}', currency={self.currency!r}, entry_type={self.entry_type!r})"
+        )
+
+
+class _Dictionary:
+    """Value -> int code, assigning codes in first-seen order."""
+
+    def __init__(self):
+        self.codes: dict[Any, int] = {}
+        self.values: list[Any] = []
+
+    def code(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class LedgerBatch:
+    """Struct-of-arrays container for many ``TransactionEntry``-shaped entries.
+
+    One NumPy column per field instead of one object per entry:
+
+    ``ids``
+        UTF-8 bytes, fixed width (the longest id in the batch).
+    ``timestamps``
+        ``datetime64[us]``; an aware batch is stored in UTC (``utc=True``).
+    ``account_codes``, ``currency_codes``, ``description_codes``, ``category_codes``
+        int32 codes into ``accounts``, ``currencies``, ``descriptions`` and
+        ``categories`` (first-seen order; category code -1 means None).
+    ``minor``
+        int64 amounts in minor units of each row's currency.
+    ``credit``
+        bool, True for credit entries.
+
+    Tags and metadata are kept only for the rows that have them, in
+    ``extras`` keyed by row. Indexing or iterating yields ``CompactEntry``.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        timestamps: np.ndarray,
+        account_codes: np.ndarray,
+        accounts: list[str],
+        description_codes: np.ndarray,
+        descriptions: list[str],
+        minor: np.ndarray,
+        currency_codes: np.ndarray,
+        currencies: list[str],
+        credit: np.ndarray,
+        category_codes: np.ndarray,
+        categories: list[str],
+        extras: dict[int, tuple[tuple[str, ...], Mapping[str, str]]] | None = None,
+        utc: bool = False,
+    ):
+        self.ids = ids
+        self.timestamps = timestamps
+        self.account_codes = account_codes
+        self.accounts = accounts
+        self.description_codes = description_codes
+        self.descriptions = descriptions
+        self.minor = minor
+        self.currency_codes = currency_codes
+        self.currencies = currencies
+        self.credit = credit
+        self.category_codes = category_codes
+        self.categories = categories
+        self.extras = extras or {}
+        self.utc = utc
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[TransactionEntry | CompactEntry | Mapping[str, Any]]) -> LedgerBatch:
+        """Pack entries column by column without keeping an object per entry.
+
+        Timestamps must be all naive or all timezone-aware.
+        """
+        accounts, descriptions, currencies, categories = _Dictionary(), _Dictionary(), _Dictionary(), _Dictionary()
+        account_codes, description_codes = array.array("i"), array.array("i")
+        currency_codes, category_codes = array.array("i"), array.array("i")
+        timestamps, minor = array.array("q"), array.array("q")
+        credit = bytearray()
+        id_chunks: list[np.ndarray] = []
+        pending_ids: list[bytes] = []
+        extras: dict[int, tuple[tuple[str, ...], Mapping[str, str]]] = {}
+        epoch = None
+        for row, entry in enumerate(entries):
+            entry = CompactEntry.from_entry(entry)
+            aware = entry.timestamp.tzinfo is not None
+            if epoch is None:
+                epoch = datetime(1970, 1, 1, tzinfo=timezone.utc if aware else None)
+            elif aware != (epoch.tzinfo is not None):
+                raise ValueError("LedgerBatch timestamps must be all naive or all timezone-aware")
+            delta = entry.timestamp - epoch
+            timestamps.append((delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds)
+            pending_ids.append(entry.id.encode())
+            if len(pending_ids) == _ID_CHUNK:
+                id_chunks.append(np.array(pending_ids, dtype=bytes))
+                pending_ids = []
+            account_codes.append(accounts.code(entry.account))
+            description_codes.append(descriptions.code(entry.description))
+            minor.append(entry.minor)
+            currency_codes.append(currencies.code(entry.currency))
+            credit.append(entry.entry_type == "credit")
+            category_codes.append(-1 if entry.category is None else categories.code(entry.category))
+            if entry.tags or entry.metadata:
+                extras[row] = (entry.tags, entry.metadata)
+        if pending_ids or not id_chunks:
+            id_chunks.append(np.array(pending_ids, dtype=bytes))
+        return cls(
+            ids=np.concatenate(id_chunks),
+            timestamps=np.frombuffer(timestamps, dtype=np.int64).astype("datetime64[us]"),
+            account_codes=np.frombuffer(account_codes, dtype=np.int32).copy(),
+            accounts=accounts.values,
+            description_codes=np.frombuffer(description_codes, dtype=np.int32).copy(),
+            descriptions=descriptions.values,
+            minor=np.frombuffer(minor, dtype=np.int64).copy(),
+            currency_codes=np.frombuffer(currency_codes, dtype=np.int32).copy(),
+            currencies=currencies.values,
+            credit=np.frombuffer(bytes(credit), dtype=np.bool_).copy(),
+            category_codes=np.frombuffer(category_codes, dtype=np.int32).copy(),
+            categories=categories.values,
+            extras=extras,
+            utc=epoch is not None and epoch.tzinfo is not None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.minor)
+
+    def __getitem__(self, row: int) -> CompactEntry:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("LedgerBatch index out of range")
+        timestamp = self.timestamps[row].item()
+        if self.utc:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        currency = self.currencies[self.currency_codes[row]]
+        category = self.category_codes[row]
+        tags, metadata = self.extras.get(row, (None, None))
+        return CompactEntry(
+            self.ids[row].decode(),
+            timestamp,
+            self.accounts[self.account_codes[row]],
+            self.descriptions[self.description_codes[row]],
+            Money(self.minor[row], currency),
+            currency,
+            "credit" if self.credit[row] else "debit",
+            None if category < 0 else self.categories[category],
+            tags,
+            metadata,
+        )
+
+    def __iter__(self) -> Iterator[CompactEntry]:
+        return (self[row] for row in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns (the small dictionaries and extras excluded)."""
+        return sum(
+            column.nbytes
+            for column in (
+                self.ids,
+                self.timestamps,
+                self.account_codes,
+                self.description_codes,
+                self.minor,
+                self.currency_codes,
+                self.credit,
+                self.category_codes,
+            )
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per entry, with categorical account, currency and entry_type columns.
+
+        ``signed_minor`` is the amount with debits positive and credits
+        negative, in minor units of the row's currency.
+        """
+        frame = pd.DataFrame(
+            {
+                "id": np.char.decode(self.ids),
+                "timestamp": self.timestamps,
+                "account": pd.Categorical.from_codes(self.account_codes, self.accounts),
+                "description": np.asarray(self.descriptions, dtype=object)[self.description_codes]
+                if self.descriptions
+                else np.empty(0, dtype=object),
+                "minor": self.minor,
+                "currency": pd.Categorical.from_codes(self.currency_codes, self.currencies),
+                "entry_type": pd.Categorical.from_codes(self.credit.astype(np.int8), list(ENTRY_TYPES)),
+                "signed_minor": np.where(self.credit, -self.minor, self.minor),
+            }
+        )
+        if self.utc:
+            frame["timestamp"] = frame["timestamp"].dt.tz_localize("UTC")
+        return frame
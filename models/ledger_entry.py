@@ -5,10 +5,12 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Literal
 
+from models.money import Money, to_minor_array
+
 
 @dataclass
-class LedgerEntry:
-    """Represents a financial ledger entry."""
+class TransactionEntry:
+    """A transaction as payment processors post it to ``lib.ingest``."""
     
     id: str
     timestamp: datetime
@@ -32,6 +34,11 @@ class LedgerEntry:
         if self.metadata is None:
             self.metadata = {}
     
+    @property
+    def money(self) -> Money:
+        """The amount as exact integer minor units in ``currency``."""
+        return Money.of(self.amount, self.currency)
+
     def to_dict(self) -> dict:
         """Convert to dictionary representation."""
         return {
@@ -45,9 +52,13 @@ class LedgerEntry:
             "category": self.category,
             "tags": self.tags,
             "metadata": self.metadata,
+        }
+
+
 from datetime import date
 from typing import Optional
 
+import pandas as pd
 from pydantic import BaseModel, Field, validator
 
 
@@ -78,20 +89,38 @@ class LedgerEntry(BaseModel):
 
 class LedgerFile(BaseModel):
     name: str
-    entries: list[LedgerEntry]
+    entries: list[LedgerEntry] = Field(default_factory=list)
+    # Typed DataFrame (date, account, debit, credit, description) produced by
+    # lib.csv_utils.read_ledger_frame; when set, totals are computed per column
+    # and ``entries`` stays empty.
+    columns: Optional[pd.DataFrame] = Field(None, description="Columnar ledger frame")
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def entry_count(self) -> int:
+        if self.columns is not None:
+            return len(self.columns)
+        return len(self.entries)
+
+    def _total_cents(self, column: str) -> int:
+        # Summed as integer cents so totals do not drift the way float sums do.
+        if self.columns is not None:
+            return int(to_minor_array(self.columns[column]).sum())
+        return int(to_minor_array([getattr(e, column) or 0.0 for e in self.entries]).sum())
 
     def total_debits(self) -> float:
-        return sum(e.debit or 0 for e in self.entries)
+        return self._total_cents("debit") / 100
 
     def total_credits(self) -> float:
-        return sum(e.credit or 0 for e in self.entries)
+        return self._total_cents("credit") / 100
 
     def imbalance(self) -> float:
-        return round(self.total_debits() - self.total_credits(), 2)
+        return (self._total_cents("debit") - self._total_cents("credit")) / 100
 
     def summary(self) -> dict[str, float]:
         return {
-            "entries": len(self.entries),
+            "entries": self.entry_count(),
             "debits": self.total_debits(),
             "credits": self.total_credits(),
             "imbalance": self.imbalance(),
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import math
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Iterable
+
+import numpy as np
+
+# ISO 4217 minor-unit exponents that differ from the usual two decimals.
+MINOR_UNITS: dict[str, int] = {
+    "BHD": 3,
+    "CLP": 0,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "OMR": 3,
+    "TND": 3,
+    "VND": 0,
+}
+
+# Strings and floats with at most this many significant digits convert through
+# float exactly, well inside the 2**53 integer range of a double.
+_FAST_PATH_DIGITS = 15
+# Minor units are stored as SQLite INTEGER and NumPy int64.
+_MINOR_LIMIT = 2**63
+
+
+def minor_exponent(currency: str) -> int:
+    return MINOR_UNITS.get(currency, 2)
+
+
+def _in_range(minor: int, value: object) -> int:
+    if not -_MINOR_LIMIT <= minor < _MINOR_LIMIT:
+        raise ValueError(f"Amount out of range: {value!r}")
+    return minor
+
+
+def to_minor(value: object, currency: str = "USD") -> int:
+    """Convert a major-unit amount (str, int, float, Decimal or Money) to integer minor units.
+
+    Amounts with more precision than the currency allows are rounded half to
+    even. Plain decimal strings and floats take a float fast path; anything
+    longer or in exponent notation goes through ``Decimal``. Unparseable,
+    non-finite and out-of-int64-range amounts raise ``ValueError``.
+    """
+    if isinstance(value, Money):
+        return value.minor
+    original = value
+    exponent = minor_exponent(currency)
+    if isinstance(value, int):
+        return _in_range(value * 10**exponent, value)
+    if isinstance(value, float):
+        if value != value or value in (float("inf"), float("-inf")):
+            raise ValueError(f"Invalid amount: {value!r}")
+        if abs(value) < 10 ** (_FAST_PATH_DIGITS - exponent):
+            return round(value * 10**exponent)
+        value = repr(value)
+    if isinstance(value, str):
+        text = value.strip()
+        point = text.find(".")
+        decimals = 0 if point < 0 else len(text) - point - 1
+        if (
+            text
+            and decimals <= exponent
+            and len(text) <= _FAST_PATH_DIGITS
+            and "e" not in text
+            and "E" not in text
+        ):
+            try:
+                number = float(text)
+            except ValueError:
+                pass
+            else:
+                if math.isfinite(number):
+                    return round(number * 10**exponent)
+        try:
+            value = Decimal(text)
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount: {original!r}") from None
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"Invalid amount: {original!r}")
+        return _in_range(int(value.scaleb(exponent).to_integral_value(rounding=ROUND_HALF_EVEN)), original)
+    raise TypeError(f"Unsupported amount type: {type(value).__name__}")
+
+
+def to_minor_array(amounts: object, currency: str = "USD") -> np.ndarray:
+    """Vectorized ``to_minor``: an int64 array of minor units.
+
+    Accepts numeric arrays and Series as well as sequences of strings, floats
+    or Decimals, which NumPy parses in C. Numeric arrays are rounded to the
+    nearest minor unit. For sequences and object arrays, elements with more
+    precision than the currency allows (or too many digits for an exact
+    double) are re-converted one by one through ``to_minor``, so the result
+    always matches it.
+    """
+    scale = 10 ** minor_exponent(currency)
+    if hasattr(amounts, "dtype"):
+        source = amounts.to_numpy() if hasattr(amounts, "to_numpy") else amounts
+        exact_input = source.dtype.kind in "biuf"
+    else:
+        source = amounts if isinstance(amounts, (list, tuple)) else list(amounts)
+        exact_input = False
+    values = np.asarray(source, dtype=np.float64)
+    if not np.isfinite(values).all():
+        raise ValueError("Amounts must be finite")
+    scaled = values * scale
+    minor = np.rint(scaled)
+    if not exact_input:
+        inexact = (np.abs(scaled - minor) > 1e-6) | (np.abs(values) >= 10 ** (_FAST_PATH_DIGITS - 2))
+        for index in np.flatnonzero(inexact):
+            item = source[index]
+            minor[index] = to_minor(item.item() if isinstance(item, np.generic) else item, currency)
+    if len(minor) and np.abs(minor).max() >= _MINOR_LIMIT:
+        raise ValueError("Amounts out of range")
+    return minor.astype(np.int64)
+
+
+def from_minor_array(minor: np.ndarray, currency: str = "USD") -> np.ndarray:
+    return np.asarray(minor, dtype=np.int64) / 10 ** minor_exponent(currency)
+
+
+class Money:
+    """Exact fixed-point amount: integer minor units plus an ISO currency code.
+
+    Arithmetic is integer arithmetic on ``minor``; mixing currencies raises
+    ``ValueError``. Hot loops should accumulate ``minor`` ints (or int64
+    arrays via ``to_minor_array``) and wrap the result once.
+    """
+
+    __slots__ = ("minor", "currency")
+
+    def __init__(self, minor: int, currency: str = "USD"):
+        self.minor = int(minor)
+        self.currency = currency
+
+    @classmethod
+    def of(cls, value: object, currency: str = "USD") -> Money:
+        """Build from a major-unit amount such as ``"12.34"`` or ``Decimal("12.34")``."""
+        if isinstance(value, Money):
+            return value
+        return cls(to_minor(value, currency), currency)
+
+    @classmethod
+    def zero(cls, currency: str = "USD") -> Money:
+        return cls(0, currency)
+
+    @classmethod
+    def sum(cls, values: Iterable[Money], currency: str = "USD") -> Money:
+        total = 0
+        for value in values:
+            if value.currency != currency:
+                raise ValueError(f"Cannot sum {value.currency} into {currency}")
+            total += value.minor
+        return cls(total, currency)
+
+    def _check(self, other: Money) -> None:
+        if self.currency != other.currency:
+            raise ValueError(f"Currency mismatch: {self.currency} vs {other.currency}")
+
+    def __add__(self, other: Money) -> Money:
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._check(other)
+        return Money(self.minor + other.minor, self.currency)
+
+    def __radd__(self, other: object) -> Money:
+        # Lets builtin sum() start from 0.
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other: Money) -> Money:
+        if not isinstance(other, Money):
+            return NotImplemented
+        self._check(other)
+        return Money(self.minor - other.minor, self.currency)
+
+    def __neg__(self) -> Money:
+        return Money(-self.minor, self.currency)
+
+    def __abs__(self) -> Money:
+        return Money(abs(self.minor), self.currency)
+
+    def __mul__(self, factor: int) -> Money:
+        if not isinstance(factor, int):
+            return NotImplemented
+        return Money(self.minor * factor, self.currency)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.minor == other.minor and self.currency == other.currency
+
+    def __lt__(self, other: Money) -> bool:
+        self._check(other)
+        return self.minor < other.minor
+
+    def __le__(self, other: Money) -> bool:
+        self._check(other)
+        return self.minor <= other.minor
+
+    def __gt__(self, other: Money) -> bool:
+        self._check(other)
+        return self.minor > other.minor
+
+    def __ge__(self, other: Money) -> bool:
+        self._check(other)
+        return self.minor >= other.minor
+
+    def __hash__(self) -> int:
+        return hash((self.minor, self.currency))
+
+    def __bool__(self) -> bool:
+        return self.minor != 0
+
+    def to_decimal(self) -> Decimal:
+        return Decimal(self.minor).scaleb(-minor_exponent(self.currency))
+
+    def __float__(self) -> float:
+        return self.minor / 10 ** minor_exponent(self.currency)
+
+    def __str__(self) -> str:
+        exponent = minor_exponent(self.currency)
+        if exponent == 0:
+            return str(self.minor)
+        sign = "-" if self.minor < 0 else ""
+        whole, frac = divmod(abs(self.minor), 10**exponent)
+        return f"{sign}{whole}.{frac:0{exponent}d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}', '{self.currency}')"
+
+    def __reduce__(self):
+        return (Money, (self.minor, self.currency))
@@ -0,0 +1,77 @@
+"""Benchmark per-event cost of the budget monitor as the number of budgets grows.
+
+Watches one monthly budget per account, then charges a month of synthetic
+ledger entries (dicts as ``br_fin.py ingest`` reads them) through
+``BudgetMonitor.observe`` and ``flush``, with a Reporter that only counts
+posts. Per-event time should stay flat whatever the budget count.
+
+Usage: python scripts/bench_budget_monitor.py [--events 1000000] [--budgets 1000 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib.budget_monitor import BudgetMonitor  # noqa: E402
+
+
+class CountingReporter:
+    def __init__(self) -> None:
+        self.posts = 0
+
+    def post(self, channel: str, message: str) -> None:
+        self.posts += 1
+
+
+def entries(count: int, accounts: int, seed: int = 5) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    days = np.sort(rng.integers(1, 31, count))
+    codes = rng.integers(0, accounts, count)
+    amounts = np.round(rng.uniform(1, 200, count), 2)
+    return [
+        {
+            "timestamp": f"2025-11-{day:02d}T12:00:00",
+            "account": f"Account {code:05d}",
+            "amount": f"{amount:.2f}",
+            "entry_type": "debit",
+        }
+        for day, code, amount in zip(days.tolist(), codes.tolist(), amounts.tolist())
+    ]
+
+
+def run(budgets: int, events: list[dict]) -> None:
+    reporter = CountingReporter()
+    monitor = BudgetMonitor(reporter, debounce_seconds=1.0)
+    for i in range(budgets):
+        monitor.watch(f"budget-{i:05d}", round(len(events) / budgets * 100, 2), accounts=[f"Account {i:05d}"], as_of="2025-11-01")
+    start = time.perf_counter()
+    for entry in events:
+        monitor.observe(entry)
+        monitor.flush()
+    monitor.flush(force=True)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {budgets:>7,} budgets  {elapsed:6.2f}s  {elapsed / len(events) * 1e6:6.2f} us/event  "
+        f"{len(events) / elapsed:10,.0f} events/s  {reporter.posts:,} posts  {monitor.summary()}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1_000, 50_000])
+    args = parser.parse_args()
+    print(f"{args.events:,} events")
+    for budgets in args.budgets:
+        run(budgets, entries(args.events, budgets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark calls answered by the warm daemon against cold CLI runs.
+
+Builds a synthetic ledger store, starts ``FinanceDaemon`` in this process and
+times direct RPC calls, then ``br_fin.py`` subprocesses with and without the
+daemon to forward to.
+
+Usage: python scripts/bench_daemon.py [--rows 1000000] [--accounts 500] [--calls 200]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import ledger_store  # noqa: E402
+from lib.daemon import FinanceDaemon  # noqa: E402
+from lib.daemon_client import find_daemon  # noqa: E402
+
+
+def write_ledger(path: Path, rows: int, accounts: int, seed: int = 7) -> None:
+    rng = np.random.default_rng(seed)
+    amounts = np.round(rng.uniform(1, 5000, rows), 2)
+    is_debit = rng.random(rows) < 0.5
+    pd.DataFrame(
+        {
+            "date": (pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D")).strftime(
+                "%Y-%m-%d"
+            ),
+            "account": np.array([f"Account {i:04d}" for i in range(accounts)])[rng.integers(0, accounts, rows)],
+            "debit": np.where(is_debit, amounts, 0.0),
+            "credit": np.where(is_debit, 0.0, amounts),
+            "description": "synthetic",
+        }
+    ).to_csv(path, index=False)
+
+
+def timed_ms(func, calls: int) -> float:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        (workdir / "ledgers").mkdir()
+        write_ledger(workdir / "ledgers" / "synthetic.csv", args.rows, args.accounts)
+        db_path = workdir / ".tmp-ledgers.db"
+        conn = ledger_store.connect(db_path)
+        ledger_store.import_directory(conn, workdir / "ledgers")
+        conn.close()
+        ledger_store.StoreBudgetService(db_path).put_budget("budget-001", "Ops", Decimal("100000"), "monthly")
+
+        start = time.perf_counter()
+        daemon = FinanceDaemon(db_path)
+        print(f"{args.rows:,} rows, {args.accounts} accounts; warm-up {time.perf_counter() - start:.2f}s")
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        while find_daemon(db_path) is None:
+            time.sleep(0.05)
+        client = find_daemon(db_path)
+
+        print(f"{'call':<44} {'median':>10}")
+        rpc = {
+            "rpc check_budget": lambda: client.call("check_budget", budget_id="budget-001", amount="5000"),
+            "rpc balances (trial balance)": lambda: client.call("balances"),
+            "rpc balances (one account, one month)": lambda: client.call(
+                "balances", accounts=["Account 0001"], start=20250301, end=20250331
+            ),
+            "rpc forecast (memoized)": lambda: client.call("forecast", horizon=3),
+        }
+        for label, call in rpc.items():
+            print(f"{label:<44} {timed_ms(call, args.calls):8.2f}ms")
+
+        command = [sys.executable, str(ROOT / "br_fin.py"), "run", "budgeteer", "check", "budget-001", "5000"]
+        runs = max(5, args.calls // 20)
+        modes = {"forwarded": [], "--no-daemon": ["--no-daemon"]}
+        for mode, extra in modes.items():
+            label = f"cli run budgeteer check ({mode})"
+            argv = command[:2] + extra + command[2:]
+            elapsed = timed_ms(lambda: subprocess.run(argv, check=True, stdout=subprocess.DEVNULL, cwd=workdir), runs)
+            print(f"{label:<44} {elapsed:8.2f}ms")
+
+        client.call("shutdown")
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
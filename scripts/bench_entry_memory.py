@@ -0,0 +1,105 @@
+"""Measure memory per million ledger entries for each in-memory representation.
+
+Builds the same synthetic entries, parsed from JSON-shaped dicts the way
+``br_fin.py ingest`` receives them, as ``TransactionEntry`` dataclasses,
+pydantic CSV-row ``LedgerEntry`` models, ``CompactEntry`` objects and one
+``LedgerBatch``. Reports the memory each retains, traced with
+``tracemalloc``, scaled to one million entries.
+
+Usage: python scripts/bench_entry_memory.py [--entries 1000000] [--accounts 500]
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from models.compact_entry import CompactEntry, LedgerBatch  # noqa: E402
+from models.ledger_entry import LedgerEntry, TransactionEntry  # noqa: E402
+
+DESCRIPTIONS = ["Payroll", "SaaS subscription", "Office rent", "Travel", "Card settlement"]
+
+
+def raw_entries(count: int, accounts: int) -> Iterator[dict]:
+    for i in range(count):
+        yield {
+            "id": f"tx-{i:010d}",
+            "timestamp": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00",
+            "account": f"Account {i % accounts:04d}",
+            "description": DESCRIPTIONS[i % len(DESCRIPTIONS)],
+            "amount": f"{i % 5000 + 1}.{i % 100:02d}",
+            "currency": "USD",
+            "entry_type": "credit" if i % 3 == 0 else "debit",
+        }
+
+
+def transaction_entry(raw: dict) -> TransactionEntry:
+    return TransactionEntry(
+        id=raw["id"],
+        timestamp=datetime.fromisoformat(raw["timestamp"]),
+        account=raw["account"],
+        description=raw["description"],
+        amount=Decimal(raw["amount"]),
+        currency=raw["currency"],
+        entry_type=raw["entry_type"],
+    )
+
+
+def csv_row_entry(raw: dict) -> LedgerEntry:
+    side = "credit" if raw["entry_type"] == "credit" else "debit"
+    return LedgerEntry(
+        date=raw["timestamp"][:10], account=raw["account"], description=raw["description"], **{side: raw["amount"]}
+    )
+
+
+def measure(label: str, build: Callable[[], object], count: int, baseline: float | None) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    per_million = retained / count * 1_000_000 / 2**20
+    ratio = "" if baseline is None else f"  {baseline / per_million:5.1f}x smaller"
+    print(f"  {label:<28} {per_million:8,.0f} MiB/M entries  built in {elapsed:6.2f}s{ratio}")
+    return per_million
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--accounts", type=int, default=500)
+    args = parser.parse_args()
+    count, accounts = args.entries, args.accounts
+
+    print(f"{count:,} entries, {accounts} accounts")
+    baseline = measure(
+        "TransactionEntry (dataclass)",
+        lambda: [transaction_entry(raw) for raw in raw_entries(count, accounts)],
+        count,
+        None,
+    )
+    measure("LedgerEntry (pydantic)", lambda: [csv_row_entry(raw) for raw in raw_entries(count, accounts)], count, None)
+    measure(
+        "CompactEntry",
+        lambda: [CompactEntry.from_entry(raw) for raw in raw_entries(count, accounts)],
+        count,
+        baseline,
+    )
+    measure("LedgerBatch", lambda: LedgerBatch.from_entries(raw_entries(count, accounts)), count, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark live ingest: group commit against one commit per entry.
+
+Appends synthetic ``TransactionEntry`` records to a fresh ledger store with a
+budget on every account, first through ``LedgerWriter`` and then by calling
+``ledger_store.append_entries`` once per entry on a ``synchronous = FULL``
+connection, and reports entries per second for each.
+
+Usage: python scripts/bench_ingest.py [--entries 100000] [--accounts 50] [--batch-size 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import ledger_store  # noqa: E402
+from lib.ingest import LedgerWriter, ledger_row  # noqa: E402
+from models.ledger_entry import TransactionEntry  # noqa: E402
+
+
+def make_entries(count: int, accounts: int) -> list[TransactionEntry]:
+    start = datetime(2025, 1, 1)
+    return [
+        TransactionEntry(
+            id=f"tx-{i}",
+            timestamp=start + timedelta(minutes=i),
+            account=f"Account {i % accounts:03d}",
+            description="synthetic",
+            amount=Decimal(i % 5000 + 1) / 100,
+            entry_type="credit" if i % 3 == 0 else "debit",
+        )
+        for i in range(count)
+    ]
+
+
+def new_store(directory: Path, name: str, accounts: int) -> Path:
+    db_path = directory / name
+    budgets = ledger_store.StoreBudgetService(db_path)
+    for i in range(accounts):
+        budgets.put_budget(f"budget-{i:03d}", f"Account {i:03d}", Decimal("1000000"), "monthly", account=f"Account {i:03d}")
+    return db_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=2_000)
+    parser.add_argument("--single-entries", type=int, default=500, help="Entries for the one-commit-each run")
+    args = parser.parse_args()
+    entries = make_entries(args.entries, args.accounts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        db_path = new_store(directory, "grouped.db", args.accounts)
+        start = time.perf_counter()
+        with LedgerWriter(db_path, batch_size=args.batch_size) as writer:
+            for entry in entries:
+                writer.append(entry)
+            writer.flush()
+        elapsed = time.perf_counter() - start
+        print(
+            f"group commit (batch {args.batch_size}): {args.entries:,} entries in {elapsed:.2f}s "
+            f"= {args.entries / elapsed:,.0f}/s over {writer.stats.batches} commits"
+        )
+
+        db_path = new_store(directory, "single.db", args.accounts)
+        conn = ledger_store.connect(db_path)
+        conn.execute("PRAGMA synchronous = FULL")
+        count = min(args.single_entries, args.entries)
+        start = time.perf_counter()
+        for entry in entries[:count]:
+            ledger_store.append_entries(conn, [ledger_row(entry)])
+        elapsed = time.perf_counter() - start
+        conn.close()
+        print(f"one commit per entry:        {count:,} entries in {elapsed:.2f}s = {count / elapsed:,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark the streaming journal validator against a sort-based check.
+
+Writes a synthetic ledger of two-line transactions (with a few unbalanced,
+single-line and duplicated ones), then times ``journal.validate_ledgers``
+and a baseline that loads the whole file, sorts it by transaction and
+compares totals, reporting the peak traced memory of each.
+
+Usage: python scripts/bench_journal.py [--transactions 2000000] [--chunk-size 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import csv_utils, journal  # noqa: E402
+from models.money import to_minor_array  # noqa: E402
+
+
+def write_ledger(path: Path, transactions: int, seed: int = 7) -> None:
+    rng = np.random.default_rng(seed)
+    dates = (pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, transactions), unit="D")).strftime(
+        "%Y-%m-%d"
+    )
+    amounts = np.round(rng.uniform(1, 5000, transactions), 2)
+    descriptions = np.char.add("Invoice ", np.arange(transactions).astype(str))
+    debit = pd.DataFrame({"date": dates, "account": "Receivables", "debit": amounts, "credit": "", "description": descriptions})
+    credit = debit.assign(account="Revenue", debit="", credit=amounts)
+    # Every thousandth transaction is short a cent.
+    credit.loc[::1000, "credit"] = amounts[::1000] - 0.01
+    frame = pd.concat([debit, credit]).sort_index(kind="stable")
+    frame = pd.concat([frame, frame.iloc[:10]], ignore_index=True)
+    frame.to_csv(path, index=False)
+
+
+def sorted_check(path: Path) -> dict[str, int]:
+    frame = csv_utils.read_ledger_frame(path).columns
+    frame = frame.assign(debit=to_minor_array(frame["debit"]), credit=to_minor_array(frame["credit"]))
+    frame = frame.sort_values(["date", "description"], kind="stable")
+    totals = frame.groupby(["date", "description"], sort=True).agg(
+        debit=("debit", "sum"), credit=("credit", "sum"), lines=("debit", "size")
+    )
+    return {
+        "transactions": len(totals),
+        "unbalanced": int(((totals["lines"] > 1) & (totals["debit"] != totals["credit"])).sum()),
+        "duplicates": int(frame.duplicated().sum()),
+    }
+
+
+def timed(label: str, func) -> None:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    # Traced separately: tracemalloc slows object-heavy pandas code unevenly.
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<28} {elapsed:7.2f}s  peak {peak / 2**20:7,.0f} MiB  {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transactions", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "journal.csv"
+        write_ledger(path, args.transactions)
+        print(f"{args.transactions:,} transactions, {path.stat().st_size / 2**20:,.0f} MiB of CSV")
+        timed("streaming hash grouping", lambda: journal.validate_ledgers([path], args.chunk_size).summary())
+        timed("load, sort and group", lambda: sorted_check(path))
+
+
+if __name__ == "__main__":
+    main()
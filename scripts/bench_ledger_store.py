@@ -0,0 +1,135 @@
+"""Benchmark the ledger store against the original untyped, unindexed layout.
+
+Usage: python scripts/bench_ledger_store.py [--rows 10000000] [--accounts 500]
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import ledger_store  # noqa: E402
+
+
+def synthetic_ledger(rows: int, accounts: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    amounts = np.round(rng.uniform(1, 5000, rows), 2)
+    is_debit = rng.random(rows) < 0.5
+    return pd.DataFrame(
+        {
+            "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D"),
+            "account": pd.Series([f"Account {i:04d}" for i in range(accounts)]).to_numpy()[
+                rng.integers(0, accounts, rows)
+            ],
+            "debit": np.where(is_debit, amounts, 0.0),
+            "credit": np.where(is_debit, 0.0, amounts),
+            "description": "synthetic",
+        }
+    )
+
+
+def timed(label: str, func) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<36} {elapsed:8.2f}s")
+    return elapsed
+
+
+def bench_legacy(path: Path, frame: pd.DataFrame, account: str) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE ledger (date TEXT, account TEXT, debit REAL, credit REAL, description TEXT)"
+    )
+    legacy = frame.assign(date=frame["date"].dt.strftime("%Y-%m-%d"))
+    timed("load (to_sql, no index)", lambda: legacy.to_sql("ledger", conn, if_exists="append", index=False))
+    timed(
+        "one account, one month",
+        lambda: conn.execute(
+            "SELECT SUM(debit - credit) FROM ledger WHERE account = ? AND date BETWEEN ? AND ?",
+            (account, "2025-03-01", "2025-03-31"),
+        ).fetchall(),
+    )
+    timed(
+        "one account, monthly series",
+        lambda: conn.execute(
+            "SELECT SUBSTR(date, 1, 7), SUM(debit - credit) FROM ledger WHERE account = ? GROUP BY 1",
+            (account,),
+        ).fetchall(),
+    )
+    timed(
+        "forecast input (all rows to pandas)",
+        lambda: pd.read_sql_query("SELECT debit, credit FROM ledger", conn),
+    )
+    conn.close()
+
+
+def bench_store(path: Path, frame: pd.DataFrame, account: str) -> None:
+    conn = ledger_store.connect(path)
+
+    def load() -> None:
+        with conn:
+            file_id = ledger_store._record(
+                conn, ledger_store.ManifestEntry("synthetic.csv", 0, 0.0, "", len(frame))
+            )
+            ledger_store._insert_rows(conn, frame, file_id)
+
+    timed("load (typed, indexed, WAL)", load)
+    timed(
+        "one account, one month",
+        lambda: conn.execute(
+            "SELECT SUM(debit_cents - credit_cents) FROM ledger WHERE account = ? AND date BETWEEN ? AND ?",
+            (account, 20250301, 20250331),
+        ).fetchall(),
+    )
+    timed(
+        "one account, monthly series",
+        lambda: conn.execute(
+            "SELECT date / 100, SUM(debit_cents - credit_cents) FROM ledger WHERE account = ? GROUP BY 1",
+            (account,),
+        ).fetchall(),
+    )
+    timed("forecast input (monthly_net)", lambda: ledger_store.monthly_net(conn))
+    month_scan = "SELECT COUNT(*), SUM(debit_cents - credit_cents) FROM {table} WHERE date BETWEEN ? AND ?"
+    timed(
+        "month scan, every partition (view)",
+        lambda: conn.execute(month_scan.format(table="ledger"), (20250301, 20250331)).fetchall(),
+    )
+    timed(
+        "month scan, pruned to its partition",
+        lambda: conn.execute(
+            month_scan.format(table=ledger_store.partition_table(202503)), (20250301, 20250331)
+        ).fetchall(),
+    )
+    timed("one account, one month (read_rows)", lambda: ledger_store.read_rows(conn, account, 20250301, 20250331))
+    ledger_store.close_month(conn, 202503)
+    timed("compact one closed month", lambda: ledger_store.compact_month(conn, 202503))
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--accounts", type=int, default=500)
+    args = parser.parse_args()
+
+    frame = synthetic_ledger(args.rows, args.accounts)
+    account = frame["account"].iloc[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"legacy layout, {args.rows:,} rows")
+        bench_legacy(Path(tmp) / "legacy.db", frame, account)
+        print(f"ledger_store schema v{ledger_store.SCHEMA_VERSION}, {args.rows:,} rows")
+        bench_store(Path(tmp) / "store.db", frame, account)
+
+
+if __name__ == "__main__":
+    main()
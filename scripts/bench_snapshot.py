@@ -0,0 +1,82 @@
+"""Benchmark the memory-mapped snapshot against SQLite and CSV parsing.
+
+Loads synthetic rows into a fresh ledger store, writes its snapshot, and
+times opening it, a summary, per-account totals and the monthly forecast
+input on the mapped columns against the same results from the store and
+from ``csv_utils`` reading a CSV export of a slice of the rows.
+
+Usage: python scripts/bench_snapshot.py [--rows 10000000] [--accounts 500] [--csv-rows 1000000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import csv_utils, forecast_engine, ledger_store, snapshot  # noqa: E402
+from scripts.bench_ledger_store import synthetic_ledger  # noqa: E402
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<40} {elapsed * 1000:10.1f}ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--csv-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    frame = synthetic_ledger(args.rows, args.accounts)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        db_path = directory / "store.db"
+        conn = ledger_store.connect(db_path)
+        with conn:
+            file_id = ledger_store._record(
+                conn, ledger_store.ManifestEntry("synthetic.csv", 0, 0.0, "", len(frame))
+            )
+            ledger_store._insert_rows(conn, frame, file_id)
+            ledger_store._bump_generation(conn)
+        path = snapshot.snapshot_path(db_path)
+        print(f"{args.rows:,} rows, {args.accounts} accounts")
+        timed("write snapshot", lambda: snapshot.write_snapshot(conn, path))
+        print(f"  snapshot size {path.stat().st_size / 2**20:,.0f} MiB")
+
+        print("snapshot (mmap)")
+        mapped = timed("open", lambda: snapshot.open_snapshot(path))
+        timed("summary", mapped.summary)
+        timed("aggregate_balances", mapped.aggregate_balances)
+        timed("forecast input (monthly net series)", lambda: forecast_engine.net_series(mapped.balances("month")))
+        timed("one month, all accounts", lambda: mapped.balances(start=20250301, end=20250331))
+        mapped.close()
+
+        print("SQLite store")
+        timed(
+            "summary (SUM over ledger)",
+            lambda: conn.execute("SELECT COUNT(*), SUM(debit_cents), SUM(credit_cents) FROM ledger").fetchone(),
+        )
+        timed("aggregate balances (rollups)", lambda: ledger_store.balances(conn))
+        timed("forecast input (rollups)", lambda: forecast_engine.load_net_series(conn, "month"))
+        conn.close()
+
+        csv_path = directory / "export" / "ledger.csv"
+        csv_path.parent.mkdir()
+        frame.head(args.csv_rows).to_csv(csv_path, index=False, date_format="%Y-%m-%d")
+        print(f"CSV ({min(args.csv_rows, args.rows):,} rows)")
+        ledgers = timed("load_ledgers (columnar)", lambda: csv_utils.load_ledgers(csv_path.parent, columnar=True))
+        timed("aggregate_balances", lambda: csv_utils.aggregate_balances(ledgers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Benchmark br_fin.py startup for the lightweight commands.
+
+Each command runs in a fresh interpreter; the report shows the median wall
+time next to a bare ``python -c pass`` baseline, so the difference is what
+br_fin itself costs to import and dispatch.
+
+Usage: python scripts/bench_startup.py [--runs 20]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMANDS = {
+    "python -c pass": ["-c", "pass"],
+    "br_fin info": [str(ROOT / "br_fin.py"), "info"],
+    "br_fin list": [str(ROOT / "br_fin.py"), "list"],
+    "br_fin help": [str(ROOT / "br_fin.py"), "help"],
+    "import pandas (reference)": ["-c", "import pandas"],
+}
+
+
+def median_ms(args: list[str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL, cwd=ROOT)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    baseline = median_ms(COMMANDS["python -c pass"], args.runs)
+    print(f"{'command':<28} {'median':>9} {'over baseline':>14}")
+    for label, command in COMMANDS.items():
+        elapsed = baseline if label == "python -c pass" else median_ms(command, args.runs)
+        print(f"{label:<28} {elapsed:7.1f}ms {elapsed - baseline:12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Benchmark the vectorized budget variance engine on a large store.
+
+Imports a synthetic ledger with one posting per account per month, stores
+one budget per account (a mix of monthly, quarterly and yearly periods),
+then times ``variance.store_variance`` over every month against the
+per-period loop the line-item ``BudgetModel.variance`` needs: one actuals
+dict per month, built from ``ledger_store.balances``.
+
+Usage: python scripts/bench_variance.py [--lines 50000] [--months 24]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import ledger_store, variance  # noqa: E402
+from models.budget_model import BudgetLine, BudgetModel  # noqa: E402
+
+PERIODS = ["monthly", "monthly", "quarterly", "yearly"]
+
+
+def build_store(directory: Path, lines: int, months: int, seed: int = 11) -> Path:
+    rng = np.random.default_rng(seed)
+    accounts = np.char.add("Account ", np.arange(lines).astype(str))
+    month_starts = pd.date_range("2024-01-01", periods=months, freq="MS").strftime("%Y-%m-05")
+    ledgers = directory / "ledgers"
+    ledgers.mkdir()
+    pd.DataFrame(
+        {
+            "date": np.repeat(month_starts, lines),
+            "account": np.tile(accounts, months),
+            "debit": np.round(rng.uniform(500, 1500, lines * months), 2),
+            "credit": "",
+            "description": "Spend",
+        }
+    ).to_csv(ledgers / "spend.csv", index=False)
+    path = directory / "store.db"
+    conn = ledger_store.connect(path)
+    ledger_store.import_directory(conn, ledgers)
+    period_months = np.array([variance.PERIOD_MONTHS[period] for period in PERIODS])
+    codes = np.arange(lines) % len(PERIODS)
+    allocated = np.round(rng.uniform(800, 1200, lines) * period_months[codes] * 100).astype(np.int64)
+    with conn:
+        conn.executemany(
+            "INSERT INTO budgets (id, name, period, currency, allocated_minor, updated_at, account)"
+            " VALUES (?, ?, ?, 'USD', ?, '2024-01-01', ?)",
+            (
+                (f"budget-{i:06d}", str(accounts[i]), PERIODS[codes[i]], int(allocated[i]), str(accounts[i]))
+                for i in range(lines)
+            ),
+        )
+    conn.close()
+    return path
+
+
+def per_period_loop(conn, model: BudgetModel, months: list[int]) -> int:
+    breaches = 0
+    for month in months:
+        totals = ledger_store.balances(conn, by="month", start=month * 100 + 1, end=month * 100 + 31)
+        actuals = dict(zip(totals["account"], totals["net_cents"] / 100))
+        breaches += sum(value > 0 for value in model.variance(actuals).values())
+    return breaches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--months", type=int, default=24)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        path = build_store(Path(tmp), args.lines, args.months)
+        print(f"{args.lines:,} budget lines x {args.months} months, store built in {time.perf_counter() - start:.1f}s")
+        conn = ledger_store.connect(path)
+        first, last = variance.ledger_months(conn)
+
+        start = time.perf_counter()
+        report = variance.store_variance(conn, first, last)
+        elapsed = time.perf_counter() - start
+        print(f"  vectorized engine       {elapsed:7.2f}s  {variance.summary(report)}")
+
+        months = sorted(pd.date_range(str(first * 100 + 1), periods=args.months, freq="MS").strftime("%Y%m").astype(int))
+        model = BudgetModel(
+            effective_date="2024-01-01",
+            lines=[
+                BudgetLine(account=account, monthly_limit=1000, owner="bench")
+                for account in variance.load_budgets(conn)["account"]
+            ],
+        )
+        start = time.perf_counter()
+        breaches = per_period_loop(conn, model, months)
+        print(f"  per-month model loop    {time.perf_counter() - start:7.2f}s  monthly-only, {breaches:,} breaches")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
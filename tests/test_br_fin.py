@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def test_forecast_reads_monthly_totals(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    assert br_fin.forecast_cash_flow(2) == [0.0, 0.0]
+
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER + "2025-10-02,Cash,100,,a\n2025-11-02,Cash,300,,b\n2025-11-03,Revenue,,100,b\n"
+    )
+    br_fin.import_ledgers(ledgers)
+    # Monthly nets 100 and 200 -> rolling means 100, 150 -> baseline 125.
+    assert br_fin.forecast_cash_flow(3) == [125.0, 126.25, 127.5]
+
+
+def test_reconcile_accounts_against_store(tmp_path: Path, monkeypatch) -> None:
+    from click.testing import CliRunner
+
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER + "2025-11-02,Cash,,100,a\n2025-11-03,Cash,40,,b\n2025-11-03,Revenue,,100,b\n"
+    )
+    br_fin.import_ledgers(ledgers)
+    jobs = tmp_path / "jobs.csv"
+    jobs.write_text(
+        "account,expected_balance,start,end\n"
+        "Cash,60.00,2025-11-01,2025-11-30\n"
+        "Revenue,90.00,2025-11-01,2025-11-30\n"
+    )
+    result = CliRunner().invoke(br_fin.cli, ["reconcile-accounts", str(jobs)])
+    assert result.exit_code == 0, result.output
+    assert "Cash" in result.output and "variance -10.00" in result.output
+    assert "'balanced': 1" in result.output
+
+
+def test_run_dispatches_agents_against_store(tmp_path: Path, monkeypatch) -> None:
+    import json
+
+    from click.testing import CliRunner
+
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    runner = CliRunner()
+
+    def run(*args):
+        result = runner.invoke(br_fin.cli, ["run", *args])
+        assert result.exit_code == 0, result.output
+        return json.loads(result.output)
+
+    run("budgeteer", "allocate", "budget-001", "Q1 Operations", "100000.00", "quarterly")
+    assert run("budgeteer", "spend", "budget-001", "45000")["remaining"] == "55000.00"
+    check = run("budgeteer", "check", "budget-001", "60000.00")
+    assert check["approved"] is False and check["utilization"] == "45.00"
+
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(HEADER + "2025-11-02,Cash,,100,a\n2025-11-03,Cash,40,,b\n")
+    br_fin.import_ledgers(ledgers)
+    result = run("reconcile", "Cash", "2025-11-01", "2025-11-30", "60.00")
+    assert result["is_balanced"] and result["transaction_count"] == 2
+
+    for args in (["bogus"], ["forecast"], ["budgeteer", "check", "missing", "1"], ["reconcile", "Cash"]):
+        result = runner.invoke(br_fin.cli, ["run", *args])
+        assert result.exit_code == 2, args
+    result = runner.invoke(
+        br_fin.cli, ["run", "budgeteer", "allocate", "budget-002", "Software", "10", "monthly", "Software Expense"]
+    )
+    assert result.exit_code == 2
+    assert "currency must be a 3-letter code, got 'SOFTWARE EXPENSE'" in result.output
+
+
+def test_pack_commands_skip_heavy_imports() -> None:
+    import subprocess
+
+    from lib import defaults, forecast_engine
+
+    assert defaults.FORECAST_MODELS == tuple(forecast_engine.MODELS)
+    assert defaults.FORECAST_FREQUENCIES == tuple(forecast_engine.FREQUENCIES)
+
+    probe = (
+        "import runpy, sys\n"
+        f"sys.argv = [{str(ROOT / 'br_fin.py')!r}, 'list']\n"
+        "try:\n"
+        "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('click', 'numpy', 'pandas', 'pydantic', 'yaml') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=ROOT, check=True)
+    assert "budgeteer" in result.stdout
+    assert result.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,184 @@
+import json
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import ledger_store  # noqa: E402
+from lib.budget_monitor import BudgetMonitor, _period  # noqa: E402
+from models.ledger_entry import TransactionEntry  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+class DummyReporter:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, channel, message):
+        self.posts.append((channel, message))
+
+
+def _entry(day: str, amount: str, entry_type: str = "debit", account: str = "Software") -> dict:
+    return {"timestamp": f"{day}T12:00:00", "account": account, "amount": amount, "entry_type": entry_type}
+
+
+def test_alerts_cross_thresholds_with_debounce() -> None:
+    now = [0.0]
+    reporter = DummyReporter()
+    monitor = BudgetMonitor(reporter, channel="#spend", clock=lambda: now[0])
+    monitor.watch("b-soft", "3000", accounts=["Software"], name="Software", as_of="2025-11-01")
+
+    # Day 1 of 30: 90.00 spent projects 2,700.00, 90% of the allocation.
+    (alert,) = monitor.observe(_entry("2025-11-01", "90"))
+    assert (alert.threshold, alert.utilization, str(alert.forecast)) == (80.0, 90.0, "2700.00")
+    assert reporter.posts == [
+        (
+            "#spend",
+            "[finance-budgeteer] Budget alert — Software (b-soft): projected $2,700.00 is 90.0% of $3,000.00 "
+            "(alert at 80%); spent $90.00 by day 1 of 30",
+        )
+    ]
+    assert monitor.observe(_entry("2025-11-01", "500", account="Travel")) == []
+
+    # Crossing 100% inside the debounce window is held, then flushed once.
+    now[0] = 10
+    assert monitor.observe(_entry("2025-11-01", "20")) == []
+    assert monitor.flush() == [] and len(reporter.posts) == 1
+    now[0] = 400
+    (held,) = monitor.flush()
+    assert (held.threshold, str(held.spent)) == (100.0, "110.00")
+    assert len(reporter.posts) == 2
+
+    # A refund re-arms the thresholds; a later spike alerts again.
+    monitor.observe(_entry("2025-11-02", "110", "credit"))
+    assert monitor.state("b-soft")["alerted_at"] is None
+    now[0] = 800
+    (spike,) = monitor.observe(TransactionEntry(
+        id="tx-1",
+        timestamp=datetime(2025, 11, 15, 9),
+        account="Software",
+        description="Annual licence",
+        amount=Decimal("2000"),
+    ))
+    assert (spike.threshold, spike.day, round(spike.utilization, 1)) == (100.0, 15, 133.3)
+    assert monitor.state("b-soft") == {
+        "budget_id": "b-soft",
+        "period_start": "2025-11-01",
+        "period_end": "2025-11-30",
+        "allocated": "3000.00",
+        "spent": "2000.00",
+        "burn_rate": "133.33",
+        "forecast": "4000.00",
+        "forecast_utilization": 133.33,
+        "alerted_at": 100.0,
+    }
+
+    # The next month starts from zero; entries before the period are ignored.
+    monitor.observe(_entry("2025-12-01", "10"))
+    assert monitor.state("b-soft")["spent"] == "10.00"
+    assert monitor.state("b-soft")["alerted_at"] is None
+    monitor.observe(_entry("2025-11-30", "10"))
+    assert monitor.summary() == {"budgets": 1, "events": 7, "stale": 1, "alerts": 3, "held": 0}
+
+
+def test_periods_channels_and_forced_flush() -> None:
+    assert _period(date(2025, 11, 5), 1) == (date(2025, 11, 1).toordinal(), date(2025, 12, 1).toordinal())
+    assert _period(date(2025, 11, 5), 3) == (date(2025, 10, 1).toordinal(), date(2026, 1, 1).toordinal())
+    assert _period(date(2025, 2, 5), 12) == (date(2025, 1, 1).toordinal(), date(2026, 1, 1).toordinal())
+
+    now = [0.0]
+    reporter = DummyReporter()
+    monitor = BudgetMonitor(reporter, thresholds=[50], debounce_seconds=60, clock=lambda: now[0])
+    monitor.watch("q", 9200, "quarterly", accounts=["Cloud"], as_of="2025-10-01")
+    monitor.watch("y", 100, "yearly", accounts=["Cloud"], as_of="2025-10-01")
+    monitor.watch("all", 100000, as_of="2025-10-01", channel="#ops")
+    with pytest.raises(ValueError, match="weekly"):
+        monitor.watch("w", 100, "weekly")
+
+    # 50 on the quarter's first day projects 4,600 (50%); on day 274 of the
+    # year it projects 66.61 (66.6%). Budgets without accounts see every event.
+    alerts = monitor.observe_cost(50, "2025-10-01", key="Cloud")
+    assert [(alert.budget_id, alert.day, alert.days) for alert in alerts] == [("q", 1, 92), ("y", 274, 365)]
+    assert monitor.observe_cost(1, "2025-10-01") == []
+    assert monitor.state("all")["spent"] == "51.00"
+
+    # Re-arm both, cross again inside the window: one forced message per channel.
+    monitor.observe_cost(-50, "2025-10-01", key="Cloud")
+    assert monitor.observe_cost(50, "2025-10-01", key="Cloud") == []
+    assert len(reporter.posts) == 2
+    posted = monitor.flush(force=True)
+    assert [alert.budget_id for alert in posted] == ["q", "y"]
+    assert reporter.posts[-1][0] == "#finops"
+    assert reporter.posts[-1][1].startswith("[finance-budgeteer] Budget alerts — ")
+    assert reporter.posts[-1][1].count("\n") == 1
+
+    (alert,) = monitor.observe_cost(5000, "2025-10-01")
+    assert (alert.budget_id, reporter.posts[-1][0]) == ("all", "#ops")
+
+
+def test_from_store_and_cli_ingest(tmp_path: Path, monkeypatch) -> None:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "nov.csv").write_text(
+        HEADER + "2025-10-30,Software,5000,,Last month\n2025-11-01,Software,700,,SaaS\n2025-11-02,Travel,50,,Taxi\n"
+    )
+    db_path = tmp_path / "store.db"
+    conn = ledger_store.connect(db_path)
+    ledger_store.import_directory(conn, ledgers)
+    budgets = ledger_store.StoreBudgetService(db_path)
+    budgets.put_budget("b-soft", "Software", Decimal("30000"), "monthly", account="Software")
+    budgets.put_budget("b-travel", "Travel", Decimal("3000"), "quarterly", account="Travel")
+    budgets.put_budget("b-eur", "Euro", Decimal("10"), "monthly", currency="EUR", account="Software")
+
+    monitor = BudgetMonitor.from_store(conn, DummyReporter(), as_of="2025-11-02")
+    conn.close()
+    assert monitor.summary()["budgets"] == 2
+    assert monitor.state("b-soft")["spent"] == "700.00"
+    assert monitor.state("b-soft")["forecast"] == "10500.00"
+    assert monitor.state("b-travel")["period_start"] == "2025-10-01"
+
+    monkeypatch.setattr(br_fin, "DB_PATH", db_path)
+    monkeypatch.setenv("BR_FIN_NO_DAEMON", "1")
+    lines = [
+        json.dumps({"id": "tx-1", **_entry("2025-11-03", "9000")}),
+        json.dumps({"id": "tx-2", **_entry("2025-11-03", "500", account="Travel")}),
+    ]
+    result = CliRunner().invoke(
+        br_fin.cli,
+        ["ingest", "-", "--alert-channel", "#finops", "--as-of", "2025-11-02", "--alert-at", "90"],
+        input="\n".join(lines) + "\n",
+    )
+    assert result.exit_code == 0, result.output
+    assert "#finops [finance-budgeteer] Budget alert — Software (b-soft): projected $97,000.00 is 323.3%" in result.output
+    assert "Travel (b-travel)" not in result.output
+    assert "Budget alerts: {'budgets': 2, 'events': 2, 'stale': 0, 'alerts': 1, 'held': 0}" in result.output
+
+
+def test_cli_ingest_does_not_charge_redelivered_entries(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "store.db"
+    ledger_store.StoreBudgetService(db_path).put_budget(
+        "b-soft", "Software", Decimal("30000"), "monthly", account="Software"
+    )
+    monkeypatch.setattr(br_fin, "DB_PATH", db_path)
+    monkeypatch.setenv("BR_FIN_NO_DAEMON", "1")
+    # On the last day of the month the forecast is the spend: 60% once, 120% if charged twice.
+    batch = [json.dumps({"id": "tx-1", **_entry("2025-11-30", "18000")})]
+    args = ["ingest", "-", "--alert-channel", "#finops", "--as-of", "2025-11-01", "--alert-at", "100"]
+
+    result = CliRunner().invoke(br_fin.cli, args, input="\n".join(batch * 2) + "\n")
+    assert result.exit_code == 0, result.output
+    assert "'stored': 1, 'duplicates': 1" in result.output
+    assert "Budget alerts: {'budgets': 1, 'events': 1, 'stale': 0, 'alerts': 0, 'held': 0}" in result.output
+
+    result = CliRunner().invoke(br_fin.cli, args, input="\n".join(batch) + "\n")
+    assert result.exit_code == 0, result.output
+    assert "'stored': 0, 'duplicates': 1" in result.output
+    assert "'events': 0" in result.output
@@ -1,5 +1,11 @@
+import subprocess
+import sys
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
 import pytest
-from agents.budgeteer import Budgeteer
+from agents.budgeteer import Budgeteer, BudgetSnapshotCache, ServiceBudgeteer
 
 
 class DummyReporter:
@@ -26,7 +32,115 @@ def test_builds_weekly_report_from_cost_explorer(mocker):
     assert reporter.posts[0][1] == report
 
 
+def test_monitor_alerts_on_projected_month_end():
+    budgeteer = Budgeteer(budget_limit=1000, slack_channel="#finops")
+    reporter = DummyReporter()
+    monitor = budgeteer.monitor(reporter, as_of=date(2025, 11, 10), current_spend=200)
+    assert monitor.state("month")["forecast"] == "600.00"
+    assert monitor.observe_cost(60, "2025-11-10") == []
+
+    (alert,) = monitor.observe_cost(100, "2025-11-11")
+    assert alert.threshold == 80
+    assert reporter.posts[0][0] == "#finops"
+    assert "Monthly budget (month): projected $981.82 is 98.2% of $1,000.00" in reporter.posts[0][1]
+
+
 def test_forecast_validates_positive_days():
     budgeteer = Budgeteer(budget_limit=1000)
     with pytest.raises(ValueError):
         budgeteer.forecast(100, days_elapsed=0, days_in_month=30)
+
+
+class CountingBudgetService:
+    def __init__(self):
+        self.budgets = {
+            "ops": {"name": "Ops", "allocated": "1000.00", "spent": "400.00", "period": "monthly"},
+            "rnd": {"name": "R&D", "allocated": "50.00", "spent": "0", "period": "monthly"},
+        }
+        self.fetches = []
+        self.updates = []
+
+    def get_budget(self, budget_id):
+        self.fetches.append(budget_id)
+        return dict(self.budgets[budget_id])
+
+    def update_spent(self, budget_id, amount):
+        self.updates.append((budget_id, amount))
+        spent = Decimal(self.budgets[budget_id]["spent"]) + amount
+        self.budgets[budget_id]["spent"] = str(spent)
+
+
+def test_check_budgets_applies_running_balance():
+    service = CountingBudgetService()
+    budgeteer = ServiceBudgeteer(service)
+    decisions = budgeteer.check_budgets(
+        [
+            ("ops", Decimal("350.00")),
+            ("ops", Decimal("300.00")),
+            ("rnd", Decimal("50.00")),
+            ("ops", Decimal("250.00")),
+        ],
+        commit=True,
+    )
+
+    assert [d["approved"] for d in decisions] == [True, False, True, True]
+    assert [d["remaining"] for d in decisions] == ["250.00", "250.00", "0.00", "0.00"]
+    assert service.fetches == ["ops", "rnd"]
+    assert service.updates == [("ops", Decimal("600.00")), ("rnd", Decimal("50.00"))]
+
+
+def test_budget_snapshot_cache_ttl_and_invalidation():
+    now = [0.0]
+    service = CountingBudgetService()
+    budgeteer = ServiceBudgeteer(service, cache=BudgetSnapshotCache(ttl_seconds=10, clock=lambda: now[0]))
+
+    budgeteer.check_budget("ops", Decimal("1"))
+    budgeteer.check_budget("ops", Decimal("1"))
+    assert service.fetches == ["ops"]
+
+    budgeteer.record_spend("ops", Decimal("100"))
+    assert budgeteer.check_budget("ops", Decimal("1"))["remaining"] == "500.00"
+    assert service.fetches == ["ops", "ops"]
+
+    now[0] = 11
+    budgeteer.check_budget("ops", Decimal("1"))
+    assert service.fetches == ["ops", "ops", "ops"]
+    assert budgeteer.cache.hits == 1
+
+
+def test_budget_snapshot_cache_drops_loads_overlapping_invalidation():
+    service = CountingBudgetService()
+    cache = BudgetSnapshotCache(ttl_seconds=60, clock=lambda: 0.0)
+    budgeteer = ServiceBudgeteer(service, cache=cache)
+
+    def load_then_record(budget_id):
+        # The spend lands after the snapshot was read but before it is cached.
+        budget = service.get_budget(budget_id)
+        budgeteer.record_spend(budget_id, Decimal("100"))
+        return budget
+
+    assert cache.get("ops", load_then_record)["spent"] == "400.00"
+    assert budgeteer.check_budget("ops", Decimal("1"))["remaining"] == "500.00"
+
+    def load_then_clear(budget_id):
+        budget = service.get_budget(budget_id)
+        cache.invalidate()
+        return budget
+
+    cache.invalidate("rnd")
+    cache.get("rnd", load_then_clear)
+    cache.get("rnd", service.get_budget)
+    assert service.fetches.count("rnd") == 2
+    cache.get("rnd", service.get_budget)
+    assert service.fetches.count("rnd") == 2
+
+
+def test_import_leaves_cost_explorer_and_runway_deps_unloaded():
+    probe = (
+        "import sys\n"
+        "import agents.budgeteer\n"
+        "print(sorted(m for m in ('lib.cost_explorer', 'lib.runway', 'pandas', 'yaml') if m in sys.modules))\n"
+    )
+    root = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=root, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,84 @@
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib.ingest import ledger_row  # noqa: E402
+from models.compact_entry import EMPTY_METADATA, EMPTY_TAGS, CompactEntry, LedgerBatch  # noqa: E402
+from models.ledger_entry import TransactionEntry  # noqa: E402
+
+
+def _entry(i: int, **overrides) -> TransactionEntry:
+    fields = {
+        "id": f"tx-{i}",
+        "timestamp": datetime(2025, 11, 1 + i % 28, 9, 30, i % 60, 250),
+        "account": "Software" if i % 2 else "Travel",
+        "description": "SaaS" if i % 3 else "Flights",
+        "amount": Decimal(f"{i}.25"),
+        "entry_type": "credit" if i % 4 == 0 else "debit",
+    }
+    fields.update(overrides)
+    return TransactionEntry(**fields)
+
+
+def test_compact_entry_round_trips_and_shares_strings() -> None:
+    source = _entry(7, category="Ops", tags=["q4"], metadata={"vendor": "acme"})
+    compact = CompactEntry.from_entry(source)
+    assert compact.to_dict() == source.to_dict()
+    assert compact.to_entry() == source
+    assert CompactEntry.from_entry(source.to_dict()) == compact
+    assert (compact.minor, compact.money.currency) == (725, "USD")
+    assert ledger_row(compact) == ledger_row(source)
+
+    # Account strings built separately end up as the same object.
+    first = CompactEntry.from_entry(_entry(1, account="".join(["Soft", "ware"])))
+    second = CompactEntry.from_entry(_entry(3, account="".join(["Softw", "are"])))
+    assert first.account is second.account
+    assert first.tags is EMPTY_TAGS and second.metadata is EMPTY_METADATA
+    assert not hasattr(first, "__dict__")
+    # Amounts are held in minor units, so finer precision is rounded.
+    assert CompactEntry.from_entry(_entry(1, amount=Decimal("2.675"))).amount == Decimal("2.68")
+    assert CompactEntry.from_entry(_entry(1, amount="1500", currency="JPY")).minor == 1500
+    with pytest.raises(ValueError, match="entry_type"):
+        CompactEntry.from_entry(_entry(1, entry_type="refund"))
+
+
+def test_ledger_batch_columns_and_rows() -> None:
+    entries = [_entry(i) for i in range(1, 9)]
+    entries.append(_entry(9, currency="EUR", category="Ops", tags=["q4"]))
+    batch = LedgerBatch.from_entries(entries)
+    assert len(batch) == 9
+    assert batch.accounts == ["Software", "Travel"]
+    assert batch.account_codes.tolist() == [0, 1, 0, 1, 0, 1, 0, 1, 0]
+    assert batch.minor.tolist() == [125, 225, 325, 425, 525, 625, 725, 825, 925]
+    assert batch.credit.tolist() == [i % 4 == 0 for i in range(1, 10)]
+    assert batch.category_codes.tolist() == [-1] * 8 + [0]
+    assert list(batch.extras) == [8]
+    assert batch.nbytes == 9 * (4 + 8 + 4 + 4 + 8 + 4 + 1 + 4)
+    assert [entry.to_entry() for entry in batch] == entries
+    assert batch[-1].to_dict() == entries[-1].to_dict()
+
+    frame = batch.to_frame()
+    assert frame["signed_minor"].tolist()[:4] == [125, 225, 325, -425]
+    assert frame["currency"].tolist()[-1] == "EUR"
+    assert frame["timestamp"].tolist()[0] == entries[0].timestamp
+
+
+def test_ledger_batch_timezones_and_empty() -> None:
+    aware = [_entry(i, timestamp=datetime(2025, 11, 1, i, tzinfo=timezone.utc)) for i in range(3)]
+    batch = LedgerBatch.from_entries(aware)
+    assert batch.utc
+    assert [entry.timestamp for entry in batch] == [entry.timestamp for entry in aware]
+    with pytest.raises(ValueError, match="naive"):
+        LedgerBatch.from_entries([_entry(1), aware[0]])
+
+    empty = LedgerBatch.from_entries([])
+    assert len(empty) == 0 and list(empty) == []
+    assert empty.to_frame().empty
+    assert np.asarray(empty.minor).dtype == np.int64
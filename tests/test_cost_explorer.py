@@ -0,0 +1,118 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from agents.budgeteer import Budgeteer  # noqa: E402
+from lib.config import RateLimits, rate_limits  # noqa: E402
+from lib.cost_explorer import AsyncRateLimiter, CostExplorerFetcher, CostQuery, fan_out  # noqa: E402
+
+WINDOW = {"Start": "2025-03-01", "End": "2025-03-08"}
+
+
+class ThrottlingError(Exception):
+    def __init__(self):
+        super().__init__("Rate exceeded")
+        self.response = {"Error": {"Code": "ThrottlingException"}}
+
+
+class FakeCostExplorer:
+    """Async client: two pages per account, optional throttling on first calls."""
+
+    def __init__(self, daily=None, throttle=0, delay=0.01):
+        self.daily = daily or {}
+        self.throttle = throttle
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def get_cost_and_usage(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.throttle:
+            self.throttle -= 1
+            raise ThrottlingError()
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        account = kwargs.get("Filter", {}).get("Dimensions", {}).get("Values", [None])[0]
+        amount = self.daily.get(account, "1.00")
+        day = {"Total": {"UnblendedCost": {"Amount": amount}}}
+        if "NextPageToken" in kwargs:
+            return {"ResultsByTime": [day, day]}
+        return {"ResultsByTime": [day], "NextPageToken": "page-2"}
+
+
+async def no_sleep(_seconds):
+    return None
+
+
+def test_fetch_follows_next_page_token():
+    client = FakeCostExplorer(daily={"111": "2.50"})
+    (result,) = CostExplorerFetcher(client).run([CostQuery(WINDOW, account="111")])
+
+    assert result.error is None
+    assert result.pages == 2
+    assert len(result.results_by_time) == 3
+    assert result.total() == pytest.approx(7.50)
+    assert client.calls[1]["NextPageToken"] == "page-2"
+    assert client.calls[0]["Filter"] == {"Dimensions": {"Key": "LINKED_ACCOUNT", "Values": ["111"]}}
+
+
+def test_fetch_retries_throttling_then_gives_up():
+    client = FakeCostExplorer(throttle=2)
+    (result,) = CostExplorerFetcher(client, retries=3, sleep=no_sleep).run([CostQuery(WINDOW)])
+    assert result.error is None
+    assert result.total() == pytest.approx(3.00)
+
+    client = FakeCostExplorer(throttle=5)
+    (result,) = CostExplorerFetcher(client, retries=2, sleep=no_sleep).run([CostQuery(WINDOW)])
+    assert isinstance(result.error, ThrottlingError)
+    assert len(client.calls) == 3
+
+
+def test_fetch_respects_concurrency_limit():
+    client = FakeCostExplorer()
+    queries = fan_out(WINDOW, [str(n) for n in range(40)])
+    results = CostExplorerFetcher(client, concurrency=4).run(queries)
+
+    assert [result.query.account for result in results] == [str(n) for n in range(40)]
+    assert 1 < client.peak <= 4
+
+
+def test_rate_limiter_waits_once_burst_is_spent():
+    now = [0.0]
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    async def drain():
+        limiter = AsyncRateLimiter(RateLimits(requests_per_minute=60, burst=2), clock=lambda: now[0], sleep=fake_sleep)
+        for _ in range(4):
+            await limiter.acquire()
+
+    asyncio.run(drain())
+    assert waits == [pytest.approx(1.0), pytest.approx(1.0)]
+
+
+def test_rate_limits_come_from_pack_config():
+    assert rate_limits() == RateLimits(requests_per_minute=60, burst=10)
+    assert rate_limits({"rate_limits": {"burst": 3}}) == RateLimits(requests_per_minute=60, burst=3)
+
+
+def test_budgeteer_reports_spend_per_account():
+    client = FakeCostExplorer(daily={"111": "10.00", "222": "1.00"})
+    budgeteer = Budgeteer(budget_limit=1000, rate_limits=RateLimits(requests_per_minute=6000, burst=100))
+
+    spend = budgeteer.get_spend_by_account(client, ["111", "222"], days_elapsed=7, time_range=WINDOW)
+    assert spend == {"111": pytest.approx(30.0), "222": pytest.approx(3.0)}
+
+    reports = budgeteer.build_account_reports(client, ["111"], days_elapsed=3, days_in_month=30)
+    assert "$30.00" in reports["111"]
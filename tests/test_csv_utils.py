@@ -16,3 +16,60 @@ def test_load_ledgers(tmp_path: Path) -> None:
     assert len(ledgers) == 1
     summary = ledgers[0].summary()
     assert summary["imbalance"] == 0
+
+
+def test_columnar_loader_matches_row_loader(tmp_path: Path) -> None:
+    from lib.csv_utils import aggregate_balances
+
+    (tmp_path / "a.csv").write_text(
+        "date,account,debit,credit,description\n"
+        "2025-11-24,Cash,1000,,Seed\n"
+        "2025-11-24,Equity,,1000,Seed\n"
+        "2025-11-25,Cash,,12.5,Fees\n"
+        "2025-11-25,Bank Fees,12.5,,Fees\n"
+    )
+    rows = load_ledgers(tmp_path)
+    columns = load_ledgers(tmp_path, columnar=True)
+    assert columns[0].entries == []
+    assert columns[0].summary() == rows[0].summary()
+    assert aggregate_balances(columns).equals(aggregate_balances(rows))
+
+
+def test_columnar_loader_reports_bad_lines(tmp_path: Path) -> None:
+    import pytest
+
+    from lib.csv_utils import LedgerFormatError, read_ledger_frame
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text(
+        "date,account,debit,credit,description\n"
+        "2025-11-24,Cash,10,,ok\n"
+        "2025-11-24,Cash,-5,,negative\n"
+        "not-a-date,Cash,,abc,broken\n"
+    )
+    with pytest.raises(LedgerFormatError) as excinfo:
+        read_ledger_frame(bad)
+    lines = [line for line, _ in excinfo.value.errors]
+    assert lines == [3, 4, 4]
+
+
+def test_parallel_load_keeps_order_and_isolates_errors(tmp_path: Path) -> None:
+    from lib.csv_utils import LedgerFormatError, load_ledger_files
+
+    for day in range(1, 5):
+        (tmp_path / f"2025-11-0{day}-general.csv").write_text(
+            f"date,account,debit,credit,description\n2025-11-0{day},Cash,{day},,x\n"
+        )
+    (tmp_path / "2025-11-02-payables.csv").write_text(
+        "date,account,debit,credit,description\n2025-11-02,Cash,-1,,bad\n"
+    )
+    paths = sorted(tmp_path.glob("*.csv"))
+    loads = load_ledger_files(paths, columnar=True, workers=2)
+
+    assert [load.path for load in loads] == paths
+    failed = [load for load in loads if load.error is not None]
+    assert [load.path.name for load in failed] == ["2025-11-02-payables.csv"]
+    assert isinstance(failed[0].error, LedgerFormatError)
+    assert failed[0].error.errors == [(2, "Amounts must be non-negative")]
+    debits = [load.ledger.total_debits() for load in loads if load.error is None]
+    assert debits == [1.0, 2.0, 3.0, 4.0]
@@ -0,0 +1,99 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import ledger_store  # noqa: E402
+from lib.daemon import FinanceDaemon  # noqa: E402
+from lib.daemon_client import DaemonError, find_daemon, state_path  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+@pytest.fixture
+def served(tmp_path: Path, monkeypatch):
+    db_path = tmp_path / "store.db"
+    monkeypatch.setattr(br_fin, "DB_PATH", db_path)
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER
+        + "2025-10-02,Cash,100,,a\n2025-10-30,Revenue,,100,a\n"
+        + "2025-11-02,Cash,300,,b\n2025-11-03,Revenue,,250,b\n2025-11-03,Fees,,50,b\n"
+    )
+    br_fin.import_ledgers(ledgers)
+    daemon = FinanceDaemon(db_path, workers=2)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    while find_daemon(db_path) is None:
+        time.sleep(0.01)
+    yield daemon, ledgers
+    daemon.shutdown()
+    thread.join()
+    assert not state_path(db_path).exists()
+
+
+def test_warm_balances_match_store(served) -> None:
+    daemon, _ = served
+    conn = ledger_store.connect(daemon.db_path)
+    queries = [
+        {"by": "account"},
+        {"by": "month", "accounts": ["Cash", "Fees"]},
+        {"by": "day", "start": 20251001, "end": 20251102},
+        {"by": "month", "start": 20251003},
+        {"by": "account", "accounts": ["Missing"], "end": 20251231},
+    ]
+    for query in queries:
+        expected = ledger_store.balances(conn, **query).to_dict("records")
+        assert daemon.ledger.balances(**query).to_dict("records") == expected, query
+    conn.close()
+
+
+def test_daemon_serves_cli_and_picks_up_imports(served) -> None:
+    daemon, ledgers = served
+    client = find_daemon(daemon.db_path)
+    runner = CliRunner()
+
+    local = runner.invoke(br_fin.cli, ["--no-daemon", "forecast", "cash-flow", "--by-account"])
+    forwarded = runner.invoke(br_fin.cli, ["forecast", "cash-flow", "--by-account"])
+    assert forwarded.exit_code == 0, forwarded.output
+    assert forwarded.output == local.output
+    assert client.call("status")["forecasts_memoized"] == 1
+
+    result = runner.invoke(br_fin.cli, ["run", "budgeteer", "allocate", "b1", "Ops", "500", "monthly"])
+    assert result.exit_code == 0, result.output
+    assert client.call("check_budget", budget_id="b1", amount="600")["approved"] is False
+    runner.invoke(br_fin.cli, ["--no-daemon", "run", "budgeteer", "spend", "b1", "200"])
+    assert client.call("check_budget", budget_id="b1", amount="300")["remaining"] == "300.00"
+    with pytest.raises(DaemonError) as error:
+        client.call("check_budget", budget_id="nope", amount="1")
+    assert error.value.kind == "usage"
+    reconciled = client.call(
+        "reconcile", account="Cash", start="2025-10-01", end="2025-11-30", expected_balance="-400"
+    )
+    assert reconciled["is_balanced"] and reconciled["transaction_count"] == 2
+
+    with (ledgers / "a.csv").open("a") as handle:
+        handle.write("2025-12-01,Cash,25,,c\n")
+    br_fin.import_ledgers(ledgers)
+    result = runner.invoke(br_fin.cli, ["balances", "--account", "Cash"])
+    assert "net         425.00" in result.output
+    assert client.call("status")["reloads"] == 2
+
+
+def test_daemon_rejects_calls_without_token(served) -> None:
+    daemon, _ = served
+    client = find_daemon(daemon.db_path)
+    client.token = "wrong"
+    with pytest.raises(DaemonError) as error:
+        client.call("ping")
+    assert error.value.kind == "auth"
+    assert json.loads(state_path(daemon.db_path).read_text())["port"] == daemon.port
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import forecast_cache, forecast_engine, ledger_store  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def test_forecast_cache_hits_until_next_import(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    ledger = ledgers / "a.csv"
+    ledger.write_text(HEADER + "2025-10-02,Cash,100,,a\n2025-11-02,Cash,300,,b\n")
+    br_fin.import_ledgers(ledgers)
+
+    calls = []
+    original = forecast_engine.load_net_series
+    monkeypatch.setattr(
+        forecast_engine, "load_net_series", lambda *args: calls.append(args) or original(*args)
+    )
+
+    assert br_fin.forecast_cash_flow(2) == [150.0, 151.5]
+    assert br_fin.forecast_cash_flow(2) == [150.0, 151.5]
+    assert br_fin.forecast_cash_flow(2, model="linear") == [500.0, 700.0]
+    assert len(calls) == 2
+
+    with ledger.open("a") as handle:
+        handle.write("2025-12-02,Cash,500,,c\n")
+    br_fin.import_ledgers(ledgers)
+    assert br_fin.forecast_cash_flow(2) == [233.33, 235.67]
+    assert len(calls) == 3
+
+    conn = ledger_store.connect(br_fin.DB_PATH)
+    stats = forecast_cache.ForecastCache(conn).stats()
+    conn.close()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 1)
+
+
+def test_forecast_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    conn = ledger_store.connect(tmp_path / "store.db")
+    now = [0.0]
+    cache = forecast_cache.ForecastCache(conn, max_entries=2, clock=lambda: now[0])
+    series = forecast_engine.NetSeries(
+        np.array(["Cash"], dtype=object), np.ones((1, 3)), 0, "month"
+    )
+
+    def get(horizon):
+        return cache.get_or_compute(lambda: forecast_engine.forecast(series, horizon=horizon), horizon=horizon)
+
+    get(1), get(2)
+    # A hit on a recently stamped entry is read-only.
+    changes = conn.total_changes
+    get(1)
+    assert conn.total_changes == changes
+    now[0] += forecast_cache.TOUCH_INTERVAL_SECONDS
+    get(1), get(3)
+    assert get(1).values.shape == (1, 1)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 3, 1)
+    get(2)
+    assert cache.stats()["misses"] == 4
+
+    cache.max_bytes = 1
+    get(4)
+    assert cache.stats()["entries"] == 1
+    conn.close()
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import forecast_engine  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def rollup(rows):
+    return pd.DataFrame(rows, columns=["account", "month", "net_cents"])
+
+
+def test_net_series_is_dense_and_zero_filled():
+    series = forecast_engine.net_series(
+        rollup([("Cash", 202411, 10000), ("Cash", 202502, 5000), ("Rent", 202412, -2500)])
+    )
+    assert list(series.accounts) == ["Cash", "Rent"]
+    assert series.values.tolist() == [[100.0, 0.0, 0.0, 50.0], [0.0, -25.0, 0.0, 0.0]]
+    assert series.labels(series.periods, 2) == ["2025-03", "2025-04"]
+
+
+def test_models_match_per_account_references():
+    rng = np.random.default_rng(3)
+    values = rng.normal(100, 20, size=(5, 14))
+
+    rolling = forecast_engine.rolling_growth(values, 2)
+    expected = [pd.Series(row).rolling(2, min_periods=1).mean().mean() for row in values]
+    np.testing.assert_allclose(rolling[:, 0], expected)
+    np.testing.assert_allclose(rolling[:, 1], np.array(expected) * 1.01)
+
+    linear = forecast_engine.linear_trend(values, 3)
+    for row, predicted in zip(values, linear):
+        slope, intercept = np.polyfit(np.arange(14), row, 1)
+        np.testing.assert_allclose(predicted, intercept + slope * np.arange(14, 17))
+
+    seasonal = forecast_engine.seasonal_naive(values, 14, season=12)
+    np.testing.assert_array_equal(seasonal[:, :12], values[:, -12:])
+    np.testing.assert_array_equal(seasonal[:, 12:], values[:, -12:-10])
+
+    smoothed = forecast_engine.exponential_smoothing(values, 1, alpha=0.3)
+    level = values[:, 0]
+    for t in range(1, 14):
+        level = 0.3 * values[:, t] + 0.7 * level
+    np.testing.assert_allclose(smoothed[:, 0], level)
+
+
+def test_forecast_cli_by_account(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER + "2025-09-02,Cash,100,,a\n2025-10-02,Cash,200,,b\n2025-11-02,Cash,300,,c\n"
+    )
+    br_fin.import_ledgers(ledgers)
+
+    result = CliRunner().invoke(
+        br_fin.cli, ["forecast", "cash-flow", "--model", "linear", "--horizon", "2", "--by-account"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "2025-12" in result.output and "2026-01" in result.output
+    assert "400.00" in result.output and "500.00" in result.output
+
+    assert br_fin.forecast_cash_flow(1, model="linear") == [400.0]
+    assert br_fin.forecast_cash_flow(1, model="ses", freq="day")[0] == pytest.approx(150.0, abs=1)
@@ -0,0 +1,109 @@
+import sys
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from agents.reconcile import Reconcile  # noqa: E402
+from lib import csv_utils, ledger_store  # noqa: E402
+from lib.fx import FxRateTable, MissingRateError  # noqa: E402
+
+RATES = "date,currency,rate\n2025-01-01,EUR,1.10\n2025-02-01,EUR,1.20\n2025-01-01,JPY,0.0070\n"
+
+
+@pytest.fixture
+def fx(tmp_path: Path) -> FxRateTable:
+    path = tmp_path / "rates.csv"
+    path.write_text(RATES)
+    return FxRateTable.from_csv(path)
+
+
+def test_as_of_lookup_and_vectorized_conversion(fx: FxRateTable) -> None:
+    assert fx.rate("EUR", "USD", 20250115) == pytest.approx(1.10)
+    assert fx.rate("EUR", "USD", 20250301) == pytest.approx(1.20)
+    assert fx.rate("USD", "EUR", 20250201) == pytest.approx(1 / 1.20)
+    with pytest.raises(MissingRateError):
+        fx.rate("EUR", "USD", 20241231)
+    with pytest.raises(MissingRateError):
+        fx.rate("GBP", "USD", 20250101)
+
+    converted = fx.convert(
+        ["10.00", "10.00", "1000", "5.00"],
+        np.array(["EUR", "EUR", "JPY", "USD"], dtype=object),
+        np.array([20250110, 20250210, 20250110, 20250110]),
+        "EUR",
+    )
+    # JPY -> EUR crosses through USD: 1000 * 0.007 / 1.10 = 6.3636...
+    assert converted.tolist() == [1000, 1000, 636, 455]
+
+
+def test_ledger_currency_column_and_aggregation(tmp_path: Path, fx: FxRateTable) -> None:
+    path = tmp_path / "ledger.csv"
+    path.write_text(
+        "date,account,debit,credit,description,currency\n"
+        "2025-01-05,Cash,100,,a,eur\n"
+        "2025-02-05,Cash,,100,b,EUR\n"
+        "2025-02-05,Cash,50,,c,\n"
+    )
+    ledger = csv_utils.read_ledger_frame(path)
+    assert ledger.columns["currency"].tolist() == ["EUR", "EUR", "USD"]
+
+    balances = csv_utils.aggregate_balances([ledger], fx, "USD")
+    assert balances.loc[0, ["debit", "credit", "net"]].tolist() == [160.0, 120.0, 40.0]
+    streamed = csv_utils.stream_ledger_summary(path, chunk_size=1, fx=fx, currency="USD")
+    assert streamed == br_fin.reconcile_file(path, fx=fx, currency="USD")
+    assert streamed["imbalance"] == 40.0
+
+    with pytest.raises(csv_utils.LedgerFormatError, match="line 2: currency must be USD"):
+        ledger_store.prepare_import(path, None)
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text("date,account,debit,credit,description,currency\n2025-01-05,Cash,1,,a,EURO\n")
+    with pytest.raises(csv_utils.LedgerFormatError, match="3-letter"):
+        csv_utils.read_ledger_frame(bad)
+
+
+def test_reconcile_cli_and_agent_convert(tmp_path: Path, fx: FxRateTable) -> None:
+    (tmp_path / "rates.csv").write_text(RATES)
+    ledger = tmp_path / "ledger.csv"
+    ledger.write_text("date,account,debit,credit,description\n2025-02-05,Cash,120,,a\n")
+    result = CliRunner().invoke(
+        br_fin.cli, ["reconcile", str(ledger), "--currency", "eur", "--fx-rates", str(tmp_path / "rates.csv")]
+    )
+    assert result.exit_code == 0, result.output
+    assert "'debits': 100.0" in result.output
+
+    class Service:
+        def get_transactions(self, account, start_date, end_date):
+            return [
+                {"amount": Decimal("110.00"), "entry_type": "credit", "currency": "USD", "date": "2025-01-10"},
+                {"amount": Decimal("50.00"), "entry_type": "credit"},
+            ]
+
+    start, end = datetime(2025, 1, 1), datetime(2025, 1, 31)
+    report = Reconcile(Service(), fx=fx).reconcile_account("Cash", Decimal("150.00"), start, end, currency="EUR")
+    assert report["calculated_balance"] == "150.00"
+    assert report["is_balanced"]
+    with pytest.raises(ValueError, match="FX rate table"):
+        Reconcile(Service()).reconcile_account("Cash", Decimal("0"), start, end, currency="EUR")
+
+
+def test_rates_collapse_to_distinct_pairs(fx: FxRateTable, monkeypatch) -> None:
+    lookups = []
+    original = FxRateTable._lookup
+    monkeypatch.setattr(
+        FxRateTable, "_lookup", lambda self, currency, dates: lookups.append(len(dates)) or original(self, currency, dates)
+    )
+    currencies = np.array(["EUR", "JPY"] * 50_000, dtype=object)
+    dates = np.repeat(pd.date_range("2025-01-01", periods=10).strftime("%Y%m%d").astype(int), 10_000)
+    rates = fx.rates(currencies, dates, "USD")
+    assert len(rates) == 100_000
+    assert sum(lookups) <= 40
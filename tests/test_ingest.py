@@ -0,0 +1,166 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import ledger_store  # noqa: E402
+from lib.daemon import FinanceDaemon  # noqa: E402
+from lib.daemon_client import DaemonError, find_daemon  # noqa: E402
+from lib.ingest import LedgerWriter, ledger_row  # noqa: E402
+from models.ledger_entry import LedgerEntry, TransactionEntry  # noqa: E402
+
+
+def _raw_daily(conn: sqlite3.Connection) -> list[list[int]]:
+    return [
+        list(row)
+        for row in conn.execute(
+            """
+            SELECT account, date, SUM(debit_cents), SUM(credit_cents), COUNT(*)
+            FROM ledger GROUP BY account, date ORDER BY account, date
+            """
+        )
+    ]
+
+
+def test_ledger_row_accepts_both_entry_shapes() -> None:
+    entry = TransactionEntry(
+        id="tx-1",
+        timestamp=datetime(2025, 11, 3, 9, 30),
+        account="Software",
+        description="SaaS",
+        amount=Decimal("19.99"),
+        entry_type="credit",
+    )
+    assert ledger_row(entry) == ("tx-1", 20251103, "Software", 0, 1999, "SaaS")
+    assert ledger_row(entry.to_dict()) == ledger_row(entry)
+    row = LedgerEntry(date="2025-11-03", account="Cash", debit="12.50", description="x")
+    assert ledger_row(row) == (None, 20251103, "Cash", 1250, 0, "x")
+    with pytest.raises(ValueError, match="currency"):
+        ledger_row({"date": "2025-11-03", "account": "Cash", "debit": 1, "currency": "EUR"})
+    with pytest.raises(ValueError, match="non-negative"):
+        ledger_row({"date": "2025-11-03", "account": "Cash", "amount": "-5"})
+    with pytest.raises(TypeError, match="tuple"):
+        ledger_row(("2025-11-03", "Cash", 5))
+
+
+def test_writer_group_commits_rollups_and_budgets(tmp_path: Path) -> None:
+    db_path = tmp_path / "store.db"
+    ledger_store.StoreBudgetService(db_path).put_budget("b1", "Software", Decimal("500"), "monthly", account="Software")
+    entries = [
+        {"id": f"tx-{i}", "timestamp": f"2025-11-{1 + i % 28:02d}T10:00:00", "account": "Software", "amount": "1.25"}
+        for i in range(250)
+    ]
+    entries.append({"date": "2025-11-05", "account": "Software", "credit": "12.50", "description": "refund"})
+    with LedgerWriter(db_path, batch_size=100, max_delay=10) as writer:
+        writer.append_many(entries[:200])
+        # Full batches commit without waiting out the delay.
+        assert writer.wait(200, timeout=5)
+        writer.append_many(entries[200:])
+        writer.append_many(entries[:10])
+        assert writer.flush(timeout=5)
+        assert writer.stats.summary() == {
+            "appended": 261,
+            "stored": 251,
+            "duplicates": 10,
+            "rejected": 0,
+            "batches": 3,
+        }
+
+    conn = ledger_store.connect(db_path)
+    assert conn.execute("SELECT COUNT(*), COUNT(entry_id) FROM ledger").fetchone() == (251, 250)
+    assert ledger_store.balances(conn, by="day").drop(columns="net_cents").values.tolist() == _raw_daily(conn)
+    assert ledger_store.StoreBudgetService(db_path).get_budget("b1")["spent"] == "300.00"
+    conn.close()
+
+
+def test_writer_commits_partial_batch_after_max_delay(tmp_path: Path) -> None:
+    db_path = tmp_path / "store.db"
+    with LedgerWriter(db_path, batch_size=1000, max_delay=0.02) as writer:
+        sequence = writer.append({"date": "2025-11-05", "account": "Cash", "debit": "1"})
+        assert writer.wait(sequence, timeout=5)
+        # Durable: a separate connection sees the row while the writer is open.
+        other = sqlite3.connect(db_path)
+        assert other.execute("SELECT COUNT(*) FROM ledger").fetchone() == (1,)
+        other.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.append({"date": "2025-11-05", "account": "Cash", "debit": "1"})
+
+
+def test_writer_rejects_entries_in_closed_months(tmp_path: Path) -> None:
+    db_path = tmp_path / "store.db"
+    conn = ledger_store.connect(db_path)
+    ledger_store.close_month(conn, 202510)
+    with LedgerWriter(db_path) as writer:
+        writer.append_many(
+            [
+                {"id": "late", "date": "2025-10-31", "account": "Cash", "debit": "1"},
+                {"id": "on-time", "date": "2025-11-01", "account": "Cash", "debit": "2"},
+            ]
+        )
+        writer.flush()
+        assert (writer.stats.stored, writer.stats.rejected) == (1, 1)
+    assert ledger_store.read_rows(conn, columns=("entry_id",)) == [("on-time",)]
+    conn.close()
+
+
+def test_cli_ingest_and_daemon_append(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "store.db"
+    monkeypatch.setattr(br_fin, "DB_PATH", db_path)
+    source = tmp_path / "entries.jsonl"
+    source.write_text(
+        json.dumps({"id": "a", "date": "2025-11-01", "account": "Cash", "debit": "10"})
+        + "\n\n"
+        + json.dumps({"id": "b", "date": "2025-11-01", "account": "Revenue", "credit": "10"})
+        + "\n"
+    )
+    runner = CliRunner()
+    result = runner.invoke(br_fin.cli, ["ingest", str(source)])
+    assert result.exit_code == 0, result.output
+    assert "'stored': 2" in result.output
+
+    daemon = FinanceDaemon(db_path, workers=2, config={"features": {"real_time_sync": False}})
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    while (client := find_daemon(db_path)) is None:
+        time.sleep(0.01)
+    with pytest.raises(DaemonError, match="real_time_sync"):
+        client.call("append", entries=[])
+    client.call("shutdown")
+    thread.join()
+
+    daemon = FinanceDaemon(db_path, workers=2, config={"features": {"real_time_sync": True}})
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    while (client := find_daemon(db_path)) is None:
+        time.sleep(0.01)
+    result = runner.invoke(br_fin.cli, ["ingest", "--batch-size", "1", str(source)])
+    assert result.exit_code == 0, result.output
+    assert "Appended 2 entries through the daemon" in result.output
+    ingested = client.call("status")["ingest"]
+    assert ingested == {"appended": 2, "stored": 0, "duplicates": 2, "rejected": 0, "batches": 2}
+    new = {"id": "c", "date": "2025-11-02", "account": "Cash", "debit": "5"}
+    assert client.call("append", entries=[new, {**new, "id": "a"}, new])["stored"] == [0]
+    client.call("shutdown")
+    thread.join()
+
+
+@pytest.mark.parametrize("debit", ["abc", "inf", "1e30"])
+def test_cli_ingest_reports_bad_amounts(tmp_path: Path, monkeypatch, debit) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    monkeypatch.setenv("BR_FIN_NO_DAEMON", "1")
+    line = json.dumps({"date": "2024-01-05", "account": "ops", "debit": debit, "credit": "0"})
+    result = CliRunner().invoke(br_fin.cli, ["ingest", "-"], input=line + "\n")
+    assert result.exit_code == 1
+    assert result.output.startswith("Error: Bad entry: ")
+    assert repr(debit) in result.output
@@ -0,0 +1,131 @@
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import journal  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def _write(directory: Path) -> list[Path]:
+    directory.mkdir()
+    first = directory / "a.csv"
+    first.write_text(
+        HEADER
+        + "2025-11-01,Cash,100,,Sale\n"  # 2: balanced with line 3
+        + "2025-11-01,Revenue,,100,Sale\n"
+        + "2025-11-02,Rent,500,,Rent\n"  # 4: unbalanced, 500 vs 450
+        + "2025-11-02,Cash,,450,Rent\n"
+        + "2025-11-03,Fees,12,,Wire fee\n"  # 6: single line
+        + "2025-11-04,Cash,7,,\n"  # 7: no description
+        + "2025-11-05,Travel,80,,Flight\n"  # 8: posted twice; the doubled transaction still balances
+        + "2025-11-05,Cash,,80,Flight\n"
+        + "2025-10-31,Cash,1,,October only\n"  # 10: single line, outside November
+    )
+    second = directory / "b.csv"
+    second.write_text(
+        HEADER
+        + "2025-11-05,Travel,80,,Flight\n"  # 2: duplicate of a.csv:8
+        + "2025-11-05,Cash,,80,Flight\n"
+        + "2025-11-01,Cash,,100,Sale\n"  # 4: stray leg after a.csv's Sale balanced
+    )
+    return [first, second]
+
+
+def test_validate_ledgers_finds_every_kind(tmp_path: Path) -> None:
+    files = _write(tmp_path / "ledgers")
+    report = journal.validate_ledgers(files)
+    assert report.summary() == {"lines": 12, "transactions": 7, "unbalanced": 1, "orphans": 4, "duplicates": 2}
+    assert not report.ok
+    assert report.unbalanced[["file", "line", "transaction", "lines", "difference"]].values.tolist() == [
+        ["a.csv", 4, "Rent", 2, 50.0],
+    ]
+    assert report.orphans[["file", "line", "reason"]].values.tolist() == [
+        ["a.csv", 6, "single-line transaction"],
+        ["a.csv", 7, "no journal id or description"],
+        ["a.csv", 10, "single-line transaction"],
+        ["b.csv", 4, "single-line transaction"],
+    ]
+    assert report.duplicates.values.tolist() == [
+        ["a.csv", 8, 2, "b.csv", 2],
+        ["a.csv", 9, 2, "b.csv", 3],
+    ]
+
+    november = journal.validate_ledgers(files, chunk_size=2, period=202511)
+    assert november.summary() == {"lines": 11, "transactions": 6, "unbalanced": 1, "orphans": 3, "duplicates": 2}
+    assert november.orphans["line"].tolist() == [6, 7, 4]
+
+
+def test_transactions_close_when_they_balance(tmp_path: Path) -> None:
+    path = tmp_path / "day.csv"
+    path.write_text(
+        HEADER
+        + "2025-11-01,Cash,10,,Coffee\n"
+        + "2025-11-01,Revenue,,4,Coffee\n"
+        + "2025-11-01,Revenue,,6,Coffee\n"  # 4: first Coffee balances here
+        + "2025-11-01,Cash,10,,Coffee\n"  # 5: second Coffee, same day and description
+        + "2025-11-01,Revenue,,10,Coffee\n"
+        + "2025-11-01,Cash,3,,Coffee\n"  # 7: third Coffee never balances
+        + "2025-11-01,Revenue,,1,Coffee\n"
+    )
+    for chunk_size in (1, 2, 100):
+        report = journal.validate_ledgers([path], chunk_size=chunk_size)
+        assert report.summary() == {"lines": 7, "transactions": 3, "unbalanced": 1, "orphans": 0, "duplicates": 1}
+        assert report.unbalanced[["line", "lines", "difference"]].values.tolist() == [[7, 2, 2.0]]
+
+
+def test_journal_ids_group_lines_across_descriptions(tmp_path: Path) -> None:
+    path = tmp_path / "journal.csv"
+    path.write_text(
+        "date,account,debit,credit,description,journal_id,currency\n"
+        "2025-11-01,Payroll,1000,,Salaries,J1,USD\n"
+        "2025-11-02,Cash,,900,Net pay,J1,USD\n"
+        "2025-11-02,Tax Payable,,100,Withholding,J1,USD\n"
+        "2025-11-03,Cash,1500,,Invoice 7,J2,JPY\n"
+        "2025-11-03,Revenue,,1500,Invoice 7,J2,JPY\n"
+        "2025-11-03,Cash,10,,Invoice 8,,EUR\n"
+        "2025-11-03,Revenue,,10,Invoice 8,,USD\n"
+    )
+    report = journal.validate_ledgers([path])
+    assert report.summary() == {"lines": 7, "transactions": 4, "unbalanced": 0, "orphans": 2, "duplicates": 0}
+    # Balances are per currency, so a mixed-currency pair does not net out.
+    assert report.orphans["currency"].tolist() == ["EUR", "USD"]
+
+
+def test_cli_validate(tmp_path: Path) -> None:
+    runner = CliRunner()
+    result = runner.invoke(br_fin.cli, ["validate", str(ROOT / "ledgers")])
+    assert result.exit_code == 0, result.output
+    assert "'unbalanced': 0" in result.output
+
+    _write(tmp_path / "ledgers")
+    output = tmp_path / "findings"
+    result = runner.invoke(
+        br_fin.cli, ["validate", str(tmp_path / "ledgers"), "--limit", "1", "--output", str(output)]
+    )
+    assert result.exit_code == 1
+    assert "unbalanced a.csv:4 'Rent' on 20251102: 2 lines, debits 500.00 USD vs credits 450.00" in result.output
+    assert "... 3 more orphan finding(s)" in result.output
+    assert "7 journal integrity finding(s)" in result.output
+    assert sorted(path.name for path in output.iterdir()) == ["duplicates.csv", "orphans.csv", "unbalanced.csv"]
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text(HEADER + "2025-13-01,Cash,1,,x\n")
+    result = runner.invoke(br_fin.cli, ["validate", str(bad)])
+    assert result.exit_code == 1
+    assert "invalid date" in result.output
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+def test_chunk_size_does_not_change_findings(tmp_path: Path, chunk_size: int) -> None:
+    files = _write(tmp_path / "ledgers")
+    expected = journal.validate_ledgers(files)
+    report = journal.validate_ledgers(files, chunk_size=chunk_size)
+    for name in ("unbalanced", "orphans", "duplicates"):
+        assert getattr(report, name).equals(getattr(expected, name))
@@ -0,0 +1,255 @@
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from lib import ledger_store  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def _rows(conn: sqlite3.Connection) -> list[tuple]:
+    return conn.execute("SELECT date, account, debit_cents, credit_cents FROM ledger ORDER BY date, account").fetchall()
+
+
+def test_import_is_idempotent_and_incremental(tmp_path: Path) -> None:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    general = ledgers / "2025-11-24-general.csv"
+    general.write_text(HEADER + "2025-11-24,Cash,1000,,Seed\n2025-11-24,Equity,,1000,Seed\n")
+    conn = ledger_store.connect(tmp_path / "store.db")
+
+    first = ledger_store.import_directory(conn, ledgers)
+    assert first.summary()["imported"] == 1
+    assert _rows(conn) == [(20251124, "Cash", 100000, 0), (20251124, "Equity", 0, 100000)]
+
+    second = ledger_store.import_directory(conn, ledgers)
+    assert second.summary() == {
+        "imported": 0, "appended": 0, "replaced": 0, "skipped": 1, "pruned": 0, "failed": 0, "rows": 0
+    }
+    assert len(_rows(conn)) == 2
+
+    with general.open("a") as handle:
+        handle.write("2025-11-25,Cash,,200,SaaS\n")
+    appended = ledger_store.import_directory(conn, ledgers)
+    assert appended.summary()["appended"] == 1
+    assert appended.rows == 1
+    assert len(_rows(conn)) == 3
+
+    general.write_text(HEADER + "2025-11-24,Cash,5,,Fix\n")
+    replaced = ledger_store.import_directory(conn, ledgers)
+    assert replaced.summary()["replaced"] == 1
+    assert _rows(conn) == [(20251124, "Cash", 500, 0)]
+
+
+def test_deleted_and_renamed_files_are_pruned(tmp_path: Path) -> None:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "nov.csv").write_text(HEADER + "2025-11-24,Cash,10,,a\n")
+    (ledgers / "dec.csv").write_text(HEADER + "2025-12-01,Cash,,4,b\n")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "jan.csv").write_text(HEADER + "2026-01-02,Cash,1,,c\n")
+    conn = ledger_store.connect(tmp_path / "store.db")
+    ledger_store.import_directory(conn, ledgers)
+    ledger_store.import_directory(conn, other)
+    generation = ledger_store.generation(conn)[1]
+
+    (ledgers / "dec.csv").rename(ledgers / "december.csv")
+    (ledgers / "nov.csv").unlink()
+    report = ledger_store.import_directory(conn, ledgers)
+    assert report.pruned == [str((ledgers / "dec.csv").resolve()), str((ledgers / "nov.csv").resolve())]
+    assert report.summary()["imported"] == 1
+    assert _rows(conn) == [(20251201, "Cash", 0, 400), (20260102, "Cash", 100, 0)]
+    assert ledger_store.balances(conn)[["account", "net_cents"]].values.tolist() == [["Cash", -300]]
+    assert ledger_store.generation(conn)[1] > generation
+    assert conn.execute("SELECT COUNT(*) FROM ledger_files").fetchone() == (2,)
+
+
+def test_touched_file_is_not_reimported(tmp_path: Path) -> None:
+    ledger = tmp_path / "a.csv"
+    ledger.write_text(HEADER + "2025-11-24,Cash,1,,x\n")
+    conn = sqlite3.connect(":memory:")
+    ledger_store.init_db(conn)
+    ledger_store.import_file(conn, ledger)
+
+    stat = ledger.stat()
+    os.utime(ledger, (stat.st_atime, stat.st_mtime + 60))
+    report = ledger_store.import_file(conn, ledger)
+    assert report.skipped and report.rows == 0
+    assert ledger_store.manifest_entry(conn, str(ledger.resolve())).mtime == stat.st_mtime + 60
+    assert len(_rows(conn)) == 1
+
+
+def test_parallel_import_records_failures_per_file(tmp_path: Path) -> None:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(HEADER + "2025-11-24,Cash,1,,x\n")
+    (ledgers / "b.csv").write_text(HEADER + "bad-date,Cash,1,,x\n")
+    (ledgers / "c.csv").write_text(HEADER + "2025-11-25,Cash,2,,y\n")
+    conn = sqlite3.connect(":memory:")
+    ledger_store.init_db(conn)
+
+    report = ledger_store.import_directory(conn, ledgers, workers=2)
+    assert [Path(path).name for path in report.imported] == ["a.csv", "c.csv"]
+    assert [Path(path).name for path in report.failed] == ["b.csv"]
+    assert [row[0] for row in _rows(conn)] == [20251124, 20251125]
+
+
+def test_migrates_text_and_real_store(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    conn.executescript(
+        """
+        CREATE TABLE ledger (date TEXT, account TEXT, debit REAL, credit REAL, description TEXT, source TEXT);
+        CREATE TABLE ledger_files (
+            path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL,
+            sha256 TEXT NOT NULL, rows INTEGER NOT NULL, imported_at TEXT NOT NULL
+        );
+        INSERT INTO ledger_files VALUES ('/data/a.csv', 10, 1.0, 'abc', 2, '2025-11-24T00:00:00');
+        INSERT INTO ledger VALUES ('2025-11-24', 'Cash', 10.1, 0, 'x', '/data/a.csv');
+        INSERT INTO ledger VALUES ('2025-11-24', 'Equity', 0, 10.1, 'x', '/data/a.csv');
+        """
+    )
+    conn.commit()
+    assert ledger_store.schema_version(conn) == 1
+
+    ledger_store.init_db(conn)
+    assert ledger_store.schema_version(conn) == ledger_store.SCHEMA_VERSION
+    assert _rows(conn) == [(20251124, "Cash", 1010, 0), (20251124, "Equity", 0, 1010)]
+    assert ledger_store.manifest_entry(conn, "/data/a.csv").rows == 2
+    assert [(partition.month, partition.rows) for partition in ledger_store.partitions(conn)] == [(202511, 2)]
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(ledger_202511)")}
+    assert "ledger_202511_account_date" in indexes
+
+
+def test_monthly_net_aggregates_in_sql(tmp_path: Path) -> None:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER
+        + "2025-10-31,Cash,100,,a\n"
+        + "2025-11-01,Cash,,40,b\n"
+        + "2025-11-20,Cash,10.5,,c\n"
+        + "2025-11-20,Revenue,,70.5,c\n"
+    )
+    conn = ledger_store.connect(tmp_path / "store.db")
+    ledger_store.import_directory(conn, ledgers)
+
+    monthly = ledger_store.monthly_net(conn)
+    assert monthly[["account", "month", "net_cents"]].values.tolist() == [
+        ["Cash", 202510, 10000],
+        ["Cash", 202511, -2950],
+        ["Revenue", 202511, -7050],
+    ]
+    november = ledger_store.monthly_net(conn, accounts=["Cash"], start=20251101, end=20251130)
+    assert november["net_cents"].tolist() == [-2950]
+
+
+def _raw_daily(conn: sqlite3.Connection) -> list[tuple]:
+    return conn.execute(
+        """
+        SELECT account, date, SUM(debit_cents), SUM(credit_cents), COUNT(*)
+        FROM ledger GROUP BY account, date ORDER BY account, date
+        """
+    ).fetchall()
+
+
+def test_rollups_follow_append_and_replace(tmp_path: Path) -> None:
+    from lib.csv_utils import aggregate_balances, load_ledgers
+
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    general = ledgers / "general.csv"
+    general.write_text(HEADER + "2025-11-24,Cash,1000,,Seed\n2025-11-24,Equity,,1000,Seed\n")
+    (ledgers / "payables.csv").write_text(HEADER + "2025-12-01,Cash,,250,Rent\n2025-12-01,Rent,250,,Rent\n")
+    conn = ledger_store.connect(tmp_path / "store.db")
+    ledger_store.import_directory(conn, ledgers)
+
+    with general.open("a") as handle:
+        handle.write("2025-11-25,Cash,,200,SaaS\n2025-11-25,Software,200,,SaaS\n")
+    ledger_store.import_directory(conn, ledgers)
+    assert ledger_store.balances(conn, by="day").drop(columns="net_cents").values.tolist() == [
+        list(row) for row in _raw_daily(conn)
+    ]
+
+    general.write_text(HEADER + "2025-11-24,Cash,10,,Seed\n2025-11-24,Equity,,10,Seed\n")
+    ledger_store.import_directory(conn, ledgers)
+    assert ledger_store.balances(conn, by="day").drop(columns="net_cents").values.tolist() == [
+        list(row) for row in _raw_daily(conn)
+    ]
+    assert conn.execute("SELECT COUNT(*) FROM balance_account WHERE account = 'Software'").fetchone() == (0,)
+    assert ledger_store.monthly_net(conn)[["account", "month", "net_cents"]].values.tolist() == [
+        ["Cash", 202511, 1000],
+        ["Cash", 202512, -25000],
+        ["Equity", 202511, -1000],
+        ["Rent", 202512, 25000],
+    ]
+    trial = ledger_store.trial_balance(conn)
+    assert trial.equals(aggregate_balances(load_ledgers(ledgers, columnar=True)))
+    assert ledger_store.trial_balance(conn, as_of=20251130)["account"].tolist() == ["Cash", "Equity"]
+
+
+def test_migration_backfills_rollups(tmp_path: Path) -> None:
+    conn = ledger_store.connect(tmp_path / "store.db")
+    with conn:
+        # Version 3 kept every row in one ``ledger`` table.
+        conn.execute("DROP VIEW ledger")
+        conn.execute(
+            "CREATE TABLE ledger (file_id INTEGER, date INTEGER NOT NULL, account TEXT NOT NULL, "
+            "debit_cents INTEGER NOT NULL DEFAULT 0, credit_cents INTEGER NOT NULL DEFAULT 0, description TEXT)"
+        )
+        conn.execute("INSERT INTO ledger (file_id, date, account, debit_cents, credit_cents) VALUES (1, 20251124, 'Cash', 500, 0)")
+        conn.execute("DELETE FROM schema_version")
+        conn.execute("INSERT INTO schema_version VALUES (3, '2025-11-24')")
+        for table in ("balance_daily", "balance_monthly", "balance_account"):
+            conn.execute(f"DROP TABLE {table}")
+    ledger_store.init_db(conn)
+    assert ledger_store.trial_balance(conn).values.tolist() == [["Cash", 5.0, 0.0, 5.0]]
+
+
+def test_monthly_partitions_prune_reads_and_lock_closed_months(tmp_path: Path) -> None:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    october = ledgers / "2025-10-31-general.csv"
+    october.write_text(HEADER + "2025-10-30,Cash,100,,a\n2025-10-31,Cash,,40,b\n")
+    (ledgers / "2025-11-30-general.csv").write_text(HEADER + "2025-11-02,Cash,7,,c\n2025-11-20,Fees,3,,d\n")
+    conn = ledger_store.connect(tmp_path / "store.db")
+    ledger_store.import_directory(conn, ledgers)
+    assert [(partition.month, partition.rows) for partition in ledger_store.partitions(conn)] == [
+        (202510, 2),
+        (202511, 2),
+    ]
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    assert ledger_store.read_rows(conn, "Cash", 20251101, 20251130) == [(20251102, "Cash", 700, 0, "c")]
+    conn.set_trace_callback(None)
+    assert any("ledger_202511" in statement for statement in statements)
+    assert not any("ledger_202510" in statement for statement in statements)
+
+    ledger_store.close_month(conn, 202510)
+    october.write_text(HEADER + "2025-10-30,Cash,1,,changed\n")
+    report = ledger_store.import_directory(conn, ledgers)
+    assert "2025-10 is closed" in report.failed[str(october.resolve())]
+    with pytest.raises(ledger_store.PartitionClosedError):
+        ledger_store.append_entries(conn, [("late", 20251015, "Cash", 100, 0, None)])
+    with pytest.raises(sqlite3.IntegrityError, match="closed"):
+        with conn:
+            conn.execute("DELETE FROM ledger_202510")
+
+    compacted = ledger_store.compact_month(conn, 202510)
+    assert compacted.closed and compacted.compacted_at is not None
+    assert ledger_store.read_rows(conn, "Cash", 20251001, 20251031) == [
+        (20251030, "Cash", 10000, 0, "a"),
+        (20251031, "Cash", 0, 4000, "b"),
+    ]
+    ledger_store.reopen_month(conn, 202510)
+    assert ledger_store.import_directory(conn, ledgers).summary()["replaced"] == 1
+    assert ledger_store.balances(conn, by="day").drop(columns="net_cents").values.tolist() == [
+        list(row) for row in _raw_daily(conn)
+    ]
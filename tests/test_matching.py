@@ -0,0 +1,109 @@
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from agents.reconcile import Reconcile  # noqa: E402
+from lib.matching import match_transactions  # noqa: E402
+
+
+def test_exact_then_windowed_fuzzy_matching():
+    ledger = pd.DataFrame(
+        {
+            "id": ["L1", "L2", "L3", "L4", "L5"],
+            "date": ["2025-11-01", "2025-11-03", "2025-11-03", "2025-11-10", "2025-11-20"],
+            "amount": [100.0, -42.5, -42.5, 250.0, 10.0],
+            "reference": ["INV-1", "", "", "", ""],
+            "description": ["Invoice 1", "AWS cloud bill", "AWS cloud bill", "Stripe payout", "Coffee"],
+        }
+    )
+    statement = pd.DataFrame(
+        {
+            "id": ["S1", "S2", "S3", "S4", "S5"],
+            "date": ["2025-11-04", "2025-11-05", "2025-11-12", "2025-11-12", "2025-11-21"],
+            "amount": [100.0, -42.5, 250.0, 250.0, 99.0],
+            "reference": ["inv-1", "", "", "", ""],
+            "description": ["ACH INVOICE", "aws bill 123", "STRIPE PAYOUT", "STRIPE PAYOUT", "Misc"],
+        }
+    )
+    result = match_transactions(ledger, statement, window_days=3)
+
+    pairs = dict(zip(result.matched["ledger_id"], result.matched["statement_id"]))
+    assert pairs == {"L1": "S1", "L2": "S2", "L4": "S3"}
+    assert result.matched.set_index("ledger_id").loc["L1", "method"] == "exact"
+    assert result.matched.set_index("ledger_id").loc["L2", "days_apart"] == 2
+    assert sorted(result.unmatched_ledger["id"]) == ["L3", "L5"]
+    assert sorted(result.unmatched_statement["id"]) == ["S4", "S5"]
+    assert result.duplicates[["side", "id", "duplicate_of"]].values.tolist() == [
+        ["ledger", "L3", "L2"],
+        ["statement", "S4", "S3"],
+    ]
+    assert result.summary()["matched_fuzzy"] == 2
+
+
+def test_matching_scales_close_to_linearly():
+    def frames(rows, seed=0):
+        rng = np.random.default_rng(seed)
+        days = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 30, rows), unit="D")
+        amounts = (rng.permutation(rows) - rows // 2) / 100
+        ledger = pd.DataFrame({"date": days, "amount": amounts, "description": "vendor payment"})
+        statement = ledger.assign(date=ledger["date"] + pd.Timedelta(days=1))
+        return ledger, statement
+
+    timings = []
+    for rows in (20_000, 80_000):
+        ledger, statement = frames(rows)
+        start = time.perf_counter()
+        result = match_transactions(ledger, statement)
+        timings.append(time.perf_counter() - start)
+        assert len(result.matched) == rows
+    assert timings[1] < timings[0] * 10
+
+
+def test_repeating_amounts_stay_bounded():
+    rows = 40_000
+    days = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(rows) % 10, unit="D")
+    ledger = pd.DataFrame({"id": np.arange(rows), "date": days, "amount": -9.99, "description": "monthly subscription"})
+    # Half the statement lines repeat their ledger row exactly, half post a day later.
+    statement = ledger.assign(date=ledger["date"] + pd.to_timedelta(np.arange(rows) % 2, unit="D"))
+
+    start = time.perf_counter()
+    result = match_transactions(ledger, statement)
+    assert time.perf_counter() - start < 5
+    assert len(result.matched) == rows
+    assert (result.matched["days_apart"] == 0).sum() >= rows // 2
+    assert result.matched["days_apart"].abs().max() <= 3
+
+
+def test_reconcile_match_statement_and_cli(tmp_path: Path):
+    class Service:
+        def get_transactions(self, account, start_date, end_date):
+            return [
+                {"id": "t1", "date": "2025-11-02", "amount": "20.00", "entry_type": "debit", "description": "Fee"},
+                {"id": "t2", "date": "2025-11-02", "amount": "75.00", "entry_type": "credit", "description": "Deposit"},
+            ]
+
+    statement = [{"id": "b1", "date": "2025-11-03", "amount": 75.0, "description": "deposit ref 9"}]
+    result = Reconcile(Service()).match_statement(
+        "Cash", statement, datetime(2025, 11, 1), datetime(2025, 11, 30)
+    )
+    assert result.matched[["ledger_id", "statement_id"]].values.tolist() == [["t2", "b1"]]
+    assert result.unmatched_ledger["id"].tolist() == ["t1"]
+
+    ledger_csv = tmp_path / "ledger.csv"
+    ledger_csv.write_text("date,account,debit,credit,description\n2025-11-02,Cash,75,,Deposit\n")
+    statement_csv = tmp_path / "statement.csv"
+    statement_csv.write_text("date,amount,description\n2025-11-03,75.00,DEPOSIT\n2025-11-04,5.00,fee\n")
+    out = tmp_path / "out"
+    cli = CliRunner().invoke(br_fin.cli, ["match", str(ledger_csv), str(statement_csv), "--output", str(out)])
+    assert cli.exit_code == 0, cli.output
+    assert "'matched': 1" in cli.output
+    assert pd.read_csv(out / "unmatched_statement.csv")["id"].tolist() == [3]
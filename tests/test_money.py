@@ -0,0 +1,55 @@
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from models.ledger_entry import LedgerEntry, LedgerFile  # noqa: E402
+from models.money import Money, to_minor, to_minor_array  # noqa: E402
+
+
+def test_to_minor_is_exact() -> None:
+    assert to_minor("0.29") == 29
+    assert to_minor(0.29) == 29
+    assert to_minor(Decimal("2.675")) == 268
+    assert to_minor("2.675") == 268
+    assert to_minor("1e3") == 100000
+    assert to_minor("9999999999999999.99") == 999999999999999999
+    assert to_minor("1500", "JPY") == 1500
+    assert to_minor_array(["2.675", "1.10", Decimal("-3")]).tolist() == [268, 110, -300]
+
+
+@pytest.mark.parametrize("value", ["inf", "-Infinity", "nan", "abc", "", "1e400", "99999999999999999.99", 10**18, 1e30])
+def test_to_minor_rejects_bad_amounts(value) -> None:
+    with pytest.raises(ValueError, match="amount|Amount"):
+        to_minor(value)
+
+
+def test_to_minor_array_rejects_out_of_range() -> None:
+    with pytest.raises(ValueError, match="out of range"):
+        to_minor_array(np.array([1.0, 1e30]))
+    with pytest.raises(ValueError, match="out of range"):
+        to_minor_array(["1", "1e30"])
+
+
+def test_money_arithmetic_and_formatting() -> None:
+    total = Money.sum([Money.of("0.10"), Money.of("0.20"), Money.of("-0.05")])
+    assert total == Money(25)
+    assert str(total) == "0.25"
+    assert str(-Money.of("1234.5")) == "-1234.50"
+    assert Money.of("12.34").to_decimal() == Decimal("12.34")
+    with pytest.raises(ValueError):
+        Money.of("1", "USD") + Money.of("1", "EUR")
+
+
+def test_ledger_totals_do_not_drift() -> None:
+    entries = [LedgerEntry(date="2025-11-24", account="Cash", debit=0.1) for _ in range(10)]
+    entries.append(LedgerEntry(date="2025-11-24", account="Revenue", credit=1.0))
+    ledger = LedgerFile(name="drift.csv", entries=entries)
+    assert sum(e.debit for e in entries) != 1.0
+    assert ledger.total_debits() == 1.0
+    assert ledger.imbalance() == 0
@@ -0,0 +1,128 @@
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from agents.reconcile import Reconcile, ReconcileJob, reconcile_directory, reconcile_file  # noqa: E402
+from lib.config import AgentSettings, agent_settings  # noqa: E402
+from lib.csv_utils import LedgerFormatError  # noqa: E402
+
+
+def _write_ledger(path: Path, rows: int) -> None:
+    lines = ["date,account,debit,credit,description"]
+    for idx in range(rows):
+        lines.append(f"2025-11-24,Cash,{idx}.25,,Sale {idx}")
+        lines.append(f"2025-11-24,Revenue,,{idx}.25,Sale {idx}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_streaming_reconcile_matches_in_memory(tmp_path: Path) -> None:
+    ledger = tmp_path / "2025-11-24-general.csv"
+    _write_ledger(ledger, 50)
+    (tmp_path / "2025-11-24-payables.csv").write_text(
+        "date,account,debit,credit,description\n2025-11-24,Legal Expense,750,,Vendor\n"
+    )
+
+    expected = reconcile_file(ledger)
+    assert reconcile_file(ledger, streaming=True, chunk_size=7) == expected
+    assert expected["entries"] == 100
+    assert reconcile_directory(tmp_path, streaming=True, chunk_size=3) == reconcile_directory(tmp_path)
+
+
+def test_streaming_reconcile_reports_file_line_numbers(tmp_path: Path) -> None:
+    ledger = tmp_path / "broken.csv"
+    _write_ledger(ledger, 5)
+    with ledger.open("a") as handle:
+        handle.write("2025-11-24,Cash,-1,,Refund\n")
+    with pytest.raises(LedgerFormatError) as excinfo:
+        reconcile_file(ledger, streaming=True, chunk_size=4)
+    assert excinfo.value.errors == [(12, "Amounts must be non-negative")]
+
+
+def test_reconcile_missing_file(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        reconcile_file(tmp_path / "missing.csv")
+
+
+def test_reconcile_account_sums_exact_minor_units() -> None:
+    from datetime import datetime
+    from decimal import Decimal
+
+    from agents.reconcile import Reconcile
+
+    class Transactions:
+        def get_transactions(self, account, start_date, end_date):
+            return [
+                {"amount": "0.10", "entry_type": "credit"},
+                {"amount": Decimal("0.20"), "entry_type": "credit"},
+                {"amount": 0.05, "entry_type": "debit"},
+            ]
+
+    report = Reconcile(Transactions()).reconcile_account(
+        "acct-1", Decimal("0.25"), datetime(2025, 11, 1), datetime(2025, 11, 30)
+    )
+    assert report["calculated_balance"] == "0.25"
+    assert report["variance"] == "0.00"
+    assert report["is_balanced"] is True
+    assert report["transaction_count"] == 3
+
+
+class SlowFlakyService:
+    """Sleeps per fetch; ``flaky`` accounts fail once, ``stuck`` ones never return in time."""
+
+    def __init__(self, delay=0.05, flaky=(), stuck=()):
+        self.delay = delay
+        self.flaky = set(flaky)
+        self.stuck = set(stuck)
+        self.calls = []
+
+    def get_transactions(self, account, start_date, end_date):
+        self.calls.append(account)
+        if account in self.stuck:
+            time.sleep(1)
+        time.sleep(self.delay)
+        if account in self.flaky:
+            self.flaky.discard(account)
+            raise ConnectionError("reset by peer")
+        return [{"amount": "10.00", "entry_type": "credit"}, {"amount": "2.50", "entry_type": "debit"}]
+
+
+def test_reconcile_accounts_runs_concurrently_with_retry_and_timeout() -> None:
+    start, end = datetime(2025, 11, 1), datetime(2025, 11, 30)
+    jobs = [ReconcileJob(f"acct-{n:03d}", Decimal("7.50"), start, end) for n in range(60)]
+    jobs.append(ReconcileJob("acct-off", Decimal("8.00"), start, end))
+    jobs.append(ReconcileJob("acct-stuck", Decimal("7.50"), start, end))
+    service = SlowFlakyService(flaky={"acct-001"}, stuck={"acct-stuck"})
+
+    began = time.perf_counter()
+    run = Reconcile(service).reconcile_accounts(
+        jobs, fetch_concurrency=32, settings=AgentSettings(timeout=0.3, retry=1)
+    )
+    # 62 sequential fetches would take over 3s.
+    assert time.perf_counter() - began < 2.5
+
+    summary = run.summary()
+    assert summary["balanced"] == 60
+    assert summary["unbalanced"] == 1
+    assert summary["absolute_variance"] == {"USD": "0.50"}
+    assert list(run.failed) == ["acct-stuck 2025-11-01..2025-11-30"]
+    assert "timed out" in run.failed["acct-stuck 2025-11-01..2025-11-30"]
+    assert service.calls.count("acct-001") == 2
+    assert [result["account"] for result in run.results][:3] == ["acct-000", "acct-001", "acct-002"]
+
+    # A job backing off before its retry frees its slot for the next account.
+    service = SlowFlakyService(delay=0.01, flaky={"acct-000"})
+    Reconcile(service).reconcile_accounts(jobs[:2], fetch_concurrency=1, settings=AgentSettings(timeout=1, retry=1))
+    assert service.calls == ["acct-000", "acct-001", "acct-000"]
+    with pytest.raises(ValueError, match="Duplicate reconcile jobs: acct-000 2025-11-01..2025-11-30"):
+        Reconcile(service).reconcile_accounts([jobs[0], jobs[1], jobs[0]])
+
+
+def test_reconcile_settings_come_from_pack_config() -> None:
+    assert agent_settings("reconcile") == AgentSettings(enabled=True, timeout=60.0, retry=3)
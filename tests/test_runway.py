@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from agents.budgeteer import Budgeteer  # noqa: E402
+from lib import ledger_store, runway  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def test_simulation_is_reproducible_across_workers():
+    history = np.array([1000, 2000, 3000, 0, 10000], dtype=np.int64)
+    serial = runway.simulate_month_end(history, 100.0, 10, budget_limit=400, paths=20_000, seed=7, batch_size=3000)
+    parallel = runway.simulate_month_end(
+        history, 100.0, 10, budget_limit=400, paths=20_000, seed=7, batch_size=3000, workers=2
+    )
+    assert serial == parallel
+    assert serial.paths == 20_000
+    assert serial.p10 < serial.p50 < serial.p90
+    # Mean daily flow is 32.00, so 10 more days land near 420 on average.
+    assert serial.mean == pytest.approx(420, rel=0.01)
+    assert 0.4 < serial.breach_probability < 0.8
+    assert runway.simulate_month_end(history, 100.0, 10, paths=20_000, seed=8) != serial
+
+
+def test_budgeteer_simulate_validates_and_handles_month_end():
+    budgeteer = Budgeteer(budget_limit=500)
+    with pytest.raises(ValueError):
+        budgeteer.simulate([100], 10.0, days_elapsed=0, days_in_month=30)
+    done = budgeteer.simulate([], 600.0, days_elapsed=30, days_in_month=30, paths=10)
+    assert (done.p10, done.p90, done.breach_probability) == (600.0, 600.0, 1.0)
+
+
+def test_daily_flows_and_runway_cli(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER + "2025-11-02,Cloud,40,,a\n2025-11-04,Cloud,20,,b\n2025-11-04,Cash,,20,b\n"
+    )
+    br_fin.import_ledgers(ledgers)
+    conn = ledger_store.connect(br_fin.DB_PATH)
+    flows = runway.daily_flows(conn, ["Cloud"], start=20251101, end=20251105)
+    conn.close()
+    assert flows.tolist() == [0, 4000, 0, 2000, 0]
+
+    result = CliRunner().invoke(
+        br_fin.cli,
+        ["runway", "--budget", "100", "--account", "Cloud", "--as-of", "2025-11-05",
+         "--lookback", "5", "--paths", "1000", "--seed", "3"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "'paths': 1000" in result.output and "breach_probability" in result.output
+
+
+def test_runway_defaults_to_debit_side_and_rejects_empty_window(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER + "2025-11-02,Cloud,40,,a\n2025-11-02,Cash,,40,a\n2025-11-04,Cloud,20,,b\n2025-11-04,Cash,,20,b\n"
+    )
+    br_fin.import_ledgers(ledgers)
+    conn = ledger_store.connect(br_fin.DB_PATH)
+    # Balanced books net to zero every day; the debit side is the spend.
+    assert runway.daily_flows(conn, start=20251101, end=20251105).tolist() == [0, 0, 0, 0, 0]
+    assert runway.daily_flows(conn, start=20251101, end=20251105, side="debit").tolist() == [0, 4000, 0, 2000, 0]
+    assert runway.daily_flows(conn, start=20251001, end=20251031).size == 0
+    with pytest.raises(ValueError, match="side"):
+        runway.daily_flows(conn, side="credit")
+    conn.close()
+
+    runner = CliRunner()
+    args = ["runway", "--budget", "50", "--as-of", "2025-11-05", "--lookback", "5", "--paths", "1000"]
+    result = runner.invoke(br_fin.cli, args)
+    assert result.exit_code == 0, result.output
+    assert "'p50': 0.0" not in result.output
+    assert "'breach_probability': 1.0" in result.output
+
+    result = runner.invoke(br_fin.cli, ["runway", "--budget", "50", "--as-of", "2025-10-15", "--lookback", "5"])
+    assert result.exit_code == 1
+    assert "No ledger activity in the lookback window" in result.output
@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import csv_utils, forecast_engine, ledger_store, snapshot  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def _ledgers(tmp_path: Path) -> Path:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "a.csv").write_text(
+        HEADER
+        + "2025-09-30,Cash,100.25,,a\n2025-10-02,Revenue,,100.25,a\n2025-10-02,Cash,7,,a\n"
+        + "2025-11-03,Fees,,50,b\n2025-11-03,Cash,50,,b\n2024-02-29,Equity,,1,leap\n"
+    )
+    return ledgers
+
+
+def test_date_keys_round_trip() -> None:
+    keys = np.array([19700101, 20000229, 20241231, 20250101, 21000301])
+    days = snapshot.date_keys_to_days(keys)
+    assert days.dtype == np.int32
+    assert days[0] == 0
+    assert days.tolist() == [(pd.Timestamp(str(key)) - pd.Timestamp("1970-01-01")).days for key in keys]
+    assert snapshot.days_to_date_keys(days).tolist() == keys.tolist()
+
+
+def test_snapshot_matches_store_and_csv(tmp_path: Path) -> None:
+    ledgers = _ledgers(tmp_path)
+    conn = ledger_store.connect(tmp_path / "store.db")
+    ledger_store.import_directory(conn, ledgers)
+    path = tmp_path / "store.db.snapshot"
+    assert snapshot.write_snapshot(conn, path) == 6
+
+    with snapshot.open_snapshot(path) as mapped:
+        assert mapped.is_current(conn)
+        assert mapped.accounts.tolist() == ["Cash", "Equity", "Fees", "Revenue"]
+        assert np.all(np.diff(mapped.dates) >= 0)
+        for by in ("account", "month", "day"):
+            for kwargs in ({}, {"accounts": ["Cash", "Fees"]}, {"start": 20251001, "end": 20251103}):
+                expected = ledger_store.balances(conn, by=by, **kwargs)
+                pd.testing.assert_frame_equal(mapped.balances(by=by, **kwargs), expected, check_dtype=False)
+
+        (ledger,) = csv_utils.load_ledgers(ledgers)
+        assert mapped.summary() == pytest.approx(ledger.summary())
+        pd.testing.assert_frame_equal(
+            mapped.aggregate_balances(), csv_utils.aggregate_balances([ledger]), check_dtype=False
+        )
+        assert mapped.between(20251001, 20251031).summary()["entries"] == 2
+        series = forecast_engine.net_series(mapped.balances(by="month"), "month")
+        expected = forecast_engine.load_net_series(conn, "month")
+        assert (series.start, series.accounts.tolist()) == (expected.start, expected.accounts.tolist())
+        np.testing.assert_allclose(series.values, expected.values)
+
+    ledger_store.append_entries(conn, [("late", 20251120, "Cash", 100, 0, None)])
+    with snapshot.open_snapshot(path) as mapped:
+        assert not mapped.is_current(conn)
+    conn.close()
+
+
+def test_empty_store_and_bad_file(tmp_path: Path) -> None:
+    conn = ledger_store.connect(tmp_path / "store.db")
+    path = tmp_path / "store.db.snapshot"
+    assert snapshot.write_snapshot(conn, path) == 0
+    with snapshot.open_snapshot(path) as mapped:
+        assert len(mapped) == 0
+        assert mapped.summary() == {"entries": 0, "debits": 0.0, "credits": 0.0, "imbalance": 0.0}
+        assert mapped.balances(by="month").empty
+    conn.close()
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError, match="not a ledger snapshot"):
+        snapshot.open_snapshot(path)
+
+
+def test_cli_import_refreshes_snapshot(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "store.db"
+    monkeypatch.setattr(br_fin, "DB_PATH", db_path)
+    ledgers = _ledgers(tmp_path)
+    runner = CliRunner()
+    result = runner.invoke(br_fin.cli, ["import", "--no-snapshot", str(ledgers)])
+    assert result.exit_code == 0, result.output
+    assert not snapshot.snapshot_path(db_path).exists()
+
+    result = runner.invoke(br_fin.cli, ["import", str(ledgers)])
+    assert result.exit_code == 0, result.output
+    written = snapshot.snapshot_path(db_path).stat().st_mtime_ns
+    result = runner.invoke(br_fin.cli, ["snapshot", "--start", "2025-10-01"])
+    assert result.exit_code == 0, result.output
+    assert "6 rows, 4 accounts, current" in result.output
+    assert "'entries': 4" in result.output
+    # Nothing changed, so the snapshot is not rewritten.
+    runner.invoke(br_fin.cli, ["import", str(ledgers)])
+    assert snapshot.snapshot_path(db_path).stat().st_mtime_ns == written
@@ -0,0 +1,154 @@
+import sys
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import br_fin  # noqa: E402
+from lib import ledger_store, variance  # noqa: E402
+from models.budget_model import BudgetLine, BudgetModel  # noqa: E402
+
+HEADER = "date,account,debit,credit,description\n"
+
+
+def _store(tmp_path: Path) -> Path:
+    ledgers = tmp_path / "ledgers"
+    ledgers.mkdir()
+    (ledgers / "2025.csv").write_text(
+        HEADER
+        + "2025-01-10,Software,400,,SaaS\n"
+        + "2025-02-10,Software,700,,SaaS\n"
+        + "2025-02-20,Software,,100,Refund\n"
+        + "2025-03-10,Software,450,,SaaS\n"
+        + "2025-04-03,Software,900,,SaaS\n"
+        + "2025-01-15,Travel,1200,,Flights\n"
+        + "2025-03-15,Travel,500,,Hotel\n"
+        + "2025-03-31,Cash,,4150,Payments\n"
+    )
+    path = tmp_path / "store.db"
+    conn = ledger_store.connect(path)
+    ledger_store.import_directory(conn, ledgers)
+    budgets = ledger_store.StoreBudgetService(path)
+    budgets.put_budget("b-soft", "Software", Decimal("500"), "monthly", account="Software")
+    budgets.put_budget("b-travel", "Travel", Decimal("1800"), "quarterly", account="Travel")
+    budgets.put_budget("b-ops", "Ops", Decimal("1000"), "yearly", currency="JPY", account="Office")
+    budgets.put_budget("b-none", "Unassigned", Decimal("10"), "monthly")
+    conn.close()
+    return path
+
+
+def test_store_variance_per_period(tmp_path: Path) -> None:
+    conn = ledger_store.connect(_store(tmp_path))
+    report = variance.store_variance(conn, 202501, 202503)
+    rows = report[["id", "period_start", "period_end", "allocated", "actual", "variance", "breach", "warning"]]
+    assert rows.values.tolist() == [
+        ["b-ops", 202501, 202512, 1000.0, 0.0, -1000.0, False, False],
+        ["b-soft", 202501, 202501, 500.0, 400.0, -100.0, False, False],
+        ["b-travel", 202501, 202503, 1800.0, 1700.0, -100.0, False, True],
+        ["b-soft", 202502, 202502, 500.0, 600.0, 100.0, True, False],
+        ["b-soft", 202503, 202503, 500.0, 450.0, -50.0, False, True],
+    ]
+    assert report["utilization"].tolist() == [0.0, 80.0, 94.44, 120.0, 90.0]
+    assert variance.summary(report) == {
+        "lines": 3,
+        "rows": 5,
+        "allocated": 4300.0,
+        "actual": 3150.0,
+        "breaches": 1,
+        "warnings": 2,
+    }
+
+    # Periods overlapping the range are reported whole.
+    april = variance.store_variance(conn, 202504, 202504)
+    assert april[["id", "period_start", "actual"]].values.tolist() == [
+        ["b-ops", 202501, 0.0],
+        ["b-soft", 202504, 900.0],
+        ["b-travel", 202504, 0.0],
+    ]
+    assert len(variance.store_variance(conn)) == 1 + 4 + 2
+    conn.close()
+
+
+def test_budget_models_and_csv(tmp_path: Path) -> None:
+    conn = ledger_store.connect(_store(tmp_path))
+    dataclass_budget = SimpleNamespace(
+        id="q1",
+        name="Q1 spend",
+        period="quarterly",
+        start_date=datetime(2025, 1, 1),
+        end_date=datetime(2025, 3, 31),
+        allocated=Decimal("3000"),
+        currency="USD",
+        categories={"Software": Decimal("1500"), "Travel": Decimal("1500")},
+    )
+    line_items = BudgetModel(
+        effective_date=date(2025, 3, 1), lines=[BudgetLine(account="Travel", monthly_limit=400, owner="ops")]
+    )
+    budgets = variance.budget_frame([dataclass_budget, line_items])
+    report = variance.store_variance(conn, 202501, 202506, budgets)
+    assert report[["id", "period_start", "actual", "breach"]].values.tolist() == [
+        ["q1:Software", 202501, 1450.0, False],
+        ["q1:Travel", 202501, 1700.0, True],
+        ["Travel", 202503, 500.0, True],
+        ["Travel", 202504, 0.0, False],
+        ["Travel", 202505, 0.0, False],
+        ["Travel", 202506, 0.0, False],
+    ]
+    # Same result as the line-item model's own variance for March.
+    assert line_items.variance({"Travel": 500}) == {"Travel": report.loc[2, "variance"]}
+
+    path = tmp_path / "budgets.csv"
+    path.write_text(
+        "id,name,account,period,allocated,currency,start_date,end_date\n"
+        "s,Software,Software,Monthly,650.50,,2025-02-01,2025-03-31\n"
+        "t,Travel,Travel,yearly,2000,EUR,,\n"
+    )
+    report = variance.store_variance(conn, 202501, 202503, variance.read_budgets(path))
+    assert report[["id", "period_start", "allocated", "actual", "currency"]].values.tolist() == [
+        ["t", 202501, 2000.0, 1700.0, "EUR"],
+        ["s", 202502, 650.5, 600.0, "USD"],
+        ["s", 202503, 650.5, 450.0, "USD"],
+    ]
+    path.write_text("id,name,account,period,allocated\nx,X,Cash,weekly,1\n")
+    with pytest.raises(ValueError, match="weekly"):
+        variance.read_budgets(path)
+    conn.close()
+
+
+def test_cli_variance(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", _store(tmp_path))
+    runner = CliRunner()
+    output = tmp_path / "out"
+    result = runner.invoke(
+        br_fin.cli, ["variance", "--start", "2025-01", "--end", "2025-03", "--limit", "1", "--output", str(output)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "'breaches': 1" in result.output
+    assert "breach  b-soft 'Software' monthly 202502-202502: actual 600.00 vs allocated 500.00 USD (120.0%)" in result.output
+    assert "... 2 more flagged line(s)" in result.output
+    assert (output / "variance.csv").read_text().startswith("id,name,account,period,period_start")
+
+    result = runner.invoke(br_fin.cli, ["variance", "--end", "2025-03", "--fail-on-breach"])
+    assert result.exit_code == 1
+    assert "1 budget line(s) over allocation" in result.output
+
+
+def test_workflow_budgets_cover_checked_in_ledgers(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(br_fin, "DB_PATH", tmp_path / "store.db")
+    br_fin.import_ledgers(ROOT / "ledgers")
+    runner = CliRunner()
+    args = ["variance", "--start", "2025-11", "--end", "2025-11", "--fail-on-empty"]
+
+    result = runner.invoke(br_fin.cli, args)
+    assert result.exit_code == 1
+    assert "No budget lines in range" in result.output
+
+    result = runner.invoke(br_fin.cli, [*args, "--budgets", str(ROOT / "configs" / "budgets.csv")])
+    assert result.exit_code == 0, result.output
+    assert "'lines': 3" in result.output